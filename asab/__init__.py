@@ -9,20 +9,59 @@ For detailed documentation and examples, please refer to the ASAB documentation
 	- Documentation: https://asab.readthedocs.io
 """
 
-import logging
+import time
+_import_started_at = time.perf_counter()
 
-from .abc.module import Module
-from .abc.service import Service
-from .abc.singleton import Singleton
-from .application import Application
-from .config import Config, ConfigObject, Configurable
-from .log import LOG_NOTICE
-from .pdict import PersistentDict
-from .pubsub import subscribe, PubSub, Subscriber
-from .socket import StreamSocketServerService
-from .timer import Timer
+import logging  # noqa: E402
+import typing  # noqa: E402
+import importlib  # noqa: E402
+
+from .logger import LOG_NOTICE  # noqa: E402
+from . import importprofile  # noqa: E402
+from .__version__ import __version__, __build__  # noqa: E402
+
+# Public names are imported from their submodules on the first access (see `__getattr__()`),
+# so that `import asab` doesn't load the event loop, logging setup, shelve etc. until they are needed
+_LAZY_IMPORTS = {
+	'Module': '.abc.module',
+	'Service': '.abc.service',
+	'Singleton': '.abc.singleton',
+	'Application': '.application',
+	'Config': '.config',
+	'ConfigObject': '.config',
+	'Configurable': '.config',
+	'PersistentDict': '.pdict',
+	'subscribe': '.pubsub',
+	'PubSub': '.pubsub',
+	'Subscriber': '.pubsub',
+	'StreamSocketServerService': '.socket',
+	'Timer': '.timer',
+}
+
+if typing.TYPE_CHECKING:
+	from .abc.module import Module
+	from .abc.service import Service
+	from .abc.singleton import Singleton
+	from .application import Application
+	from .config import Config, ConfigObject, Configurable
+	from .pdict import PersistentDict
+	from .pubsub import subscribe, PubSub, Subscriber
+	from .socket import StreamSocketServerService
+	from .timer import Timer
+
+
+def __getattr__(name):
+	module_name = _LAZY_IMPORTS.get(name)
+	if module_name is None:
+		raise AttributeError("module '{}' has no attribute '{}'".format(__name__, name))
+	value = getattr(importlib.import_module(module_name, __name__), name)
+	globals()[name] = value
+	return value
+
+
+def __dir__():
+	return sorted(set(globals()) | set(_LAZY_IMPORTS))
 
-from .__version__ import __version__, __build__
 
 # This logger is used to indicate use of the obsolete function
 # Example:
@@ -48,3 +87,5 @@ __all__ = (
 	'__version__',
 	'__build__',
 )
+
+importprofile.record("import", __name__, time.perf_counter() - _import_started_at)
@@ -1,4 +1,5 @@
 import abc
+import typing
 
 
 class Service(abc.ABC):
@@ -40,6 +41,20 @@ class Service(abc.ABC):
 	```
 	"""
 
+	Dependencies: typing.Iterable[str] = ()
+	"""
+	Names of services that have to be initialized before this service and finalized after it.
+
+	Services without mutual dependencies are initialized and finalized concurrently.
+	A dependency on a service that is not registered is ignored.
+	"""
+
+	LeaderOnly: bool = False
+	"""
+	If True, the service is initialized and finalized only in the leader worker (`asab.Application.LeaderWorker`),
+	so jobs that must run once per application (e.g. housekeeping of a shared storage) are not repeated by every prefork worker.
+	"""
+
 	def __init__(self, app, service_name: str):
 		"""
 		Register the service to `asab.Application.Services` dictionary with the provided `service_name`.
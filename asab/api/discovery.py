@@ -27,6 +27,9 @@ class DiscoveryService(Service):
 	"""
 	Service for discovering ASAB microservices in a server cluster. It is based on searching in ZooKeeper `/run` path.
 	"""
+
+	Dependencies = ("asab.ZooKeeperService",)
+
 	def __init__(self, app, zkc, service_name="asab.DiscoveryService") -> None:
 		super().__init__(app, service_name)
 		self.ZooKeeperContainer = zkc
@@ -356,7 +359,7 @@ class DiscoveryService(Service):
 
 			return result
 
-		result = await self.ProactorService.execute(get_items)
+		result = await self.ProactorService.execute(get_items, executor="zookeeper")
 		if result is None:
 			return []
 
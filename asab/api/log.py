@@ -1,6 +1,9 @@
+import json
 import asyncio
 import logging
 import datetime
+import threading
+import collections
 
 import aiohttp
 
@@ -17,15 +20,49 @@ LOG_ACCESS_RESOURCE_ID = "asab:service:access"
 ##
 
 
+class _LogViewer(object):
+	"""
+	A WebSocket client of `/asab/v1/logws` with a backlog of serialized log entries waiting to be sent.
+	"""
+
+	def __init__(self, ws):
+		self.WebSocket = ws
+		self.Backlog = collections.deque()
+		self.Ready = asyncio.Event()
+
+
+	async def send(self):
+		while True:
+			await self.Ready.wait()
+			self.Ready.clear()
+			while len(self.Backlog) > 0:
+				try:
+					await self.WebSocket.send_str(self.Backlog.popleft())
+				except ConnectionError:
+					# The viewer disconnected, the WebSocket handler removes it
+					return
+
+
 class WebApiLoggingHandler(logging.Handler):
+	"""
+	Keeps recent log entries in a ring buffer and streams new ones to WebSocket viewers.
 
+	Every log entry is serialized to JSON once. Entries are passed to the viewers in batches,
+	once per event loop iteration; a viewer that doesn't keep up and has more than `ws_queue_size` entries
+	waiting to be sent is disconnected.
+	"""
 
-	def __init__(self, app, level=logging.NOTSET, buffer_size: int = 10):
+	def __init__(self, app, level=logging.NOTSET, buffer_size: int = 10, ws_queue_size: int = 1000):
 		super().__init__(level=level)
 
-		self.Buffer = []
-		self._buffer_size = buffer_size
-		self.WebSockets = set()
+		self.Buffer = collections.deque(maxlen=buffer_size)
+		self.WebSockets = {}  # ws -> _LogViewer
+		self.WSQueueSize = ws_queue_size
+
+		self._loop = app.Loop
+		self._loop_thread = threading.get_ident()
+		self._pending = []
+		self._flush_scheduled = False
 
 		app.PubSub.subscribe("Application.stop!", self._on_stop)
 
@@ -76,15 +113,43 @@ class WebApiLoggingHandler(logging.Handler):
 		if sd is not None:
 			log_entry['sd'] = sd
 
-		if len(self.Buffer) > self._buffer_size:
-			del self.Buffer[0]
-			self.Buffer.append(log_entry)
+		entry = json.dumps(log_entry, default=str)
+		self.Buffer.append(entry)
 
-		else:
-			self.Buffer.append(log_entry)
+		if len(self.WebSockets) == 0:
+			return
+
+		self._pending.append(entry)
+		if self._flush_scheduled:
+			return
 
-		if len(self.WebSockets) > 0:
-			asyncio.ensure_future(self._send_ws(log_entry))
+		self._flush_scheduled = True
+		try:
+			if threading.get_ident() == self._loop_thread:
+				self._loop.call_soon(self._flush)
+			else:
+				self._loop.call_soon_threadsafe(self._flush)
+		except RuntimeError:
+			# The event loop is closed
+			self._flush_scheduled = False
+
+
+	def _flush(self):
+		# `emit()` runs under the handler lock, possibly in another thread
+		with self.lock:
+			self._flush_scheduled = False
+			batch = self._pending
+			self._pending = []
+
+		for ws, viewer in list(self.WebSockets.items()):
+			if len(viewer.Backlog) + len(batch) > self.WSQueueSize:
+				L.warning("Log viewer is too slow, disconnecting", struct_data={'backlog': len(viewer.Backlog)})
+				del self.WebSockets[ws]
+				asyncio.ensure_future(ws.close(code=aiohttp.WSCloseCode.TRY_AGAIN_LATER, message=b"Too slow"))
+				continue
+
+			viewer.Backlog.extend(batch)
+			viewer.Ready.set()
 
 
 	@require(LOG_ACCESS_RESOURCE_ID)
@@ -137,7 +202,15 @@ class WebApiLoggingHandler(logging.Handler):
 											const: 6
 		"""
 
-		return json_response(request, self.Buffer)
+		pretty = request.query.get('pretty', 'no').lower() in frozenset(['true', '1', 't', 'y', 'yes', ''])
+		if pretty:
+			return json_response(request, [json.loads(entry) for entry in self.Buffer], pretty=True)
+
+		# Entries are already serialized
+		return aiohttp.web.Response(
+			text="[{}]".format(",".join(self.Buffer)),
+			content_type="application/json",
+		)
 
 
 	@require(LOG_ACCESS_RESOURCE_ID)
@@ -188,10 +261,12 @@ class WebApiLoggingHandler(logging.Handler):
 		})
 
 		# Send historical logs
-		for log_entry in self.Buffer:
-			await ws.send_json(log_entry)
+		for entry in list(self.Buffer):
+			await ws.send_str(entry)
 
-		self.WebSockets.add(ws)
+		viewer = _LogViewer(ws)
+		sender = asyncio.ensure_future(viewer.send())
+		self.WebSockets[ws] = viewer
 		try:
 
 			async for msg in ws:
@@ -199,11 +274,7 @@ class WebApiLoggingHandler(logging.Handler):
 					break
 
 		finally:
-			self.WebSockets.remove(ws)
+			self.WebSockets.pop(ws, None)
+			sender.cancel()
 
 		return ws
-
-
-	async def _send_ws(self, log_entry):
-		for ws in self.WebSockets:
-			await ws.send_json(log_entry)
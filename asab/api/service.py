@@ -141,11 +141,16 @@ class ApiService(Service):
 		self.WebContainer = webcontainer
 
 		# TODO: Logging level configurable via config file
-		self.APILogHandler = WebApiLoggingHandler(self.App, level=logging.NOTSET)
+		self.APILogHandler = WebApiLoggingHandler(
+			self.App,
+			level=logging.NOTSET,
+			buffer_size=Config.getint("asab:api", "log_buffer_size"),
+			ws_queue_size=Config.getint("asab:api", "log_ws_queue_size"),
+		)
 		self.format = logging.Formatter("%%(asctime)s %%(levelname)s %%(name)s %%(struct_data)s%%(message)s")
 		self.APILogHandler.setFormatter(self.format)
 		self.Logging = logging.getLogger()
-		self.Logging.addHandler(self.APILogHandler)
+		self.App.Logging.add_handler(self.APILogHandler)
 
 		self.WebHandler = APIWebHandler(self, self.WebContainer.WebApp, self.APILogHandler)
 
@@ -23,8 +23,9 @@ class APIWebHandler(object):
 
 		webapp.router.add_get("/asab/v1/changelog", self.changelog)
 		webapp.router.add_get("/asab/v1/manifest", self.manifest)
+		webapp.router.add_get("/asab/v1/tasks", self.tasks)
 
-		NO_TENANT_ROUTES.update({"/asab/v1/logs", "/asab/v1/logws", "/asab/v1/changelog", "/asab/v1/manifest"})
+		NO_TENANT_ROUTES.update({"/asab/v1/logs", "/asab/v1/logws", "/asab/v1/changelog", "/asab/v1/manifest", "/asab/v1/tasks"})
 
 
 	@noauth
@@ -78,6 +79,82 @@ class APIWebHandler(object):
 		return json_response(request, self.ApiService.Manifest)
 
 
+	@require_superuser
+	async def tasks(self, request):
+		"""
+		Get live asyncio tasks of the application
+
+		Returns tasks with their current await point, counted by the coroutine name.
+		Tasks scheduled by the Task Service report also their age in seconds and where they have been scheduled.
+		Requires superuser access.
+
+		---
+		tags: ["ASAB"]
+
+		parameters:
+		-	name: stack
+			in: query
+			description: The maximum number of frames of the await point reported for each task.
+			required: false
+			schema:
+				type: integer
+				minimum: 1
+				default: 5
+		-	name: coroutine
+			in: query
+			description: Report only tasks of this coroutine.
+			required: false
+			schema:
+				type: string
+
+		responses:
+			"200":
+				description: Live tasks.
+				content:
+					application/json:
+						schema:
+							type: object
+							properties:
+								count:
+									type: integer
+									example: 2
+								coroutines:
+									type: object
+									example: {"WebSocketFactory.handler": 1, "forever": 1}
+								tasks:
+									type: array
+									items:
+										type: object
+										properties:
+											name:
+												type: string
+												example: Task-42
+											coroutine:
+												type: string
+												example: forever
+											age:
+												type: number
+												example: 3600.5
+											origin:
+												type: string
+												example: /app/myapp/service.py:42 __init__
+											stack:
+												type: array
+												items:
+													type: string
+												example: ["/app/myapp/service.py:57 my_forever_method"]
+		"""
+		try:
+			stack_limit = int(request.query.get("stack", 5))
+		except ValueError:
+			raise aiohttp.web.HTTPBadRequest(reason="Invalid 'stack' parameter.")
+		if stack_limit <= 0:
+			raise aiohttp.web.HTTPBadRequest(reason="The 'stack' parameter must be a positive number.")
+
+		result = self.App.TaskService.get_tasks_info(stack_limit=stack_limit, coroutine=request.query.get("coroutine"))
+		return json_response(request, result)
+
+
 	@require_superuser
 	async def environ(self, request):
 		"""
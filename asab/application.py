@@ -6,10 +6,10 @@ import random
 import logging
 import asyncio
 import argparse
-import itertools
 import platform
 import datetime
 import typing
+import importlib
 
 import threading
 
@@ -26,9 +26,27 @@ from .config import Config
 from .abc.singleton import Singleton
 from .log import Logging, _loop_exception_handler, LOG_NOTICE
 from .task import TaskService
+from .timing_wheel import TimingWheelService
+from . import importprofile
+from . import prefork
 
 L = logging.getLogger(__name__)
 
+# Services that are initialized before and finalized after all other services
+_CORE_SERVICES = ("asab.TaskService", "asab.TimingWheelService")
+
+# Periodic messages published by the run-time governor, the period is in ticks
+_TICKS = (
+	(10, "Application.tick/10!"),
+	(60, "Application.tick/60!"),
+	(300, "Application.tick/300!"),
+	(600, "Application.tick/600!"),
+	(1800, "Application.tick/1800!"),
+	(3600, "Application.tick/3600!"),
+	(43200, "Application.tick/43200!"),
+	(86400, "Application.tick/86400!"),
+)
+
 
 class Application(metaclass=Singleton):
 	"""The base application object that maintains the global application state.
@@ -99,6 +117,9 @@ class Application(metaclass=Singleton):
 		self.InitServicesQueue = []
 		# Queue of Modules to be initialized
 		self.InitModulesQueue = []
+		# Duration of the `initialize()` and `finalize()` of each service in seconds
+		self.ServiceInitTimes = {}
+		self.ServiceFinalizeTimes = {}
 
 		# Parse command line
 		self.Args = self.parse_arguments(args=args)
@@ -120,18 +141,47 @@ class Application(metaclass=Singleton):
 		elif hasattr(self.Args, "kill") and self.Args.kill:
 			self.daemon_kill()
 
+		# Fork worker processes in the prefork mode, the supervisor process doesn't return from here
+		self.WorkerCount = prefork.parse_workers(Config.get("general", "workers", fallback="1"))
+		self.WorkerId: typing.Optional[int] = None
+		"""
+		The id of this worker process (from 0) in the prefork mode, None otherwise.
+		"""
+		prefork_unsupported = False
+		if os.environ.get(prefork.WORKER_ID_ENV) is not None:
+			# The worker restarted itself
+			self.WorkerId = int(os.environ.pop(prefork.WORKER_ID_ENV))
+		elif self.WorkerCount > 1:
+			if prefork.is_supported():
+				self.WorkerId = prefork.Supervisor(self.WorkerCount).run()
+				os.environ.pop(prefork.WORKER_ID_ENV, None)
+			else:
+				prefork_unsupported = True
+				self.WorkerCount = 1
+
+		self.LeaderWorker: bool = self.WorkerId is None or self.WorkerId == 0
+		"""
+		True if this process runs leader-only services, i.e. it is not a prefork worker or it is the worker 0.
+		"""
+		self._supervisor_pid = os.getppid() if self.WorkerId is not None else None
+
 		# Seed the random generator
 		random.seed()
 
 		# Obtain the event loop
-		try:
-			self.Loop = asyncio.get_event_loop()
-		except RuntimeError:
-			self.Loop = None
+		event_loop = Config.get("general", "event_loop", fallback="asyncio").strip()
+		self.Loop, loop_fallback = _new_event_loop(event_loop)
+
+		if self.Loop is None:
+			try:
+				self.Loop = asyncio.get_event_loop()
+			except RuntimeError:
+				self.Loop = None
 
 		if self.Loop is None or self.Loop.is_closed():
 			self.Loop = asyncio.new_event_loop()
-			asyncio.set_event_loop(self.Loop)
+
+		asyncio.set_event_loop(self.Loop)
 
 		self.LaunchTime = time.time()
 		self.BaseTime = self.LaunchTime - self.Loop.time()
@@ -153,6 +203,11 @@ class Application(metaclass=Singleton):
 		self.Logging = Logging(self)
 
 		# Configure the event loop
+		if prefork_unsupported:
+			L.warning("Prefork mode is not supported on this platform, running in a single process")
+		if loop_fallback is not None:
+			L.warning("Event loop '{}' is not available, using the asyncio event loop".format(event_loop), struct_data={'reason': loop_fallback})
+		L.debug("Event loop", struct_data={'class': "{}.{}".format(type(self.Loop).__module__, type(self.Loop).__qualname__)})
 		self.Loop.set_exception_handler(_loop_exception_handler)
 		if Config["logging"].getboolean("verbose"):
 			self.Loop.set_debug(True)
@@ -193,16 +248,28 @@ class Application(metaclass=Singleton):
 		L.info("Initializing ...")
 
 		self.TaskService = TaskService(self)
+		self.TimingWheelService = TimingWheelService(self)
 
 		for module in modules:
 			self.add_module(module)
 
+		self.PubSub.subscribe("Config.changed!", self.Logging._on_config_changed)
+		if Config.getboolean("general", "config_watch") and len(Config.get_zookeeper_includes()) > 0:
+			from .zookeeper import Module as ZooKeeperModule
+			from .zookeeper.config_watch import ConfigWatchService
+			self.add_module(ZooKeeperModule)
+			ConfigWatchService(self)
+
 		# Set housekeeping time and time limit
 		self.HousekeepingTime, self.HousekeepingTimeLimit, self.HousekeepingId = self._initialize_housekeeping_schedule()
 		self.HousekeepingMissedEvents: list = []
 		# Every 10 minutes listen for housekeeping
 		self.PubSub.subscribe("Application.tick/600!", self._on_housekeeping_tick)
 
+		if self.WorkerId is not None:
+			L.log(LOG_NOTICE, "Prefork worker started", struct_data={'worker': self.WorkerId, 'pid': os.getpid()})
+			self.PubSub.subscribe("Application.tick/10!", self._on_supervisor_check)
+
 		# Run the watchdog to detect lost interactivity on the event loop
 		self.WatchdogThreshold = Config["general"].getseconds("watchdog_threshold")
 
@@ -212,6 +279,13 @@ class Application(metaclass=Singleton):
 			watchdog_thread.start()
 
 
+	def _on_supervisor_check(self, message_type):
+		# The worker is reparented when the supervisor died, it must not stay running on its own
+		if os.getppid() != self._supervisor_pid:
+			L.error("Prefork supervisor is gone, stopping the worker", struct_data={'worker': self.WorkerId})
+			self.stop()
+
+
 	def _watchdog(self):
 		"""
 		Periodically checks the loop interactivity
@@ -265,6 +339,7 @@ class Application(metaclass=Singleton):
 			add_help=add_help
 		)
 		parser.add_argument('-c', '--config', help='specify a path to a configuration file')
+		parser.add_argument('--no-config-cache', action='store_true', help='load the configuration from files, bypass the configuration cache')
 		parser.add_argument('-v', '--verbose', action='store_true', help='print more information (enable debug output)')
 		parser.add_argument('-s', '--syslog', action='store_true', help='enable logging to a syslog')
 		parser.add_argument('-l', '--log-file', help='specify a path to a log file')
@@ -297,6 +372,9 @@ class Application(metaclass=Singleton):
 		if args.config is not None:
 			Config._default_values['general']['config_file'] = args.config
 
+		if getattr(args, "no_config_cache", False):
+			Config._default_values['general']['config_cache'] = ''
+
 		if args.verbose:
 			Config._default_values['logging']['verbose'] = True
 
@@ -441,6 +519,7 @@ class Application(metaclass=Singleton):
 			self.initialize(),
 
 		))
+		importprofile.report([("service", name, duration) for name, duration in self.ServiceInitTimes.items()])
 
 		try:
 			# Commence run-time and application main() function
@@ -468,6 +547,8 @@ class Application(metaclass=Singleton):
 
 		finally:
 			if self.ExitCode == "!RESTART!":
+				if self.WorkerId is not None:
+					os.environ[prefork.WORKER_ID_ENV] = str(self.WorkerId)
 				os.execv(sys.executable, [os.path.basename(sys.executable)] + sys.argv)
 
 		return self.ExitCode
@@ -545,7 +626,9 @@ class Application(metaclass=Singleton):
 				# Already loaded and registered
 				return
 
+		t0 = time.perf_counter()
 		module = module_class(self)
+		importprofile.record("module", "{}.{}".format(module_class.__module__, module_class.__qualname__), time.perf_counter() - t0)
 		self.Modules.append(module)
 
 		# Enqueue module for initialization (happens in run phase)
@@ -623,47 +706,45 @@ class Application(metaclass=Singleton):
 			self.PubSub.publish("Application.housekeeping!")
 
 		# Wait for stop event & tick in meanwhile
-		for cycle_no in itertools.count(1):
+		# Ticks are aligned to deadlines derived from the start of the run-time,
+		# so the time spent by subscribers doesn't shift the following ticks
+		started_at = self.Loop.time()
+		cycle_no = 0
+		while True:
 
 			await self._ensure_initialization()
 
+			deadline = started_at + (cycle_no + 1) * timeout
 			try:
-				await asyncio.wait_for(self._stop_event.wait(), timeout=timeout)
+				await asyncio.wait_for(self._stop_event.wait(), timeout=max(0.0, deadline - self.Loop.time()))
 				break
 			except asyncio.TimeoutError:
-				self.PubSub.publish("Application.tick!")
-				if (cycle_no % 10) == 0:
-					self.PubSub.publish("Application.tick/10!")
-				if (cycle_no % 60) == 0:
+				pass
+
+			# If the loop was blocked for more than a tick period, the missed ticks are coalesced into one
+			previous_cycle_no = cycle_no
+			cycle_no = max(cycle_no + 1, int((self.Loop.time() - started_at) // timeout))
+			if cycle_no - previous_cycle_no > 1:
+				L.warning("Application ticks were skipped, the event loop was blocked", struct_data={'skipped': cycle_no - previous_cycle_no - 1})
+
+			self.PubSub.publish("Application.tick!")
+			for period, message_type in _TICKS:
+				if (cycle_no // period) == (previous_cycle_no // period):
+					continue
+				if period == 60:
 					# Rebase a Loop time
 					current_time = time.time()
 					self.LastOnTick60 = current_time
 					self.BaseTime = current_time - self.Loop.time()
-					self.PubSub.publish("Application.tick/60!")
-				if (cycle_no % 300) == 0:
-					self.PubSub.publish("Application.tick/300!")
-				if (cycle_no % 600) == 0:
-					self.PubSub.publish("Application.tick/600!")
-				if (cycle_no % 1800) == 0:
-					self.PubSub.publish("Application.tick/1800!")
-				if (cycle_no % 3600) == 0:
-					self.PubSub.publish("Application.tick/3600!")
-				if (cycle_no % 43200) == 0:
-					self.PubSub.publish("Application.tick/43200!")
-				if (cycle_no % 86400) == 0:
-					self.PubSub.publish("Application.tick/86400!")
-				continue
+				self.PubSub.publish(message_type)
 
 
 	async def _exit_time_governor(self):
 		self.PubSub.publish("Application.exit!")
+		started_at = self.Loop.time()
 
 		# Finalize services
-		for service in reversed(self.Services.values()):
-			try:
-				await service.finalize(self)
-			except Exception:
-				L.exception("Error during service finalize call")
+		await self._finalize_services()
 
 		# Finalize modules
 		for module in reversed(self.Modules):
@@ -672,27 +753,30 @@ class Application(metaclass=Singleton):
 			except Exception:
 				L.exception("Error during module finalize call")
 
-		# Wait for non-finalized tasks
-		tasks_awaiting = 0
-		for i in range(3):
-			try:
-				ts = asyncio.all_tasks(self.Loop)
-			except AttributeError:
-				# Compatibility for Python 3.6-
-				ts = asyncio.Task.all_tasks(self.Loop)
-			tasks_awaiting = 0
-			for t in ts:
-				if t.done():
-					continue
-				tasks_awaiting += 1
-			if tasks_awaiting <= 1:
-				# 2 is for _exit_time_governor and wait()
+		finalized_at = self.Loop.time()
+
+		# Wait for non-finalized tasks until they are done or the deadline passes
+		deadline = finalized_at + Config.getseconds('general', 'shutdown_timeout')
+		current_task = asyncio.current_task()
+		while True:
+			pending = [task for task in asyncio.all_tasks(self.Loop) if task is not current_task and not task.done()]
+			timeout = deadline - self.Loop.time()
+			if len(pending) == 0 or timeout <= 0:
 				break
+			# Tasks may create new tasks while finishing, so check again after they are done
+			await asyncio.wait(pending, timeout=timeout)
 
-			await asyncio.sleep(1)
+		slowest = sorted(self.ServiceFinalizeTimes.items(), key=lambda item: item[1], reverse=True)[:3]
+		L.info("Application finalized", struct_data={
+			'services': round(finalized_at - started_at, 3),
+			'tasks': round(self.Loop.time() - finalized_at, 3),
+			'slowest': ", ".join("{} ({:.3f}s)".format(name, duration) for name, duration in slowest),
+		})
 
-		else:
-			L.warning("Exiting but {} async task(s) are still waiting".format(tasks_awaiting))
+		if len(pending) > 0:
+			L.warning("Exiting but {} async task(s) are still waiting".format(len(pending)), struct_data={
+				'tasks': ", ".join(_task_name(task) for task in pending[:10]),
+			})
 
 
 	async def _ensure_initialization(self):
@@ -706,18 +790,137 @@ class Application(metaclass=Singleton):
 		# Initialize modules
 		while len(self.InitModulesQueue) > 0:
 			module = self.InitModulesQueue.pop()
+			t0 = time.perf_counter()
 			try:
 				await module.initialize(self)
 			except Exception:
 				L.exception("Error during module initialization")
+			importprofile.record("initialize", "{}.{}".format(module.__class__.__module__, module.__class__.__qualname__), time.perf_counter() - t0)
 
 		# Initialize services
 		while len(self.InitServicesQueue) > 0:
-			service = self.InitServicesQueue.pop()
+			# Services are started in the reversed order of their registration
+			services = self.InitServicesQueue[::-1]
+			self.InitServicesQueue = []
+			await self._initialize_services(services)
+
+
+	async def _initialize_services(self, services):
+		"""
+		Initialize services, each service after its dependencies.
+		Services are initialized one by one, unless `[general] concurrent_services` is enabled.
+		"""
+		dependencies = self._service_dependencies(services)
+		if not Config.getboolean("general", "concurrent_services"):
+			# Each service waits also for the previous one, in the order of `services` as far as dependencies allow
+			order = _sequential_order(services, dependencies)
+			for previous, name in zip(order, order[1:]):
+				dependencies[name].add(previous)
+		initialized = {service.Name: asyncio.Event() for service in services}
+		started_at = self.Loop.time()
+
+		async def initialize(service):
+			for dependency in dependencies[service.Name]:
+				await initialized[dependency].wait()
+
+			t0 = self.Loop.time()
+			try:
+				if service.LeaderOnly and not self.LeaderWorker:
+					L.debug("Leader-only service is not initialized in this worker", struct_data={'service': service.Name})
+				else:
+					await service.initialize(self)
+			except Exception:
+				L.exception("Error during service initialization", struct_data={'service': service.Name})
+			finally:
+				initialized[service.Name].set()
+
+			self.ServiceInitTimes[service.Name] = self.Loop.time() - t0
+			L.debug("Service initialized", struct_data={
+				'service': service.Name,
+				'waited': round(t0 - started_at, 3),
+				'duration': round(self.ServiceInitTimes[service.Name], 3),
+			})
+
+		await asyncio.gather(*(initialize(service) for service in services))
+
+		slowest = sorted(services, key=lambda service: self.ServiceInitTimes[service.Name], reverse=True)[:3]
+		L.info("Services initialized", struct_data={
+			'count': len(services),
+			'duration': round(self.Loop.time() - started_at, 3),
+			'slowest': ", ".join("{} ({:.3f}s)".format(service.Name, self.ServiceInitTimes[service.Name]) for service in slowest),
+		})
+
+
+	async def _finalize_services(self):
+		"""
+		Finalize services, each service after all services that depend on it.
+		Services are finalized one by one, unless `[general] concurrent_services` is enabled.
+		"""
+		services = list(reversed(self.Services.values()))
+		dependencies = self._service_dependencies(services)
+		dependents = {service.Name: set() for service in services}
+		for name, names in dependencies.items():
+			for dependency in names:
+				dependents[dependency].add(name)
+		if not Config.getboolean("general", "concurrent_services"):
+			# Each service waits also for the previous one, in the reversed order of registration as far as dependencies allow
+			order = _sequential_order(services, dependents)
+			for previous, name in zip(order, order[1:]):
+				dependents[name].add(previous)
+		finalized = {service.Name: asyncio.Event() for service in services}
+
+		async def finalize(service):
+			for dependent in dependents[service.Name]:
+				await finalized[dependent].wait()
+
+			t0 = self.Loop.time()
 			try:
-				await service.initialize(self)
+				if not service.LeaderOnly or self.LeaderWorker:
+					await service.finalize(self)
 			except Exception:
-				L.exception("Error during service initialization")
+				L.exception("Error during service finalize call", struct_data={'service': service.Name})
+			finally:
+				finalized[service.Name].set()
+			self.ServiceFinalizeTimes[service.Name] = self.Loop.time() - t0
+
+		await asyncio.gather(*(finalize(service) for service in services))
+
+
+	def _service_dependencies(self, services):
+		"""
+		Map service names to the names of their dependencies among `services`.
+		Core services (e.g. the Task Service) are implicit dependencies of all other services.
+		Dependency cycles are reported and the dependencies within the cycle are ignored.
+		"""
+		names = set(service.Name for service in services)
+		dependencies = {}
+		for service in services:
+			declared = set(service.Dependencies)
+			if service.Name not in _CORE_SERVICES:
+				declared.update(_CORE_SERVICES)
+			dependencies[service.Name] = set(
+				name for name in declared
+				if name in names and name != service.Name
+			)
+
+		# Kahn's algorithm, what remains are services in or behind a cycle
+		remaining = {name: set(deps) for name, deps in dependencies.items()}
+		ready = [name for name, deps in remaining.items() if len(deps) == 0]
+		while len(ready) > 0:
+			name = ready.pop()
+			del remaining[name]
+			for other, deps in remaining.items():
+				if name in deps:
+					deps.discard(name)
+					if len(deps) == 0:
+						ready.append(other)
+
+		if len(remaining) > 0:
+			L.error("Dependency cycle between services", struct_data={'services': ", ".join(sorted(remaining))})
+			for name in remaining:
+				dependencies[name] -= set(remaining)
+
+		return dependencies
 
 
 	def set_exit_code(self, exit_code: typing.Union[int, str], force: bool = False):
@@ -826,6 +1029,41 @@ class Application(metaclass=Singleton):
 					})
 
 
+def _new_event_loop(event_loop: str):
+	"""
+	Create an event loop selected by `[general] event_loop`.
+
+	Args:
+		event_loop: `asyncio` (the default loop), `uvloop`, `auto` (uvloop if installed, asyncio otherwise)
+			or `<module>:<factory>`, a callable that returns a new event loop.
+
+	Returns:
+		A tuple of the new loop (`None` for the default asyncio loop) and the reason of the fallback to asyncio (`None` if there was no fallback).
+	"""
+	if event_loop.lower() in ("", "asyncio"):
+		return None, None
+
+	if event_loop.lower() in ("uvloop", "auto"):
+		module_name, factory_name = "uvloop", "new_event_loop"
+	elif ":" in event_loop:
+		module_name, factory_name = event_loop.split(":", 1)
+	else:
+		return None, "Unknown event loop, expected 'asyncio', 'uvloop', 'auto' or '<module>:<factory>'"
+
+	try:
+		factory = getattr(importlib.import_module(module_name), factory_name)
+		return factory(), None
+	except Exception as e:
+		if event_loop.lower() == "auto":
+			return None, None
+		return None, "{}: {}".format(e.__class__.__name__, e)
+
+
+def _task_name(task) -> str:
+	coro = task.get_coro()
+	return "{} ({})".format(task.get_name(), getattr(coro, "__qualname__", coro))
+
+
 def _housekeeping_id(dt: datetime.datetime) -> int:
 	"""
 	Create a unique ID for each date. Utility function for housekeeping.
@@ -834,3 +1072,21 @@ def _housekeeping_id(dt: datetime.datetime) -> int:
 	20230418
 	"""
 	return int(dt.strftime("%Y%m%d"))
+
+
+def _sequential_order(services, before) -> list:
+	"""
+	Order service names as in `services`, except that every service comes after the services in `before[name]`.
+	`before` must not contain cycles, see `Application._service_dependencies()`.
+	"""
+	order = []
+	placed = set()
+	pending = [service.Name for service in services]
+	while len(pending) > 0:
+		for name in pending:
+			if before[name] <= placed:
+				break
+		pending.remove(name)
+		order.append(name)
+		placed.add(name)
+	return order
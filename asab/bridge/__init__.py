@@ -0,0 +1,39 @@
+import logging
+import asab
+
+from .service import PubSubBridgeService
+
+#
+
+L = logging.getLogger(__name__)
+
+#
+
+asab.Config.add_defaults(
+	{
+		'asab:pubsub:bridge': {
+			# Directory with Unix sockets of all bridged processes; empty means '<var_dir>/pubsub-bridge'
+			'path': '',
+			# Whitespace-separated list of message types that are forwarded to/from sibling processes
+			'topics': '',
+			# Messages published in one loop iteration are sent in datagrams up to this size
+			'max_datagram_size': 65000,
+		}
+	}
+)
+
+
+class Module(asab.Module):
+	'''
+	Forwarding of selected PubSub messages between ASAB processes on the same host.
+	'''
+
+	def __init__(self, app):
+		super().__init__(app)
+		self.service = PubSubBridgeService(app, "asab.PubSubBridgeService")
+
+
+__all__ = (
+	'Module',
+	'PubSubBridgeService',
+)
@@ -0,0 +1,73 @@
+import json
+import struct
+import typing
+
+# Datagram header: magic, version and the number of messages in the datagram
+_HEADER = struct.Struct("!2sBH")
+# Message header: the length of the message type and the length of the payload
+_MESSAGE = struct.Struct("!HI")
+
+MAGIC = b"AB"
+VERSION = 1
+HEADER_SIZE = _HEADER.size
+
+
+def encode_message(message_type: str, args: tuple, kwargs: dict) -> bytes:
+	"""
+	Encode one PubSub message into a frame.
+
+	Arguments are serialized as JSON.
+
+	Raises:
+		TypeError: An argument is not JSON-serializable.
+		ValueError: An argument contains a circular reference or a value that JSON cannot represent.
+	"""
+	message_type = message_type.encode("utf-8")
+	payload = json.dumps([args, kwargs], separators=(',', ':'), allow_nan=False).encode("utf-8")
+	return _MESSAGE.pack(len(message_type), len(payload)) + message_type + payload
+
+
+def encode_batch(frames: typing.List[bytes]) -> bytes:
+	"""
+	Join frames produced by `encode_message()` into one datagram.
+	"""
+	return _HEADER.pack(MAGIC, VERSION, len(frames)) + b"".join(frames)
+
+
+def decode_batch(datagram: bytes) -> typing.Iterator[typing.Tuple[str, list, dict]]:
+	"""
+	Iterate over `(message_type, args, kwargs)` triples of the datagram.
+
+	Raises:
+		ValueError: The datagram is not a valid bridge datagram.
+	"""
+	try:
+		magic, version, count = _HEADER.unpack_from(datagram, 0)
+	except struct.error as e:
+		raise ValueError("Truncated datagram: {}".format(e))
+
+	if magic != MAGIC or version != VERSION:
+		raise ValueError("Unknown datagram format")
+
+	view = memoryview(datagram)
+	offset = _HEADER.size
+	for _ in range(count):
+		try:
+			type_len, payload_len = _MESSAGE.unpack_from(datagram, offset)
+		except struct.error as e:
+			raise ValueError("Truncated datagram: {}".format(e))
+		offset += _MESSAGE.size
+
+		message_type = str(view[offset:offset + type_len], "utf-8")
+		offset += type_len
+
+		payload = json.loads(view[offset:offset + payload_len].tobytes())
+		offset += payload_len
+
+		if not isinstance(payload, list) or len(payload) != 2:
+			raise ValueError("Invalid message payload")
+		args, kwargs = payload
+		if not isinstance(args, list) or not isinstance(kwargs, dict):
+			raise ValueError("Invalid message payload")
+
+		yield message_type, args, kwargs
@@ -0,0 +1,269 @@
+import os
+import socket
+import logging
+
+from ..abc.service import Service
+from ..config import Config
+from .framing import encode_message, encode_batch, decode_batch, HEADER_SIZE
+
+#
+
+L = logging.getLogger(__name__)
+
+#
+
+
+class PubSubBridgeService(Service):
+	"""
+	Forward selected PubSub messages between ASAB processes running on the same host.
+
+	Every process binds a Unix datagram socket in a shared directory and sends bridged messages to all other sockets in that directory.
+	Messages published during one event loop iteration are batched into as few datagrams as possible.
+	A message received from a sibling process is published at the local `Application.PubSub`, but it is not forwarded again.
+
+	Only message types listed in the configuration or added by `forward()` are bridged, in both directions.
+	Message arguments are serialized as JSON; a message with an argument that is not JSON-serializable
+	(e.g. a provider object) is not forwarded, it is logged and counted as dropped.
+	Bridge only messages that are published by one of the processes; a message that every process publishes
+	by itself would be delivered twice.
+
+	Examples:
+
+	```ini
+	[asab:pubsub:bridge]
+	path=/run/my-app/pubsub-bridge
+	topics=MyCache.invalidate!
+	```
+
+	```python
+	from asab.bridge import Module
+	app.add_module(Module)
+	bridge_svc = app.get_service("asab.PubSubBridgeService")
+	bridge_svc.forward("MyCache.invalidate!")
+	```
+	"""
+
+	def __init__(self, app, service_name="asab.PubSubBridgeService"):
+		super().__init__(app, service_name)
+		self.Loop = app.Loop
+
+		self.Path = Config.get("asab:pubsub:bridge", "path")
+		if len(self.Path) == 0:
+			self.Path = os.path.join(Config.get("general", "var_dir"), "pubsub-bridge")
+		self.SocketPath = os.path.join(self.Path, "{}.sock".format(os.getpid()))
+		self.MaxDatagramSize = Config.getint("asab:pubsub:bridge", "max_datagram_size")
+
+		self.Socket = None
+		self.Peers = set()
+		self.Topics = set()
+
+		self.Outbox = []
+		self._flush_scheduled = False
+		self._receiving = False
+
+		self.Counter = None
+		metrics_svc = app.get_service("asab.MetricsService")
+		if metrics_svc is not None:
+			self.Counter = metrics_svc.create_counter(
+				"pubsub.bridge",
+				init_values={"sent": 0, "received": 0, "dropped": 0},
+				help="Counts PubSub messages sent to and received from sibling processes, a message sent to several processes is counted once per process.",
+			)
+
+		self.forward(*Config.get("asab:pubsub:bridge", "topics").split())
+
+		app.PubSub.subscribe("Application.tick/10!", self._on_tick)
+
+
+	async def initialize(self, app):
+		os.makedirs(self.Path, exist_ok=True)
+
+		# A leftover of a previous process with the same PID
+		if os.path.exists(self.SocketPath):
+			os.unlink(self.SocketPath)
+
+		self.Socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+		self.Socket.setblocking(False)
+		self.Socket.bind(self.SocketPath)
+		self.Loop.add_reader(self.Socket, self._on_read)
+
+		self._discover_peers()
+
+
+	async def finalize(self, app):
+		if self.Socket is None:
+			return
+
+		self._flush()
+
+		self.Loop.remove_reader(self.Socket)
+		self.Socket.close()
+		self.Socket = None
+
+		try:
+			os.unlink(self.SocketPath)
+		except FileNotFoundError:
+			pass
+
+
+	def forward(self, *message_types):
+		"""
+		Bridge the message types between this process and its siblings.
+
+		Args:
+			message_types: Message types to be forwarded, e.g. `"MyCache.invalidate!"`.
+		"""
+		for message_type in message_types:
+			if message_type in self.Topics:
+				continue
+			self.Topics.add(message_type)
+			self.App.PubSub.subscribe(message_type, self._on_local_message)
+
+
+	def _discover_peers(self):
+		try:
+			names = os.listdir(self.Path)
+		except FileNotFoundError:
+			return
+
+		peers = set()
+		for name in names:
+			if not name.endswith(".sock"):
+				continue
+			path = os.path.join(self.Path, name)
+			if path == self.SocketPath:
+				continue
+			peers.add(path)
+
+		self.Peers = peers
+
+
+	def _on_tick(self, message_type):
+		self._discover_peers()
+
+
+	def _on_local_message(self, message_type, *args, **kwargs):
+		if self._receiving:
+			# The message came from a sibling, don't send it back
+			return
+
+		if self.Socket is None:
+			return
+
+		try:
+			frame = encode_message(message_type, args, kwargs)
+		except (TypeError, ValueError) as e:
+			L.warning("Bridged PubSub message arguments are not JSON-serializable", struct_data={
+				'message_type': message_type,
+				'reason': str(e),
+			})
+			self._count("dropped")
+			return
+
+		if len(frame) + HEADER_SIZE > self.MaxDatagramSize:
+			L.warning("Bridged PubSub message is too large", struct_data={'message_type': message_type, 'size': len(frame)})
+			self._count("dropped")
+			return
+
+		self.Outbox.append(frame)
+		if not self._flush_scheduled:
+			self._flush_scheduled = True
+			self.Loop.call_soon(self._flush)
+
+
+	def _flush(self):
+		self._flush_scheduled = False
+		if len(self.Outbox) == 0:
+			return
+
+		frames = self.Outbox
+		self.Outbox = []
+
+		if len(self.Peers) == 0:
+			return
+
+		for datagram, count in self._batch(frames):
+			for peer in list(self.Peers):
+				self._send(datagram, count, peer)
+
+
+	def _batch(self, frames):
+		batch = []
+		size = HEADER_SIZE
+		for frame in frames:
+			if len(batch) > 0 and size + len(frame) > self.MaxDatagramSize:
+				yield encode_batch(batch), len(batch)
+				batch = []
+				size = HEADER_SIZE
+			batch.append(frame)
+			size += len(frame)
+
+		if len(batch) > 0:
+			yield encode_batch(batch), len(batch)
+
+
+	def _send(self, datagram, count, peer):
+		# Counters are in messages, `count` is the number of messages in the datagram
+		try:
+			self.Socket.sendto(datagram, peer)
+
+		except BlockingIOError:
+			# The peer doesn't keep up, its socket buffer is full
+			self._count("dropped", count)
+			return
+
+		except ConnectionRefusedError:
+			# Nobody listens on the socket, it is a leftover of a terminated process
+			self.Peers.discard(peer)
+			try:
+				os.unlink(peer)
+			except OSError:
+				pass
+			return
+
+		except FileNotFoundError:
+			self.Peers.discard(peer)
+			return
+
+		except OSError as e:
+			L.warning("Failed to send bridged PubSub messages", struct_data={'peer': peer, 'reason': str(e)})
+			self._count("dropped", count)
+			return
+
+		self._count("sent", count)
+
+
+	def _on_read(self):
+		while True:
+			try:
+				datagram, address = self.Socket.recvfrom(self.MaxDatagramSize)
+			except (BlockingIOError, InterruptedError):
+				return
+			except OSError as e:
+				L.warning("Failed to receive bridged PubSub messages", struct_data={'reason': str(e)})
+				return
+
+			if isinstance(address, str) and len(address) > 0 and address != self.SocketPath:
+				self.Peers.add(address)
+
+			try:
+				messages = list(decode_batch(datagram))
+			except ValueError as e:
+				L.warning("Invalid bridged PubSub datagram", struct_data={'peer': address, 'reason': str(e)})
+				continue
+
+			for message_type, args, kwargs in messages:
+				if message_type not in self.Topics:
+					continue
+
+				self._count("received")
+				self._receiving = True
+				try:
+					self.App.PubSub.publish(message_type, *args, **kwargs)
+				finally:
+					self._receiving = False
+
+
+	def _count(self, name, value=1):
+		if self.Counter is not None:
+			self.Counter.add(name, value)
@@ -2,6 +2,9 @@ import os
 import sys
 import re
 import glob
+import json
+import time
+import hashlib
 import logging
 import inspect
 import platform
@@ -15,6 +18,12 @@ from . import utils
 
 L = logging.getLogger(__name__)
 
+# Format version of the configuration cache file, see `ConfigParser._load()`
+_CONFIG_CACHE_VERSION = 1
+
+# References to environment variables in configuration files, i.e. `$NAME` or `${NAME}`
+_ENV_REFERENCE_RE = re.compile(r"\$(?:\{(\w+)\}|(\w+))")
+
 
 class ConfigParser(configparser.ConfigParser):
 	"""
@@ -32,6 +41,10 @@ class ConfigParser(configparser.ConfigParser):
 
 		'general': {
 			'config_file': os.environ.get('ASAB_CONFIG', ''),
+			# Path of the cache of the loaded configuration; empty disables the cache
+			'config_cache': os.environ.get('ASAB_CONFIG_CACHE', ''),
+			# Watch ZooKeeper nodes in `include` and apply their changes without a restart, see `Config.changed!`
+			'config_watch': 'no',
 			'tick_period': 1,  # In seconds
 			'var_dir': os.path.expanduser('~/.' + os.path.splitext(os.path.basename(sys.argv[0]))[0]),
 
@@ -48,6 +61,19 @@ class ConfigParser(configparser.ConfigParser):
 			# If the threshold (in seconds) since the last tick/60! passed, the application is killed
 			# If 0, the watchdog is not started
 			'watchdog_threshold': 15 * 60,  # 15 minutes
+
+			# Number of prefork worker processes; 'auto' is the number of CPUs; 1 disables the prefork mode
+			'workers': 1,
+
+			# Event loop implementation: 'asyncio', 'uvloop', 'auto' (uvloop if installed) or '<module>:<factory>'
+			'event_loop': 'asyncio',
+
+			# How long the exit-time waits for tasks that are still running after all services are finalized
+			'shutdown_timeout': '3s',
+
+			# Initialize and finalize services concurrently, ordered only by their `Dependencies`;
+			# otherwise they are initialized one by one in the reversed order of registration
+			'concurrent_services': 'no',
 		},
 
 		"asab:metrics": {
@@ -60,6 +86,23 @@ class ConfigParser(configparser.ConfigParser):
 			"interval_multiplier": 1,
 		},
 
+		"asab:pubsub": {
+			# Count published messages and measure the delivery duration per subscriber (exported as metrics)
+			"instrumentation": "no",
+			# Deliveries that take longer than this are reported as slow
+			"slow_threshold": "100ms",
+		},
+
+		"asab:timer": {
+			# Precision of `asab.Timer`, timers are triggered at the first tick after their timeout
+			"resolution": "10ms",
+		},
+
+		"asab:api": {
+			"log_buffer_size": 10,  # Number of recent log entries available at /asab/v1/logs
+			"log_ws_queue_size": 1000,  # A log viewer with more entries waiting to be sent is disconnected
+		},
+
 		"asab:doc": {
 			"default_route_tag": "module_name"
 		},
@@ -70,6 +113,21 @@ class ConfigParser(configparser.ConfigParser):
 			"sd_id": "sd",  # Structured data id, see RFC5424
 			"level": "NOTICE",
 			"levels": "",
+
+			# Queued logging: records are written to the console, file and UDP syslog by a background thread
+			"queue": "false",
+			"queue_size": 10000,
+			# What to do when the queue is full: 'drop' the new record, 'drop_oldest' record or 'block' the logging thread
+			"queue_overflow": "drop",
+
+			# Rate limiting of records with the same logger and message: a token bucket of 'rate_limit_burst' records,
+			# refilled by 'rate_limit_rate' records per second, for at most 'rate_limit_keys' messages
+			"rate_limit": "false",
+			"rate_limit_burst": 20,
+			"rate_limit_rate": 1,
+			"rate_limit_keys": 1000,
+			# How often the number of suppressed records is logged
+			"rate_limit_summary": "60s",
 		},
 
 		"logging:console": {
@@ -83,6 +141,10 @@ class ConfigParser(configparser.ConfigParser):
 			# TODO: "facility": 'local1',
 			"address": _syslog_sockets.get(platform.system(), "/dev/log"),
 			"format": _syslog_format.get(platform.system(), "3"),
+			# Maximum number of messages waiting for the connection, the oldest are dropped
+			"queue_size": 10000,
+			# Record attributes serialized by the 'json' format, e.g. 'created levelname name message _struct_data'; all if empty
+			"json_fields": "",
 		},
 
 		"logging:file": {
@@ -92,6 +154,10 @@ class ConfigParser(configparser.ConfigParser):
 			"backup_count": 3,
 			"backup_max_bytes": 0,
 			"rotate_every": "",
+			# Compression of rotated files in a background thread: 'gzip', 'xz' or empty for none
+			"compress": "",
+			# Rotated files are removed from the oldest when their total size exceeds this limit; 0 means no limit
+			"backup_max_total_bytes": 0,
 		},
 
 		"library": {
@@ -146,6 +212,75 @@ class ConfigParser(configparser.ConfigParser):
 		# If `ASAB_ZOOKEEPER_SERVERS` are specified, use that as a default value
 		_default_values['zookeeper'] = {'servers': os.environ['ASAB_ZOOKEEPER_SERVERS']}
 
+	# Cached `ConfigSnapshot`, dropped whenever the configuration changes
+	_snapshot = None
+
+
+	def __init__(self, *args, **kwargs):
+		# Values added by `add_defaults()`, section -> option -> value
+		self._defaults_layer = {}
+		# Options set by the configuration file and each include, in the order of loading;
+		# the configuration is recomputed from them when an include is reloaded
+		self._layers = []
+		# ZooKeeper includes, URL -> dict(servers, path, layer, content, data, this_dir)
+		self._zookeeper_includes = {}
+		# Sources of the configuration recorded for the configuration cache during `_load()`
+		self._cache_record = None
+		super().__init__(*args, **kwargs)
+
+
+	def snapshot(self) -> "ConfigSnapshot":
+		"""
+		Get an immutable snapshot of the configuration with interpolated and typed values cached.
+
+		The snapshot is built at the first call and shared until the configuration is changed,
+		e.g. by `set()`, `read()` or a reload of the configuration; the next call then builds a new one.
+		Use it in code that reads the configuration often, e.g. for every request.
+
+		Returns:
+			ConfigSnapshot: Snapshot of the current configuration.
+
+		Examples:
+
+		```python
+		expiration = asab.Config.snapshot().getseconds("asab:metrics", "expiration")
+		web = asab.Config.snapshot()["web"]
+		backlog = web.getint("backlog")
+		```
+		"""
+		snapshot = self._snapshot
+		if snapshot is None:
+			snapshot = ConfigSnapshot(self)
+			self._snapshot = snapshot
+		return snapshot
+
+
+	def set(self, section, option, value=None):
+		super().set(section, option, value)
+		self._snapshot = None
+
+
+	def add_section(self, section):
+		self._snapshot = None
+		super().add_section(section)
+
+
+	def remove_option(self, section, option):
+		self._snapshot = None
+		return super().remove_option(section, option)
+
+
+	def remove_section(self, section):
+		self._snapshot = None
+		return super().remove_section(section)
+
+
+	def _read(self, fp, fpname):
+		# All read methods (`read()`, `read_file()`, `read_string()`) end up here
+		self._snapshot = None
+		return super()._read(fp, fpname)
+
+
 	def add_defaults(self, dictionary: dict) -> None:
 		"""Add defaults to a current configuration.
 
@@ -166,17 +301,18 @@ class ConfigParser(configparser.ConfigParser):
 			for key, value in keys.items():
 
 				key = self.optionxform(str(key))
+				if value is not None:
+					value = str(value)
+					if "$" in value:
+						value = os.path.expandvars(value)
+
+				self._defaults_layer.setdefault(section, {})[key] = value
+
 				if key in self._sections[section]:
 					# Value exists, no default needed
 					continue
 
-				if value is not None:
-					value = str(value)
-
-				if value is not None and "$" in value:
-					self.set(section, key, os.path.expandvars(value))
-				else:
-					self.set(section, key, value)
+				self.set(section, key, value)
 
 
 	def _traverse_includes(self, includes: str, this_dir: str) -> None:
@@ -188,6 +324,9 @@ class ConfigParser(configparser.ConfigParser):
 		else:
 			sep = " "
 
+		if self._cache_record is not None:
+			self._record_env_references(includes)
+
 		for include_glob in includes.split(sep):
 			include_glob = include_glob.strip()
 
@@ -199,7 +338,11 @@ class ConfigParser(configparser.ConfigParser):
 
 			include_glob = os.path.expandvars(include_glob.strip())
 
-			for include in glob.glob(include_glob):
+			matches = glob.glob(include_glob)
+			if self._cache_record is not None:
+				self._cache_record["globs"].append([include_glob, matches])
+
+			for include in matches:
 				include = os.path.abspath(include)
 
 				if include in self._included:
@@ -212,7 +355,7 @@ class ConfigParser(configparser.ConfigParser):
 
 				self._load_dir_stack.append(os.path.dirname(include))
 				try:
-					self.read(include)
+					self._read_file_layer(include)
 				finally:
 					self._load_dir_stack.pop()
 
@@ -223,25 +366,42 @@ class ConfigParser(configparser.ConfigParser):
 	def _load(self):
 		"""
 		This method should be called only once, any subsequent call will lead to undefined behaviour.
+
+		When `[general] config_cache` (the `ASAB_CONFIG_CACHE` environment variable) is set, the loaded configuration
+		is stored in the cache file and the next start loads it from there, unless a configuration file,
+		the result of an include glob or a referenced environment variable changed.
+		Configurations that include ZooKeeper nodes are not cached.
 		"""
 		self._load_dir_stack = []
 		self.config_contents_list = []
 		self.config_name_list = []
 
 		config_fname = ConfigParser._default_values['general']['config_file']
+		cache_path = ConfigParser._default_values['general'].get('config_cache', '')
+
 		if config_fname != '':
 			if not os.path.isfile(config_fname):
 				print("Config file '{}' not found".format(config_fname), file=sys.stderr)
 				sys.exit(1)
 
+		if cache_path != '' and self._load_cache(cache_path, config_fname):
+			del self._load_dir_stack
+			return
+
+		if cache_path != '':
+			self._cache_record = {"sources": [], "globs": [], "env": {}, "cacheable": True}
+
+		if config_fname != '':
 			self._load_dir_stack.append(os.path.dirname(config_fname))
 			try:
-				self.read(config_fname)
+				self._read_file_layer(config_fname)
 			finally:
 				self._load_dir_stack.pop()
 
 		self.add_defaults(ConfigParser._default_values)
 
+		if self._cache_record is not None:
+			self._cache_record["includes"] = self._sections.get('general', {}).get('include', '')
 		includes = self.get('general', 'include', fallback='')
 
 		self._included = set()
@@ -249,6 +409,139 @@ class ConfigParser(configparser.ConfigParser):
 
 		del self._load_dir_stack
 
+		if self._cache_record is not None:
+			if self._cache_record["cacheable"]:
+				self._save_cache(cache_path, config_fname)
+			self._cache_record = None
+
+
+	def _read_file_layer(self, path):
+		"""
+		Read a configuration file on its own and apply its options to the configuration, see `_layers`.
+		"""
+		if self._cache_record is not None:
+			stat = os.stat(path)
+			with open(path, "rb") as f:
+				content = f.read()
+			self._cache_record["sources"].append([
+				os.path.abspath(path), stat.st_mtime_ns, stat.st_size, hashlib.sha256(content).hexdigest()
+			])
+			self._record_env_references(content.decode("utf-8", errors="replace"))
+
+		parser = ConfigParser(interpolation=self._interpolation)
+		parser.optionxform = self.optionxform
+		parser._load_dir_stack = self._load_dir_stack
+		parser.read(path)
+		layer = parser._raw_sections()
+		self._apply_layer(layer)
+		return layer
+
+
+	def _apply_layer(self, layer):
+		for section, options in layer.items():
+			if section == self.default_section:
+				self._defaults.update(options)
+				continue
+			if section not in self._sections:
+				self.add_section(section)
+			self._sections[section].update(options)
+		self._layers.append(layer)
+		self._snapshot = None
+
+
+	def _record_env_references(self, text):
+		for match in _ENV_REFERENCE_RE.finditer(text):
+			name = match.group(1) or match.group(2)
+			if name == "THIS_DIR":
+				# Set by the configuration loader to the directory of the file
+				continue
+			self._cache_record["env"][name] = os.environ.get(name)
+
+
+	def _load_cache(self, cache_path, config_fname) -> bool:
+		"""
+		Load the configuration from the cache if it is valid; returns False if the configuration has to be loaded from files.
+		"""
+		try:
+			with open(cache_path) as f:
+				cache = json.load(f)
+
+			if cache["version"] != _CONFIG_CACHE_VERSION or cache["config_file"] != config_fname or cache["cwd"] != os.getcwd():
+				return False
+
+			for path, mtime_ns, size, digest in cache["sources"]:
+				stat = os.stat(path)
+				if stat.st_mtime_ns != mtime_ns or stat.st_size != size:
+					return False
+				if mtime_ns / 1e9 >= cache["created"] - 1.0:
+					# The file could be changed within the resolution of the modification time after it was cached
+					with open(path, "rb") as f:
+						if hashlib.sha256(f.read()).hexdigest() != digest:
+							return False
+
+			for pattern, matches in cache["globs"]:
+				if glob.glob(pattern) != matches:
+					return False
+
+			for name, value in cache["env"].items():
+				if os.environ.get(name) != value:
+					return False
+
+			layers = cache["layers"]
+			if config_fname != '':
+				layer, include_layers = layers[0], layers[1:]
+			else:
+				layer, include_layers = {}, layers
+
+			# The `include` option as `_load()` would see it
+			includes = layer.get('general', {}).get('include')
+			if includes is None:
+				includes = self._sections.get('general', {}).get('include')
+			if includes is None:
+				includes = ConfigParser._default_values['general'].get('include', '')
+			if includes != cache["includes"]:
+				return False
+
+		except (OSError, ValueError, KeyError, TypeError, IndexError):
+			return False
+
+		if config_fname != '':
+			self._apply_layer(layer)
+		self.add_defaults(ConfigParser._default_values)
+		for layer in include_layers:
+			self.set('general', 'include', '')
+			self._apply_layer(layer)
+		return True
+
+
+	def _save_cache(self, cache_path, config_fname):
+		record = self._cache_record
+		cache = {
+			"version": _CONFIG_CACHE_VERSION,
+			"created": time.time(),
+			"config_file": config_fname,
+			"cwd": os.getcwd(),
+			"includes": record["includes"],
+			"sources": record["sources"],
+			"globs": record["globs"],
+			"env": record["env"],
+			"layers": self._layers,
+		}
+
+		tmp_path = "{}.{}.tmp".format(cache_path, os.getpid())
+		try:
+			# The configuration can contain passwords
+			fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+			with os.fdopen(fd, "w") as f:
+				json.dump(cache, f)
+			os.replace(tmp_path, cache_path)
+		except OSError as e:
+			L.warning("Cannot write the configuration cache: {}".format(e), struct_data={'path': cache_path})
+			try:
+				os.remove(tmp_path)
+			except OSError:
+				pass
+
 
 	def _include_from_zookeeper(self, zkurl):
 		"""
@@ -296,38 +589,168 @@ class ConfigParser(configparser.ConfigParser):
 		try:
 			# Delayed import to minimize a hard dependency footprint
 			import kazoo.client
-			import json
-			import yaml
 			zk = kazoo.client.KazooClient(url_netloc)
 			zk.start()
 			data = zk.get(url_path)[0]
-			if url_path.endswith(".json"):
-				config = json.loads(data)
-				self.read_dict(config)
-			elif url_path.endswith(".yaml"):
-				config = yaml.safe_load(data)
-				self.read_dict(config)
-			elif url_path.endswith(".conf"):
-				config = data.decode("utf-8")
-				self.read_string(config)
-			else:
-				raise NotImplementedError("Unknown configuration format '{}'".format(url_path))
+			self._apply_zookeeper_include(zkurl, url_netloc, url_path, data)
 
 			zk.stop()
 			zk.close()
 
-			# Include in the list of config file contents
-			self.config_contents_list.append(config)
-
 		except Exception as e:
 			L.error("Failed to obtain configuration from Zookeeper server(s): '{}'.".format(e))
 			sys.exit(1)
 
 
+	def _apply_zookeeper_include(self, zkurl, url_netloc, url_path, data):
+		if self._cache_record is not None:
+			# It isn't known whether the node changed without contacting ZooKeeper
+			self._cache_record["cacheable"] = False
+
+		this_dir = self._load_dir_stack[-1] if len(self._load_dir_stack) > 0 else os.getcwd()
+		config, layer = self._parse_zookeeper_layer(url_path, data, this_dir)
+
+		# Include in the list of config file contents
+		self.config_contents_list.append(config)
+
+		self._zookeeper_includes[zkurl] = {
+			"servers": url_netloc,
+			"path": url_path,
+			"layer": len(self._layers),
+			"content": len(self.config_contents_list) - 1,
+			"data": data,
+			"this_dir": this_dir,
+		}
+		self._apply_layer(layer)
+
+
+	@staticmethod
+	def _parse_zookeeper_include(parser, url_path, data):
+		"""
+		Read the content of a ZooKeeper node into the parser, by the format given by the node name.
+		"""
+		if url_path.endswith(".json"):
+			import json
+			config = json.loads(data)
+			parser.read_dict(config)
+		elif url_path.endswith(".yaml"):
+			import yaml
+			config = yaml.safe_load(data)
+			parser.read_dict(config)
+		elif url_path.endswith(".conf"):
+			config = data.decode("utf-8")
+			parser.read_string(config)
+		else:
+			raise NotImplementedError("Unknown configuration format '{}'".format(url_path))
+		return config
+
+
+	def _parse_zookeeper_layer(self, url_path, data, this_dir):
+		"""
+		Parse the content of a ZooKeeper node on its own.
+
+		Returns:
+			The parsed content (for `get_config_contents_list()`) and section -> option -> raw value.
+		"""
+		parser = ConfigParser(interpolation=self._interpolation)
+		parser.optionxform = self.optionxform
+		parser._load_dir_stack = [this_dir]
+		config = self._parse_zookeeper_include(parser, url_path, data)
+		return config, parser._raw_sections()
+
+
+	def _raw_sections(self):
+		sections = {section: dict(options) for section, options in self._sections.items()}
+		if len(self._defaults) > 0:
+			sections[self.default_section] = dict(self._defaults)
+		return sections
+
+
 	def get_config_contents_list(self):
 		return self.config_contents_list, self.config_name_list
 
 
+	def get_zookeeper_includes(self) -> typing.Dict[str, typing.Tuple[str, str]]:
+		"""
+		Get ZooKeeper nodes included in the configuration.
+
+		Returns:
+			Include URL -> (ZooKeeper servers, path of the node)
+		"""
+		return {url: (include["servers"], include["path"]) for url, include in self._zookeeper_includes.items()}
+
+
+	def reload_zookeeper_include(self, url: str, data: bytes) -> typing.Dict[str, typing.Dict[str, typing.Tuple[typing.Optional[str], typing.Optional[str]]]]:
+		"""
+		Apply a new content of a ZooKeeper node included in the configuration.
+
+		Only this include is parsed again. Options that it adds, changes or removes are set to the value
+		they would have if the configuration was loaded from scratch, so options overridden by later includes stay
+		and a removed option falls back to an earlier include, the configuration file or the default value.
+
+		Args:
+			url: Include URL, see `get_zookeeper_includes()`.
+			data: New content of the ZooKeeper node.
+
+		Returns:
+			Changed options, section -> option -> (old raw value, new raw value); `None` means the option is not set.
+		"""
+		include = self._zookeeper_includes[url]
+		if data == include["data"]:
+			return {}
+
+		config, layer = self._parse_zookeeper_layer(include["path"], data, include["this_dir"])
+		old_layer = self._layers[include["layer"]]
+		self._layers[include["layer"]] = layer
+		include["data"] = data
+		self.config_contents_list[include["content"]] = config
+
+		options = set()
+		for changed_layer in (old_layer, layer):
+			for section, section_options in changed_layer.items():
+				for option in section_options:
+					options.add((section, option))
+		# Includes are resolved only when the configuration is loaded
+		options.discard(("general", "include"))
+		options = {(section, option) for section, option in options if section != self.default_section}
+
+		diff = {}
+		for section, option in sorted(options):
+			present = option in self._sections.get(section, {})
+			old = self._sections[section][option] if present else None
+			found, value = self._effective_value(section, option)
+			if found == present and old == value:
+				continue
+
+			if not found:
+				configparser.RawConfigParser.remove_option(self, section, option)
+			else:
+				if section not in self._sections:
+					self.add_section(section)
+				# Values were validated when parsed, as when they are read from a file
+				configparser.RawConfigParser.set(self, section, option, value)
+
+			diff.setdefault(section, {})[option] = (old, value)
+
+		if len(diff) > 0:
+			self._snapshot = None
+		return diff
+
+
+	def _effective_value(self, section, option):
+		"""
+		The value of the option as if the configuration was loaded from scratch; returns (found, value).
+		"""
+		for layer in reversed(self._layers):
+			options = layer.get(section)
+			if options is not None and option in options:
+				return True, options[option]
+		defaults = self._defaults_layer.get(section, {})
+		if option in defaults:
+			return True, defaults[option]
+		return False, None
+
+
 	def getseconds(self, section, option, *, raw=False, vars=None, fallback=None, **kwargs) -> float:
 		"""
 		Get time data from config and convert time string into seconds with `convert_to_seconds()` method.
@@ -447,6 +870,175 @@ my_conf_value = asab.Config['section_name']['key']
 """
 
 
+class ConfigSnapshot(collections.abc.Mapping):
+	"""
+	Immutable snapshot of the configuration, see `Config.snapshot()`.
+
+	Values are interpolated once, when the snapshot is built;
+	typed values (`getint()`, `getseconds()` etc.) are parsed at the first access and cached.
+	The snapshot maps section names to `ConfigSnapshotSection` views and offers typed accessors with the same
+	signature as `asab.Config`, including `NoSectionError` and `NoOptionError` when there is no fallback.
+	"""
+
+	def __init__(self, config: ConfigParser):
+		self._sections = {
+			section: ConfigSnapshotSection(config, section)
+			for section in config.sections()
+		}
+
+
+	def __getitem__(self, section):
+		return self._sections[section]
+
+	def __iter__(self):
+		return iter(self._sections)
+
+	def __len__(self):
+		return len(self._sections)
+
+
+	def _section(self, section, fallback):
+		try:
+			return self._sections[section]
+		except KeyError:
+			if fallback is configparser._UNSET:
+				raise configparser.NoSectionError(section) from None
+			return None
+
+
+	def get(self, section, option=None, *, fallback=configparser._UNSET):
+		if option is None:
+			# Mapping interface, `snapshot.get(section)`
+			return self._sections.get(section, None if fallback is configparser._UNSET else fallback)
+		s = self._section(section, fallback)
+		return fallback if s is None else s.get(option, fallback=fallback)
+
+
+	def getint(self, section, option, *, fallback=configparser._UNSET) -> int:
+		s = self._section(section, fallback)
+		return fallback if s is None else s.getint(option, fallback=fallback)
+
+
+	def getfloat(self, section, option, *, fallback=configparser._UNSET) -> float:
+		s = self._section(section, fallback)
+		return fallback if s is None else s.getfloat(option, fallback=fallback)
+
+
+	def getboolean(self, section, option, *, fallback=configparser._UNSET) -> bool:
+		s = self._section(section, fallback)
+		return fallback if s is None else s.getboolean(option, fallback=fallback)
+
+
+	def getseconds(self, section, option, *, fallback=configparser._UNSET) -> float:
+		s = self._section(section, fallback)
+		return fallback if s is None else s.getseconds(option, fallback=fallback)
+
+
+	def getmultiline(self, section, option, *, fallback=configparser._UNSET) -> typing.List[str]:
+		s = self._section(section, fallback)
+		return fallback if s is None else s.getmultiline(option, fallback=fallback)
+
+
+	def geturl(self, section, option, *, fallback=configparser._UNSET, scheme=None):
+		s = self._section(section, fallback)
+		return fallback if s is None else s.geturl(option, fallback=fallback, scheme=scheme)
+
+
+class ConfigSnapshotSection(collections.abc.Mapping):
+	"""
+	Immutable view of a configuration section in a `ConfigSnapshot`, with typed values cached per option.
+	"""
+
+	def __init__(self, config: ConfigParser, section: str):
+		self.Name = section
+		self._optionxform = config.optionxform
+		self._to_boolean = config._convert_to_boolean
+		self._values = {}
+		self._errors = {}
+		for option in config.options(section):
+			try:
+				self._values[option] = config.get(section, option)
+			except configparser.InterpolationError as e:
+				# Raised when the option is accessed, as `Config.get()` would do
+				self._errors[option] = e
+		self._typed = {}
+
+
+	def __getitem__(self, option):
+		option = self._optionxform(option)
+		try:
+			return self._values[option]
+		except KeyError:
+			error = self._errors.get(option)
+			if error is not None:
+				raise error from None
+			raise
+
+	def __iter__(self):
+		return iter(self._values)
+
+	def __len__(self):
+		return len(self._values)
+
+	def __repr__(self):
+		return "<%s [%s] %r>" % (self.__class__.__name__, self.Name, self._values)
+
+
+	def _get_typed(self, option, kind, converter, fallback):
+		key = (option, kind)
+		try:
+			return self._typed[key]
+		except KeyError:
+			pass
+
+		try:
+			value = self[option]
+		except KeyError:
+			if fallback is configparser._UNSET:
+				raise configparser.NoOptionError(option, self.Name) from None
+			return fallback
+
+		value = converter(value)
+		self._typed[key] = value
+		return value
+
+
+	def get(self, option, fallback=None):
+		try:
+			return self[option]
+		except KeyError:
+			return fallback
+
+
+	def getint(self, option, *, fallback=configparser._UNSET) -> int:
+		return self._get_typed(option, "int", int, fallback)
+
+
+	def getfloat(self, option, *, fallback=configparser._UNSET) -> float:
+		return self._get_typed(option, "float", float, fallback)
+
+
+	def getboolean(self, option, *, fallback=configparser._UNSET) -> bool:
+		return self._get_typed(option, "boolean", self._to_boolean, fallback)
+
+
+	def getseconds(self, option, *, fallback=configparser._UNSET) -> float:
+		return self._get_typed(option, "seconds", utils.convert_to_seconds, fallback)
+
+
+	def getmultiline(self, option, *, fallback=configparser._UNSET) -> typing.List[str]:
+		# A tuple, so the cached value can't be changed by the caller
+		return self._get_typed(
+			option, "multiline",
+			lambda value: tuple(item.strip() for item in re.split(r"\s+", value) if len(item) > 0),
+			fallback
+		)
+
+
+	def geturl(self, option, *, fallback=configparser._UNSET, scheme=None):
+		return self._get_typed(option, ("url", scheme), lambda value: utils.validate_url(value, scheme), fallback)
+
+
 class Configurable(object):
 	"""
 	Custom object whose attributes can be loaded from the configuration.
@@ -507,15 +1099,19 @@ class ConfigurableDict(collections.abc.MutableMapping):
 
 	def __init__(self):
 		self._data = {}
+		# Converted values, e.g. ('timeout', 'seconds') -> 60.0
+		self._cache = {}
 
 	def __getitem__(self, key):
 		return self._data[key]
 
 	def __setitem__(self, key, value):
 		self._data[key] = value
+		self._cache.clear()
 
 	def __delitem__(self, key):
 		del self._data[key]
+		self._cache.clear()
 
 	def __iter__(self):
 		return iter(self._data)
@@ -528,40 +1124,45 @@ class ConfigurableDict(collections.abc.MutableMapping):
 		"""
 		Obtain the corresponding value of the key and convert it into bool.
 		"""
-		value = self._data[key]
-		return utils.string_to_boolean(value)
+		return self._convert(key, "boolean", utils.string_to_boolean)
 
 
 	def getseconds(self, key) -> float:
 		"""
 		Obtain the corresponding value of the key and convert it into seconds via `convert_to_seconds()` method.
 		"""
-		value = self._data[key]
-		return utils.convert_to_seconds(value)
+		return self._convert(key, "seconds", utils.convert_to_seconds)
 
 
 	def getint(self, key) -> int:
 		"""
 		Obtain the corresponding value of the key and convert it into integer.
 		"""
-		value = self._data[key]
-		return int(value)
+		return self._convert(key, "int", int)
 
 
 	def getfloat(self, key) -> float:
 		"""
 		Obtain the corresponding value of the key and convert it into float.
 		"""
-		value = self._data[key]
-		return float(value)
+		return self._convert(key, "float", float)
 
 
 	def geturl(self, key, scheme):
 		"""
 		Obtain the corresponding value of the key and parse it via `validate_url()` method.
 		"""
-		value = self._data[key]
-		return utils.validate_url(value, scheme)
+		return self._convert(key, ("url", scheme), lambda value: utils.validate_url(value, scheme))
+
+
+	def _convert(self, key, kind, converter):
+		try:
+			return self._cache[(key, kind)]
+		except KeyError:
+			pass
+		value = converter(self._data[key])
+		self._cache[(key, kind)] = value
+		return value
 
 
 	def __repr__(self):
@@ -0,0 +1,93 @@
+"""
+Import and initialization profile of ASAB modules.
+
+Enabled by the environment variable `ASAB_IMPORT_PROFILE=1`.
+The profile is printed to the standard error at the end of the application init-time,
+or at the interpreter exit when no application has been started.
+"""
+
+import os
+import sys
+import time
+import atexit
+
+#
+
+Enabled = os.environ.get("ASAB_IMPORT_PROFILE", "").lower() not in ("", "0", "no", "false", "off")
+
+# (kind, name, duration in seconds) in the order of completion
+Records = []
+
+_reported = False
+
+#
+
+
+def record(kind: str, name: str, duration: float):
+	if Enabled:
+		Records.append((kind, name, duration))
+
+
+def report(extra=None):
+	"""
+	Print the profile to the standard error, only once.
+
+	Args:
+		extra: Additional records as a list of (kind, name, duration in seconds) tuples.
+	"""
+	global _reported
+	if not Enabled or _reported:
+		return
+	_reported = True
+
+	records = Records + list(extra or [])
+	print("ASAB import profile (cumulative time in milliseconds)", file=sys.stderr)
+	for kind, name, duration in records:
+		print("{:>10} {:>10.1f}  {}".format(kind, duration * 1000.0, name), file=sys.stderr)
+
+
+if Enabled:
+
+	class _TimingLoader(object):
+
+		def __init__(self, loader):
+			self.Loader = loader
+
+		def __getattr__(self, name):
+			return getattr(self.Loader, name)
+
+		def create_module(self, spec):
+			return self.Loader.create_module(spec)
+
+		def exec_module(self, module):
+			t0 = time.perf_counter()
+			try:
+				self.Loader.exec_module(module)
+			finally:
+				record("import", module.__name__, time.perf_counter() - t0)
+
+
+	class _TimingFinder(object):
+		"""
+		Measures the time of the execution of `asab.*` modules, including modules they import.
+		"""
+
+		def find_spec(self, fullname, path, target=None):
+			if not fullname.startswith("asab."):
+				return None
+
+			for finder in sys.meta_path:
+				if finder is self or not hasattr(finder, "find_spec"):
+					continue
+				spec = finder.find_spec(fullname, path, target)
+				if spec is None:
+					continue
+				if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+					spec.loader = _TimingLoader(spec.loader)
+				return spec
+
+			return None
+
+
+	sys.meta_path.insert(0, _TimingFinder())
+	atexit.register(report)
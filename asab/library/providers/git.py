@@ -343,7 +343,7 @@ class GitLibraryProvider(SimpleFileSystemLibraryProvider):
 				return
 
 			try:
-				to_publish = await self.ProactorService.execute(self._do_pull)
+				to_publish = await self.ProactorService.execute(self._do_pull, executor="git")
 				self.LastPull = self.App.time()
 				# Once reset of the head is finished, PubSub message about the change in the subscribed directory gets published.
 				for path in to_publish:
@@ -390,7 +390,7 @@ class GitLibraryProvider(SimpleFileSystemLibraryProvider):
 					)
 
 		try:
-			await self.ProactorService.execute(init_task)
+			await self.ProactorService.execute(init_task, executor="git")
 
 		except KeyError as err:
 			pygit_message = str(err).replace('\"', '')
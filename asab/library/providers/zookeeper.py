@@ -220,7 +220,7 @@ class ZooKeeperLibraryProvider(LibraryProviderABC):
 		def install_watcher():
 			return kazoo.recipe.watchers.DataWatch(self.Zookeeper.Client, self.VersionNodePath, on_version_changed)
 
-		self.VersionWatch = await self.Zookeeper.ProactorService.execute(install_watcher)
+		self.VersionWatch = await self.Zookeeper.ProactorService.execute(install_watcher, executor="zookeeper")
 
 		def on_disabled_changed(data, stat):
 			# Whenever .disabled.yaml changes, reload disables
@@ -229,7 +229,7 @@ class ZooKeeperLibraryProvider(LibraryProviderABC):
 		def install_disabled_watcher():
 			return kazoo.recipe.watchers.DataWatch(self.Zookeeper.Client, self.DisabledNodePath, on_disabled_changed)
 
-		self.DisabledWatch = await self.Zookeeper.ProactorService.execute(install_disabled_watcher)
+		self.DisabledWatch = await self.Zookeeper.ProactorService.execute(install_disabled_watcher, executor="zookeeper")
 
 		await self._set_ready()
 
@@ -542,7 +542,7 @@ class ZooKeeperLibraryProvider(LibraryProviderABC):
 				recursive_traversal(child_path, digest)
 
 		digest = hashlib.sha1()
-		await self.Zookeeper.ProactorService.execute(recursive_traversal, path, digest)
+		await self.Zookeeper.ProactorService.execute(recursive_traversal, path, digest, executor="zookeeper")
 		return digest.digest()
 
 	async def _on_library_changed(self, event_name=None):
@@ -59,6 +59,9 @@ class LibraryService(Service):
 	The library indicates that by the PubSub event `Library.ready!`.
 	"""
 
+	# Library providers use ZooKeeper and Proactor, they have to be finalized after the library
+	Dependencies = ("asab.ZooKeeperService", "asab.ProactorService")
+
 	def __init__(
 		self,
 		app: Application,
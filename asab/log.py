@@ -1,30 +1,34 @@
 import asyncio
+import collections
+import copy
 import datetime
 import logging
 import logging.handlers
 import json
+import math
 import os
 import pprint
 import queue
 import re
 import socket
 import sys
+import threading
 import time
 import traceback
 import urllib.parse
+import typing
+
+try:
+	import orjson
+except ImportError:
+	orjson = None
 
 from .config import Config
 from .timer import Timer
 from .utils import running_in_container
+from .logger import LOG_NOTICE, _StructuredDataLogger  # noqa: F401
 
 
-LOG_NOTICE = 25
-"""
-Info log level that is visible in non-verbose mode. It should not be used for warnings and errors.
-"""
-
-logging.addLevelName(LOG_NOTICE, "NOTICE")
-
 L = logging.getLogger(__name__)
 
 _NAME_TO_LEVEL = {
@@ -53,6 +57,7 @@ class Logging(object):
 		self.ConsoleHandler = None
 		self.FileHandler = None
 		self.SyslogHandler = None
+		self.QueueHandler = None
 
 		if not self.RootLogger.hasHandlers():
 
@@ -70,11 +75,26 @@ class Logging(object):
 				if not os.path.exists(directory):
 					os.makedirs(directory)
 
-				self.FileHandler = logging.handlers.RotatingFileHandler(
-					file_path,
-					backupCount=Config.getint("logging:file", "backup_count"),
-					maxBytes=Config.getint("logging:file", "backup_max_bytes"),
-				)
+				compress = Config.get("logging:file", "compress").strip().lower()
+				if compress in ("", "none", "no", "false"):
+					self.FileHandler = logging.handlers.RotatingFileHandler(
+						file_path,
+						backupCount=Config.getint("logging:file", "backup_count"),
+						maxBytes=Config.getint("logging:file", "backup_max_bytes"),
+					)
+				else:
+					if compress == "gz":
+						compress = "gzip"
+					if compress not in CompressingRotatingFileHandler.Suffixes:
+						self.RootLogger.error("Invalid 'compress' configuration value, using 'gzip'.")
+						compress = "gzip"
+					self.FileHandler = CompressingRotatingFileHandler(
+						file_path,
+						backupCount=Config.getint("logging:file", "backup_count"),
+						maxBytes=Config.getint("logging:file", "backup_max_bytes"),
+						compression=compress,
+						maxTotalBytes=Config.getint("logging:file", "backup_max_total_bytes"),
+					)
 				self.FileHandler.setLevel(logging.DEBUG)
 				self.FileHandler.setFormatter(StructuredDataFormatter(
 					fmt=Config["logging:file"]["format"],
@@ -114,9 +134,10 @@ class Logging(object):
 			if Config["logging:syslog"].getboolean("enabled"):
 
 				address = Config["logging:syslog"]["address"]
+				queue_size = Config.getint("logging:syslog", "queue_size")
 
 				if address[:1] == '/':
-					self.SyslogHandler = AsyncIOHandler(app.Loop, socket.AF_UNIX, socket.SOCK_DGRAM, address)
+					self.SyslogHandler = AsyncIOHandler(app.Loop, socket.AF_UNIX, socket.SOCK_DGRAM, address, queue_size=queue_size)
 
 				else:
 					url = urllib.parse.urlparse(address)
@@ -125,7 +146,7 @@ class Logging(object):
 						self.SyslogHandler = AsyncIOHandler(app.Loop, socket.AF_INET, socket.SOCK_STREAM, (
 							url.hostname if url.hostname is not None else 'localhost',
 							url.port if url.port is not None else logging.handlers.SYSLOG_UDP_PORT
-						))
+						), queue_size=queue_size)
 
 					elif url.scheme == 'udp':
 						self.SyslogHandler = FormatingDatagramHandler(
@@ -134,10 +155,10 @@ class Logging(object):
 						)
 
 					elif url.scheme == 'unix-connect':
-						self.SyslogHandler = AsyncIOHandler(app.Loop, socket.AF_UNIX, socket.SOCK_STREAM, url.path)
+						self.SyslogHandler = AsyncIOHandler(app.Loop, socket.AF_UNIX, socket.SOCK_STREAM, url.path, queue_size=queue_size)
 
 					elif url.scheme == 'unix-sendto':
-						self.SyslogHandler = AsyncIOHandler(app.Loop, socket.AF_UNIX, socket.SOCK_DGRAM, url.path)
+						self.SyslogHandler = AsyncIOHandler(app.Loop, socket.AF_UNIX, socket.SOCK_DGRAM, url.path, queue_size=queue_size)
 
 					else:
 						self.RootLogger.warning("Invalid logging:syslog address '{}'".format(address))
@@ -153,7 +174,8 @@ class Logging(object):
 					elif format == '5micro':
 						self.SyslogHandler.setFormatter(SyslogRFC5424microFormatter(sd_id=Config["logging"]["sd_id"]))
 					elif format == 'json':
-						self.SyslogHandler.setFormatter(JSONFormatter())
+						json_fields = re.split(r"[,\s]+", Config["logging:syslog"].get("json_fields", "").strip())
+						self.SyslogHandler.setFormatter(JSONFormatter(fields=[field for field in json_fields if len(field) > 0]))
 					else:
 						self.SyslogHandler.setFormatter(SyslogRFC3164Formatter(sd_id=Config["logging"]["sd_id"]))
 					self.RootLogger.addHandler(self.SyslogHandler)
@@ -164,9 +186,36 @@ class Logging(object):
 				if running_in_container():
 					self._configure_console_logging()
 
+			if Config.getboolean("logging", "queue"):
+				self._configure_queue()
+
 		else:
 			self.RootLogger.warning("Logging seems to be already configured. Proceed with caution.")
 
+		self._configured_levels = set()
+		self._configure_levels()
+
+		# Rate limiting of similar records
+		self.RateLimitFilter = None
+		if Config.getboolean("logging", "rate_limit"):
+			self.RateLimitFilter = RateLimitingFilter(
+				burst=Config.getint("logging", "rate_limit_burst"),
+				rate=Config.getfloat("logging", "rate_limit_rate"),
+				max_keys=Config.getint("logging", "rate_limit_keys"),
+			)
+			for handler in self.RootLogger.handlers:
+				handler.addFilter(self.RateLimitFilter)
+
+			summary_interval = Config.getseconds("logging", "rate_limit_summary")
+
+			# PubSub is not ready at this moment, we need to create timer in a future
+			async def schedule_summary(app):
+				self.RateLimitSummaryTimer = Timer(app, self._on_rate_limit_summary, autorestart=True)
+				self.RateLimitSummaryTimer.start(summary_interval)
+			asyncio.ensure_future(schedule_summary(app))
+
+
+	def _configure_levels(self):
 		if Config["logging"].getboolean("verbose"):
 			self.RootLogger.setLevel(2)
 		else:
@@ -177,6 +226,7 @@ class Logging(object):
 				L.error("Cannot detect logging level '{}'".format(level_name))
 
 		# Fine-grained log level configurations
+		configured_levels = set()
 		levels = Config["logging"].get('levels')
 		for level_line in levels.split('\n'):
 			level_line = level_line.strip()
@@ -191,13 +241,59 @@ class Logging(object):
 			level = _NAME_TO_LEVEL.get(level_name.upper(), level_name.upper())
 			try:
 				logging.getLogger(logger_name).setLevel(level)
+				configured_levels.add(logger_name)
 			except ValueError:
 				L.error("Cannot detect logging level '{}' for {} logger".format(level_name, logger_name))
 
+		# Loggers removed from `levels` inherit the level again
+		for logger_name in self._configured_levels - configured_levels:
+			logging.getLogger(logger_name).setLevel(logging.NOTSET)
+		self._configured_levels = configured_levels
+
+
+	def _on_config_changed(self, message_type, diff):
+		changed = diff.get("logging", {})
+		if "level" in changed or "levels" in changed or "verbose" in changed:
+			self._configure_levels()
+			L.log(LOG_NOTICE, "Logging levels reconfigured")
+
+
+	def add_handler(self, handler: logging.Handler):
+		"""
+		Add a handler to the root logger, with the same rate limiting as the console, file and syslog handlers.
+
+		Filters of the root logger don't apply to records of other loggers, so handlers that output logs
+		have to be added by this method in order to be rate limited.
+		"""
+		if self.RateLimitFilter is not None:
+			handler.addFilter(self.RateLimitFilter)
+		self.RootLogger.addHandler(handler)
+
+
+	async def _on_rate_limit_summary(self):
+		suppressed, evicted = self.RateLimitFilter.summary()
+		for name, msg, level, count in suppressed:
+			logging.getLogger(name).log(
+				level, "Suppressed %d similar messages", count,
+				struct_data={'message': msg, 'suppressed': count},
+				extra={'_rate_limited': False},
+			)
+		if evicted > 0:
+			L.warning(
+				"Suppressed %d messages of rarely logged kinds", evicted,
+				struct_data={'suppressed': evicted},
+				extra={'_rate_limited': False},
+			)
+
+
 	def rotate(self):
 		if self.FileHandler is not None:
 			self.RootLogger.log(LOG_NOTICE, "Rotating logs")
-			self.FileHandler.doRollover()
+			if self.QueueHandler is not None and self.FileHandler in self.QueueHandler.Targets:
+				# The rollover is done by the writer thread, in order with the queued records
+				self.QueueHandler.call(self.FileHandler.doRollover)
+			else:
+				self.FileHandler.doRollover()
 
 
 	async def _on_tick_rotate_check(self):
@@ -206,6 +302,27 @@ class Logging(object):
 				self.rotate()
 
 
+	def _configure_queue(self):
+		# The asyncio syslog handler doesn't block and it has to stay in the event loop thread
+		targets = [
+			handler for handler in (self.ConsoleHandler, self.FileHandler, self.SyslogHandler)
+			if handler is not None and not isinstance(handler, AsyncIOHandler)
+		]
+		if len(targets) == 0:
+			return
+
+		for handler in targets:
+			self.RootLogger.removeHandler(handler)
+
+		self.QueueHandler = QueuedLoggingHandler(
+			targets,
+			queue_size=Config.getint("logging", "queue_size"),
+			overflow=Config.get("logging", "queue_overflow"),
+		)
+		self.QueueHandler.setLevel(logging.DEBUG)
+		self.RootLogger.addHandler(self.QueueHandler)
+
+
 	def _configure_console_logging(self):
 		self.ConsoleHandler = logging.StreamHandler(stream=sys.stderr)
 
@@ -229,27 +346,13 @@ class Logging(object):
 		self.RootLogger.addHandler(self.ConsoleHandler)
 
 
-class _StructuredDataLogger(logging.Logger):
-	'''
-This class extends a default python logger class, specifically by adding ``struct_data`` parameter to logging functions.
-It means that you can use expressions such as ``logger.info("Hello world!", struct_data={'key':'value'})``.
-	'''
-
-	def _log(self, level, msg, args, exc_info=None, struct_data=None, extra=None, stack_info=False):
-		if struct_data is not None:
-			if extra is None:
-				extra = dict()
-			extra['_struct_data'] = struct_data
-
-		super()._log(level, msg, args, exc_info=exc_info, extra=extra, stack_info=stack_info)
-
-
-logging.setLoggerClass(_StructuredDataLogger)
-
-
 class StructuredDataFormatter(logging.Formatter):
 	'''
 	The logging formatter that renders log messages that includes structured data.
+
+	The format is compiled when the formatter is created: named placeholders are replaced by positional ones,
+	so the record is rendered without copying its `__dict__`.
+	The date and time is rendered by `strftime()` once per second, only microseconds are rendered for every record.
 	'''
 
 	empty_sd = ""
@@ -264,42 +367,50 @@ class StructuredDataFormatter(logging.Formatter):
 		self.Facility = facility
 		self.UseColor = use_color
 
-	def formatMessage(self, record):
-		values = record.__dict__.copy()
-		values["struct_data"] = self.render_struct_data(values.get("_struct_data"))
-
-		# The Priority value is calculated by first multiplying the Facility number by 8 and then adding the numerical value of the Severity.
-		if record.levelno <= logging.DEBUG:
-			severity = 7  # Debug
-			color = self.BLUE
-		elif record.levelno <= logging.INFO:
-			severity = 6  # Informational
-			color = self.GREEN
-		elif record.levelno <= LOG_NOTICE:
-			severity = 5  # Notice
-			color = self.CYAN
-		elif record.levelno <= logging.WARNING:
-			severity = 4  # Warning
-			color = self.YELLOW
-		elif record.levelno <= logging.ERROR:
-			severity = 3  # Error
-			color = self.RED
-		elif record.levelno <= logging.CRITICAL:
-			severity = 2  # Critical
-			color = self.MAGENTA
-		else:
-			severity = 1  # Alert
-			color = self.WHITE
+		self._sd_prefix = "[" + sd_id + " "
+		self._uses_time = super().usesTime()
 
-		if self.UseColor:
-			levelname = record.levelname
-			levelname_color = _COLOR_SEQ % (30 + color) + levelname + _RESET_SEQ
-			values["levelname"] = levelname_color
+		# '%(name)s' -> '%s', the names in the order of appearance
+		keys = []
 
-		values["priority"] = (self.Facility << 3) + severity
+		def positional(match):
+			if match.group(1) is None:
+				return match.group(0)  # '%%'
+			keys.append(match.group(1))
+			return "%"
+
+		self._positional_fmt = re.sub(r"%%|%\(([^)]*)\)", positional, self._fmt)
+		self._fmt_keys = tuple(keys)
+
+		# Time of the last rendered second, the rendered time split by microseconds
+		self._time_cache_second = None
+		self._time_cache_datefmt = None
+		self._time_cache_parts = None
+
+
+	def usesTime(self):
+		return self._uses_time
+
+
+	def formatMessage(self, record):
+		severity, color = _severity_and_color(record.levelno)
+
+		values = record.__dict__
+		args = []
+		for key in self._fmt_keys:
+			if key == "struct_data":
+				args.append(self.render_struct_data(values.get("_struct_data")))
+			elif key == "priority":
+				# The Priority value is calculated by first multiplying the Facility number by 8 and then adding the numerical value of the Severity.
+				args.append((self.Facility << 3) + severity)
+			elif key == "levelname" and self.UseColor:
+				args.append(_COLOR_SEQ % (30 + color) + record.levelname + _RESET_SEQ)
+			else:
+				args.append(values[key])
 
 		# We use percent style formatting only
-		return self._fmt % values
+		return self._positional_fmt % tuple(args)
+
 
 	def formatTime(self, record, datefmt=None):
 		'''
@@ -307,16 +418,37 @@ class StructuredDataFormatter(logging.Formatter):
 		'''
 
 		try:
-			ct = datetime.datetime.fromtimestamp(record.created)
-			if datefmt is not None:
-				s = ct.strftime(datefmt)
-			else:
-				t = ct.strftime("%Y-%m-%d %H:%M:%S")
-				s = "%s.%03d" % (t, record.msecs)
-			return s
+			# The same rounding as in `datetime.datetime.fromtimestamp()`
+			fraction, second = math.modf(record.created)
+			microsecond = round(fraction * 1e6)
+			if microsecond >= 1000000:
+				second += 1
+				microsecond -= 1000000
+			elif microsecond < 0:
+				second -= 1
+				microsecond += 1000000
+
+			if second != self._time_cache_second or datefmt != self._time_cache_datefmt:
+				ct = datetime.datetime.fromtimestamp(second)
+				if datefmt is not None:
+					# '%f' is rendered separately for every record
+					template = re.sub(r"%.", lambda match: _MICROSECOND_PLACEHOLDER if match.group(0) == "%f" else match.group(0), datefmt)
+					parts = ct.strftime(template).split(_MICROSECOND_PLACEHOLDER)
+				else:
+					parts = [ct.strftime("%Y-%m-%d %H:%M:%S")]
+				self._time_cache_second = second
+				self._time_cache_datefmt = datefmt
+				self._time_cache_parts = parts
+
+			parts = self._time_cache_parts
+			if datefmt is None:
+				return "%s.%03d" % (parts[0], record.msecs)
+			if len(parts) == 1:
+				return parts[0]
+			return ("%06d" % microsecond).join(parts)
 		except BaseException as e:
 			print("ERROR when logging: {}".format(e), file=sys.stderr)
-			return str(ct)
+			return str(datetime.datetime.fromtimestamp(record.created))
 
 
 	def render_struct_data(self, struct_data):
@@ -328,10 +460,28 @@ class StructuredDataFormatter(logging.Formatter):
 			return self.empty_sd
 
 		else:
-			return "[{sd_id} {sd_params}] ".format(
-				sd_id=self.SD_id,
-				sd_params=" ".join(['{}="{}"'.format(key, val) for key, val in struct_data.items()]))
+			return self._sd_prefix + " ".join([f'{key}="{val}"' for key, val in struct_data.items()]) + "] "
+
+
+def _severity_and_color(levelno):
+	if levelno <= logging.DEBUG:
+		return 7, StructuredDataFormatter.BLUE  # Debug
+	elif levelno <= logging.INFO:
+		return 6, StructuredDataFormatter.GREEN  # Informational
+	elif levelno <= LOG_NOTICE:
+		return 5, StructuredDataFormatter.CYAN  # Notice
+	elif levelno <= logging.WARNING:
+		return 4, StructuredDataFormatter.YELLOW  # Warning
+	elif levelno <= logging.ERROR:
+		return 3, StructuredDataFormatter.RED  # Error
+	elif levelno <= logging.CRITICAL:
+		return 2, StructuredDataFormatter.MAGENTA  # Critical
+	else:
+		return 1, StructuredDataFormatter.WHITE  # Alert
+
 
+# A character that doesn't occur in date formats, it marks the position of microseconds in the cached time
+_MICROSECOND_PLACEHOLDER = "\ue000"
 
 
 def _loop_exception_handler(loop, context):
@@ -428,8 +578,18 @@ class SyslogRFC5424microFormatter(StructuredDataFormatter):
 
 
 class JSONFormatter(logging.Formatter):
+	"""
+	Formats a log record as a JSON object enriched by `instance_id`, `service_id`, `node_id` and `hostname`.
+
+	Without `fields`, all attributes of the record are serialized (the legacy output).
+	With `fields`, only the listed attributes are serialized, e.g. `("created", "levelname", "name", "message", "_struct_data")`;
+	`message` is the message with arguments merged and `exc_text` is the formatted exception, if any.
+	The output is compact and the static enrichment is serialized only once.
+	Fields are encoded by `orjson` if it is installed, unless another `encoder` (a function that returns `str`) is given.
+	"""
 
-	def __init__(self):
+	def __init__(self, fields: typing.Optional[typing.Iterable[str]] = None, encoder: typing.Optional[typing.Callable[[dict], str]] = None):
+		super().__init__()
 		self.Enricher = {}
 		instance_id = os.environ.get("INSTANCE_ID")
 		service_id = os.environ.get("SERVICE_ID")
@@ -444,6 +604,17 @@ class JSONFormatter(logging.Formatter):
 		if hostname is not None:
 			self.Enricher["hostname"] = hostname
 
+		self.Fields = tuple(fields) if fields else None
+		if encoder is not None:
+			self.Encoder = encoder
+		elif orjson is not None:
+			self.Encoder = self._encode_orjson
+		else:
+			self.Encoder = self._encode_json
+
+		# The enrichment rendered as JSON object members, without braces
+		self._static = self.Encoder(self.Enricher)[1:-1]
+
 	def _default(self, obj):
 		# If obj is not json serializable, convert it to string
 		try:
@@ -451,10 +622,38 @@ class JSONFormatter(logging.Formatter):
 		except Exception:
 			raise TypeError("Error when logging. Object {} of type {} is not JSON serializable.".format(obj, type(obj)))
 
+	def _encode_json(self, obj):
+		return json.dumps(obj, default=self._default, ensure_ascii=False, separators=(",", ":"))
+
+	def _encode_orjson(self, obj):
+		return orjson.dumps(obj, default=self._default, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
 	def format(self, record):
-		r_copy = record.__dict__.copy()
-		r_copy.update(self.Enricher)
-		return json.dumps(r_copy, default=self._default)
+		if self.Fields is None:
+			r_copy = record.__dict__.copy()
+			r_copy.update(self.Enricher)
+			return json.dumps(r_copy, default=self._default)
+
+		values = record.__dict__
+		selected = {}
+		for field in self.Fields:
+			if field == "message":
+				selected[field] = record.getMessage()
+			elif field == "exc_text":
+				if record.exc_info and not record.exc_text:
+					record.exc_text = self.formatException(record.exc_info)
+				if record.exc_text:
+					selected[field] = record.exc_text
+			elif field in values:
+				# Structured data and other values are serialized directly, without copies
+				selected[field] = values[field]
+
+		body = self.Encoder(selected)
+		if len(self._static) == 0:
+			return body
+		if len(body) == 2:
+			return "{" + self._static + "}"
+		return "{" + self._static + "," + body[1:]
 
 
 class FormatingDatagramHandler(logging.handlers.DatagramHandler):
@@ -477,22 +676,51 @@ class AsyncIOHandler(logging.Handler):
 	"""
 	A logging handler similar to a standard `logging.handlers.SocketHandler` that utilizes `asyncio`.
 	It implements a queue for decoupling logging from a networking. The networking is fully event-driven via `asyncio` mechanisms.
+
+	Messages that cannot be sent immediately wait in a bounded buffer; when the buffer is full, the oldest message is dropped,
+	so an unreachable log collector doesn't exhaust the memory.
+	Pending messages are sent in batches (up to `BatchSize` bytes by one `send()`) on stream sockets.
+	When the connection fails, the handler reconnects with an exponential backoff.
+
+	Attributes:
+		Dropped (int): Number of messages dropped because the buffer was full.
+		Reconnects (int): Number of reconnection attempts.
 	"""
 
-	def __init__(self, loop, family, sock_type, address, facility=logging.handlers.SysLogHandler.LOG_LOCAL1):
+	BatchSize = 64 * 1024
+
+	def __init__(
+		self, loop, family, sock_type, address, facility=logging.handlers.SysLogHandler.LOG_LOCAL1,
+		queue_size: int = 10000, reconnect_backoff: float = 0.5, reconnect_backoff_max: float = 60.0
+	):
 		logging.Handler.__init__(self)
 
 		self._family = family
 		self._type = sock_type
 		self._address = address
 		self._loop = loop
+		self._loop_thread = threading.get_ident()
+
+		# The queue is shared by emitting threads and the event loop thread, the lock guards it with `_partial_head`
+		self._lock = threading.Lock()
+		self._queue = collections.deque()
+		self._queue_size = queue_size
+		# The first message in the queue was sent partially, only its tail remains
+		self._partial_head = False
+		self._flush_scheduled = False
 
 		self._socket = None
+		self._reconnect_handle = None
 		self._reset()
 
-		self._queue = queue.Queue()
+		self._reconnect_backoff = reconnect_backoff
+		self._reconnect_backoff_max = reconnect_backoff_max
+		self._backoff = 0.0
 
-		self._loop.call_soon(self._connect, self._loop)
+		self.Dropped = 0
+		self.Reconnects = 0
+
+		self._loop.call_soon(self._connect)
 
 
 	def _reset(self):
@@ -503,46 +731,144 @@ class AsyncIOHandler(logging.Handler):
 			self._socket.close()
 			self._socket = None
 
+		with self._lock:
+			if self._partial_head:
+				# The tail of a message cannot be sent over a new connection, it would break the framing
+				self._queue.popleft()
+				self._partial_head = False
+				self.Dropped += 1
+
 
-	def _connect(self, loop):
+	def _connect(self):
+		self._reconnect_handle = None
 		self._reset()
 
 		try:
 			self._socket = socket.socket(self._family, self._type)
-			self._socket.setblocking(0)
-			self._socket.connect(self._address)
+			self._socket.setblocking(False)
+			try:
+				self._socket.connect(self._address)
+			except BlockingIOError:
+				# The stream connection is in progress, the socket becomes writable when it is established
+				pass
 		except Exception as e:
 			print("Error when opening syslog connection to '{}'".format(self._address), e, file=sys.stderr)
+			self._reconnect()
 			return
 
 		self._loop.add_writer(self._socket, self._on_write)
 		self._loop.add_reader(self._socket, self._on_read)
 
+
+	def _reconnect(self):
+		"""
+		Close the socket and connect again after the backoff delay.
+		"""
+		self._reset()
+		if self._reconnect_handle is not None:
+			return
+
+		if self._backoff == 0.0:
+			self._backoff = self._reconnect_backoff
+		else:
+			self._backoff = min(self._backoff * 2, self._reconnect_backoff_max)
+
+		self.Reconnects += 1
+		self._reconnect_handle = self._loop.call_later(self._backoff, self._connect)
+
+
 	def _on_write(self):
-		self._write_ready = True
 		self._loop.remove_writer(self._socket)
 
-		while not self._queue.empty():
-			msg = self._queue.get_nowait()
-			try:
-				self._socket.sendall(msg)
-			except Exception as e:
-				# Contingency dump when the socket is not ready
-				print(msg.decode("utf-8"), file=sys.stderr)
-				print(
-					"Error when writing to syslog '{}': {}".format(self._address, e),
-					traceback.format_exc(),
-					sep="\n",
-					file=sys.stderr
-				)
+		if not self._write_ready:
+			error = self._socket.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+			if error != 0:
+				print("Error when opening syslog connection to '{}'".format(self._address), os.strerror(error), file=sys.stderr)
+				self._reconnect()
+				return
+			self._write_ready = True
+
+		self._flush()
+
 
 	def _on_read(self):
 		try:
-			_ = self._socket.recvfrom(1024)
-			# We receive "something" ... let's ignore that!
+			data = self._socket.recv(1024)
+		except BlockingIOError:
 			return
 		except Exception as e:
 			print("Error on the syslog socket '{}'".format(self._address), e, file=sys.stderr)
+			self._reconnect()
+			return
+
+		if len(data) == 0 and self._type == socket.SOCK_STREAM:
+			# The peer closed the connection
+			self._reconnect()
+
+		# We receive "something" ... let's ignore that!
+
+
+	def _flush(self):
+		"""
+		Send pending messages; it runs in the event loop thread.
+		"""
+		with self._lock:
+			self._flush_scheduled = False
+			error = self._send_queue()
+
+		if error is not None:
+			print("Error when writing to syslog '{}'".format(self._address), error, file=sys.stderr)
+			self._reconnect()
+
+
+	def _send_queue(self):
+		"""
+		Send messages from the queue until the socket would block; it is called with the lock held.
+
+		Returns:
+			The exception raised by the socket, the caller reconnects.
+		"""
+		while self._write_ready and len(self._queue) > 0:
+			if self._type == socket.SOCK_STREAM:
+				batch = [self._queue.popleft()]
+				size = len(batch[0])
+				while len(self._queue) > 0 and size + len(self._queue[0]) <= self.BatchSize:
+					size += len(self._queue[0])
+					batch.append(self._queue.popleft())
+				data = b"".join(batch)
+			else:
+				# Datagrams are sent one by one, every message is a datagram
+				batch = [self._queue.popleft()]
+				data = batch[0]
+			partial_head = self._partial_head
+
+			try:
+				sent = self._socket.send(data)
+			except BlockingIOError:
+				sent = 0
+			except Exception as e:
+				self._queue.extendleft(reversed(batch))
+				return e
+
+			if sent < len(data):
+				# Return unsent messages to the queue, the first one may be sent partially
+				while sent >= len(batch[0]):
+					sent -= len(batch.pop(0))
+					partial_head = False
+				if sent > 0:
+					batch[0] = batch[0][sent:]
+					partial_head = True
+				self._queue.extendleft(reversed(batch))
+				self._partial_head = partial_head
+				# Wait until the socket is writable again
+				self._write_ready = False
+				self._loop.add_writer(self._socket, self._on_write)
+				return None
+
+			self._partial_head = False
+			self._backoff = 0.0
+
+		return None
 
 
 	def emit(self, record):
@@ -551,25 +877,494 @@ class AsyncIOHandler(logging.Handler):
 		"""
 		try:
 			msg = self.format(record).encode('utf-8')
+		except Exception as e:
+			print("Error when emit to syslog '{}'".format(self._address), e, file=sys.stderr)
+			self.handleError(record)
+			return
+
+		with self._lock:
+			self._enqueue(msg)
+			if threading.get_ident() == self._loop_thread or self._flush_scheduled:
+				schedule_flush = False
+			else:
+				schedule_flush = self._flush_scheduled = True
+
+		if threading.get_ident() == self._loop_thread:
+			self._flush()
+
+		elif schedule_flush:
+			# Sockets are handled only in the event loop thread
+			try:
+				self._loop.call_soon_threadsafe(self._flush)
+			except RuntimeError:
+				# The event loop is closed
+				pass
 
-			if self._write_ready:
-				try:
-					self._socket.sendall(msg)
-				except Exception as e:
-					print("Error when writing to syslog '{}'".format(self._address), e, file=sys.stderr)
-					self._enqueue(msg)
 
+	def close(self):
+		if self._reconnect_handle is not None:
+			self._reconnect_handle.cancel()
+			self._reconnect_handle = None
+		self._reset()
+		super().close()
+
+
+	def _enqueue(self, msg):
+		"""
+		Append the message to the queue; it is called with the lock held.
+		"""
+		if len(self._queue) >= self._queue_size:
+			# Drop the oldest message; the partially sent one must be completed to keep the stream consistent
+			if self._partial_head and len(self._queue) > 1:
+				del self._queue[1]
 			else:
-				self._enqueue(msg)
+				self._queue.popleft()
+				self._partial_head = False
+			self.Dropped += 1
 
+		self._queue.append(msg)
 
-		except Exception as e:
-			print("Error when emit to syslog '{}'".format(self._address), e, file=sys.stderr)
+
+class RateLimitingFilter(logging.Filter):
+	"""
+	Suppresses floods of records with the same logger name and message template.
+
+	Every message template of a logger has a token bucket of `burst` records that is refilled by `rate` records per second;
+	records that find the bucket empty are suppressed.
+	At most `max_keys` message templates are tracked, the least recently logged ones are forgotten.
+	The filter is shared by handlers; the decision is stored in the record, so it is made once per record.
+
+	Attributes:
+		Suppressed (int): Total number of suppressed records.
+	"""
+
+	def __init__(self, burst: int = 20, rate: float = 1.0, max_keys: int = 1000):
+		super().__init__()
+		self.Burst = burst
+		self.Rate = rate
+		self.MaxKeys = max_keys
+
+		# (logger name, message template) -> [tokens, last update, suppressed since the last summary, the highest suppressed level]
+		self.Buckets = collections.OrderedDict()
+		self.Lock = threading.Lock()
+		self.Suppressed = 0
+		# Records suppressed under keys that were forgotten before the summary
+		self.SuppressedEvicted = 0
+
+
+	def filter(self, record):
+		suppressed = record.__dict__.get("_rate_limited")
+		if suppressed is None:
+			suppressed = self._is_suppressed(record)
+			record._rate_limited = suppressed
+		return not suppressed
+
+
+	def _is_suppressed(self, record):
+		msg = record.msg if isinstance(record.msg, str) else str(record.msg)
+		key = (record.name, msg)
+		now = time.monotonic()
+
+		with self.Lock:
+			bucket = self.Buckets.get(key)
+			if bucket is None:
+				if len(self.Buckets) >= self.MaxKeys:
+					_, evicted = self.Buckets.popitem(last=False)
+					self.SuppressedEvicted += evicted[2]
+				bucket = [float(self.Burst), now, 0, logging.NOTSET]
+				self.Buckets[key] = bucket
+			else:
+				self.Buckets.move_to_end(key)
+				bucket[0] = min(float(self.Burst), bucket[0] + (now - bucket[1]) * self.Rate)
+				bucket[1] = now
+
+			if bucket[0] >= 1.0:
+				bucket[0] -= 1.0
+				return False
+
+			bucket[2] += 1
+			bucket[3] = max(bucket[3], record.levelno)
+			self.Suppressed += 1
+			return True
+
+
+	def summary(self):
+		"""
+		Collect and reset the numbers of suppressed records.
+
+		Returns:
+			A tuple of a list of (logger name, message template, the highest level, count) and the number of records
+			suppressed under forgotten message templates.
+		"""
+		with self.Lock:
+			result = []
+			for (name, msg), bucket in self.Buckets.items():
+				if bucket[2] > 0:
+					result.append((name, msg, bucket[3], bucket[2]))
+					bucket[2] = 0
+					bucket[3] = logging.NOTSET
+			evicted = self.SuppressedEvicted
+			self.SuppressedEvicted = 0
+		return result, evicted
+
+
+class QueuedLoggingHandler(logging.Handler):
+	"""
+	A logging handler that decouples writing of log records from the logging thread.
+
+	The logging thread (typically the event loop) only puts records into a bounded queue.
+	A background writer thread takes records from the queue in batches, formats them by target handlers
+	and writes each batch to a stream by a single `write()` and `flush()`.
+	Other target handlers (e.g. UDP syslog) get records of the batch one by one.
+
+	When the queue is full, the `overflow` policy applies: `drop` drops the new record,
+	`drop_oldest` drops the oldest queued record and `block` waits until there is a space in the queue.
+
+	Attributes:
+		Targets (list): Handlers that write records in the writer thread.
+		Dropped (int): Number of records dropped because the queue was full.
+		Written (int): Number of records passed to target handlers.
+	"""
+
+	BatchSize = 512
+
+	def __init__(self, targets, queue_size: int = 10000, overflow: str = "drop"):
+		super().__init__()
+		if overflow not in ("drop", "drop_oldest", "block"):
+			raise ValueError("Unknown logging queue overflow policy '{}', expected 'drop', 'drop_oldest' or 'block'.".format(overflow))
+
+		self.Targets = list(targets)
+		self.Overflow = overflow
+		self.Queue = queue.Queue(maxsize=queue_size)
+		# Functions passed to `call()` when the queue was full
+		self.Calls = collections.deque()
+		self.Dropped = 0
+		self.Written = 0
+
+		self.Thread = threading.Thread(target=self._run, name="asab-log-writer", daemon=True)
+		self.Thread.start()
+
+
+	@property
+	def Queued(self) -> int:
+		"""
+		Number of records waiting in the queue.
+		"""
+		return self.Queue.qsize()
+
+
+	def emit(self, record):
+		try:
+			# Arguments are merged in the logging thread because they can be mutated later;
+			# the record is copied, other handlers and filters of the logger get it unchanged
+			queued = copy.copy(record)
+			queued.msg = record.getMessage()
+			queued.args = None
+		except Exception:
 			self.handleError(record)
+			return
+
+		self._put(queued)
+
+
+	def call(self, function):
+		"""
+		Call the function in the writer thread, after records that are already queued are written.
+
+		It doesn't block; when the queue is full, the function is called after the batch that the writer thread is processing.
+		"""
+		try:
+			self.Queue.put_nowait(function)
+		except queue.Full:
+			self.Calls.append(function)
+
+
+	def _put(self, item, block=False):
+		if block or self.Overflow == "block":
+			self.Queue.put(item)
+			return
+
+		while True:
+			try:
+				self.Queue.put_nowait(item)
+				return
+			except queue.Full:
+				if self.Overflow == "drop":
+					self.Dropped += 1
+					return
+
+			# drop_oldest
+			try:
+				self.Queue.get_nowait()
+				self.Dropped += 1
+			except queue.Empty:
+				pass
+
+
+	def close(self):
+		if self.Thread.is_alive():
+			self._put(_QUEUE_STOP, block=True)
+			self.Thread.join(5)
+		super().close()
+
+
+	def _run(self):
+		while True:
+			batch = [self.Queue.get()]
+			while len(batch) < self.BatchSize:
+				try:
+					batch.append(self.Queue.get_nowait())
+				except queue.Empty:
+					break
+
+			records = []
+			for item in batch:
+				if isinstance(item, logging.LogRecord):
+					records.append(item)
+					continue
+
+				self._write(records)
+				records = []
+				if item is _QUEUE_STOP:
+					self._call_pending()
+					return
+				self._call(item)
+
+			self._write(records)
+			self._call_pending()
+
+
+	def _call(self, function):
+		try:
+			function()
+		except Exception:
+			traceback.print_exc(file=sys.stderr)
 
 
-	def _enqueue(self, record):
-		self._queue.put(record)
+	def _call_pending(self):
+		while len(self.Calls) > 0:
+			self._call(self.Calls.popleft())
+
+
+	def _write(self, records):
+		if len(records) == 0:
+			return
+
+		for handler in self.Targets:
+			accepted = [record for record in records if record.levelno >= handler.level and handler.filter(record)]
+			if len(accepted) == 0:
+				continue
+
+			if not isinstance(handler, logging.StreamHandler):
+				for record in accepted:
+					handler.handle(record)
+				continue
+
+			lines = []
+			for record in accepted:
+				try:
+					lines.append(handler.format(record) + handler.terminator)
+				except Exception:
+					handler.handleError(record)
+			data = "".join(lines)
+
+			handler.acquire()
+			try:
+				if isinstance(handler, logging.FileHandler) and handler.stream is None:
+					handler.stream = handler._open()
+				if isinstance(handler, logging.handlers.RotatingFileHandler) and handler.maxBytes > 0:
+					# The size limit is checked once per batch
+					handler.stream.seek(0, 2)
+					if handler.stream.tell() > 0 and handler.stream.tell() + len(data) >= handler.maxBytes:
+						handler.doRollover()
+				handler.stream.write(data)
+				handler.flush()
+			except Exception:
+				handler.handleError(accepted[-1])
+			finally:
+				handler.release()
+
+		self.Written += len(records)
+
+
+# Stops the writer thread of QueuedLoggingHandler
+_QUEUE_STOP = object()
+
+
+class CompressingRotatingFileHandler(logging.handlers.RotatingFileHandler):
+	"""
+	A rotating file handler that compresses rotated files in a background thread.
+
+	The rollover only renames the log file to `<path>.<YYYYmmdd-HHMMSS>`, so it doesn't block the thread that writes logs.
+	A compressor thread then compresses the rotated file to `.gz` or `.xz` and removes the oldest rotated files
+	so that at most `backupCount` of them are kept and, if `maxTotalBytes` is set, their total size doesn't exceed it.
+	Rotated files left uncompressed by a previous run of the application are compressed when the handler is created.
+
+	Attributes:
+		Compressed (int): Number of compressed files.
+		Removed (int): Number of rotated files removed by the retention.
+	"""
+
+	ChunkSize = 1024 * 1024
+	Suffixes = {"gzip": ".gz", "xz": ".xz"}
+
+	def __init__(self, filename, maxBytes=0, backupCount=0, compression="gzip", maxTotalBytes=0, encoding=None, delay=False):
+		if compression not in self.Suffixes:
+			raise ValueError("Unknown log compression '{}', expected 'gzip' or 'xz'.".format(compression))
+
+		super().__init__(filename, maxBytes=maxBytes, backupCount=backupCount, encoding=encoding, delay=delay)
+		self.Compression = compression
+		self.MaxTotalBytes = maxTotalBytes
+		self.Compressed = 0
+		self.Removed = 0
+
+		self._rotated_re = re.compile(
+			r"^" + re.escape(os.path.basename(self.baseFilename)) + r"\.(\d{8}-\d{6})(?:-(\d+))?(\.gz|\.xz)?$"
+		)
+		self._queue = queue.Queue()
+		self._stopping = False
+		self._thread = None
+		self._last_rotated = (None, 0)
+
+		for path in self._rotated_files():
+			if not path.endswith((".gz", ".xz")):
+				self._submit(path)
+
+
+	def doRollover(self):
+		if self.stream:
+			self.stream.close()
+			self.stream = None
+
+		if os.path.exists(self.baseFilename) and os.path.getsize(self.baseFilename) > 0:
+			if self.backupCount > 0:
+				rotated = self._rotated_filename()
+				os.rename(self.baseFilename, rotated)
+				self._submit(rotated)
+			else:
+				os.remove(self.baseFilename)
+
+		if not self.delay:
+			self.stream = self._open()
+
+
+	def close(self):
+		"""
+		Stop the compressor thread after it compresses the pending files.
+		If it doesn't finish in a few seconds, it is interrupted and the rest is compressed at the next start.
+		"""
+		if self._thread is not None and self._thread.is_alive():
+			self._queue.put(None)
+			self._thread.join(5)
+			self._stopping = True
+			self._thread.join(1)
+		super().close()
+
+
+	def wait(self):
+		"""
+		Block until all rotated files are compressed.
+		"""
+		self._queue.join()
+
+
+	def _rotated_filename(self):
+		timestamp = time.strftime("%Y%m%d-%H%M%S")
+		# Files rotated within the same second get increasing sequence numbers,
+		# even when the previous ones were already removed by the retention
+		seq = self._last_rotated[1] + 1 if self._last_rotated[0] == timestamp else 0
+		while True:
+			rotated = "{}.{}".format(self.baseFilename, timestamp) if seq == 0 else "{}.{}-{}".format(self.baseFilename, timestamp, seq)
+			if not any(os.path.exists(rotated + suffix) for suffix in ("", ".gz", ".xz")):
+				break
+			seq += 1
+		self._last_rotated = (timestamp, seq)
+		return rotated
+
+
+	def _rotated_files(self):
+		"""
+		Rotated files from the newest to the oldest.
+		"""
+		directory = os.path.dirname(self.baseFilename)
+		rotated = []
+		for name in os.listdir(directory):
+			match = self._rotated_re.match(name)
+			if match is not None:
+				rotated.append((match.group(1), int(match.group(2) or 0), os.path.join(directory, name)))
+		rotated.sort(reverse=True)
+		return [path for _, _, path in rotated]
+
+
+	def _submit(self, path):
+		if self._thread is None:
+			self._thread = threading.Thread(target=self._run, name="asab-log-compressor", daemon=True)
+			self._thread.start()
+		self._queue.put(path)
+
+
+	def _run(self):
+		while True:
+			path = self._queue.get()
+			try:
+				if path is None:
+					return
+				self._compress(path)
+				self._retain()
+			except Exception:
+				traceback.print_exc(file=sys.stderr)
+			finally:
+				self._queue.task_done()
+
+
+	def _compress(self, path):
+		if self.Compression == "xz":
+			import lzma
+			open_compressed = lzma.open
+		else:
+			import gzip
+			open_compressed = gzip.open
+
+		target = path + self.Suffixes[self.Compression]
+		tmp = target + ".tmp"
+		try:
+			with open(path, "rb") as src, open_compressed(tmp, "wb") as dst:
+				while True:
+					if self._stopping:
+						raise InterruptedError()
+					chunk = src.read(self.ChunkSize)
+					if len(chunk) == 0:
+						break
+					dst.write(chunk)
+		except (InterruptedError, FileNotFoundError):
+			# The application is exiting or the file was already removed by the retention
+			if os.path.exists(tmp):
+				os.remove(tmp)
+			return
+		except BaseException:
+			if os.path.exists(tmp):
+				os.remove(tmp)
+			raise
+
+		os.rename(tmp, target)
+		os.remove(path)
+		self.Compressed += 1
+
+
+	def _retain(self):
+		total = 0
+		for i, path in enumerate(self._rotated_files()):
+			try:
+				size = os.path.getsize(path)
+			except FileNotFoundError:
+				continue
+			total += size
+			if i >= self.backupCount or (self.MaxTotalBytes > 0 and total > self.MaxTotalBytes):
+				try:
+					os.remove(path)
+					self.Removed += 1
+				except FileNotFoundError:
+					pass
 
 
 _RESET_SEQ = "\033[0m"
@@ -0,0 +1,28 @@
+import logging
+
+# This module is imported by `import asab`, so that loggers of all modules support `struct_data`
+
+LOG_NOTICE = 25
+"""
+Info log level that is visible in non-verbose mode. It should not be used for warnings and errors.
+"""
+
+logging.addLevelName(LOG_NOTICE, "NOTICE")
+
+
+class _StructuredDataLogger(logging.Logger):
+	'''
+This class extends a default python logger class, specifically by adding ``struct_data`` parameter to logging functions.
+It means that you can use expressions such as ``logger.info("Hello world!", struct_data={'key':'value'})``.
+	'''
+
+	def _log(self, level, msg, args, exc_info=None, struct_data=None, extra=None, stack_info=False):
+		if struct_data is not None:
+			if extra is None:
+				extra = dict()
+			extra['_struct_data'] = struct_data
+
+		super()._log(level, msg, args, exc_info=exc_info, extra=extra, stack_info=stack_info)
+
+
+logging.setLoggerClass(_StructuredDataLogger)
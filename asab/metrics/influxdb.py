@@ -111,7 +111,7 @@ class InfluxDBTarget(asab.Configurable):
 		rb = influxdb_format(m_tree, now)
 
 		if self.ProactorService is not None:
-			self.ProactorService.schedule(self._worker_upload, m_tree, rb)
+			self.ProactorService.schedule(self._worker_upload, m_tree, rb, executor="metrics")
 
 		else:
 			try:
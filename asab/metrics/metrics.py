@@ -12,7 +12,7 @@ class Metric(abc.ABC):
 		self.StaticTags = dict()
 
 		# Expiration is relevant only to WithDynamicTagsMixIn metrics
-		self.Expiration = float(Config.get("asab:metrics", "expiration"))
+		self.Expiration = Config.snapshot().getfloat("asab:metrics", "expiration")
 
 	def _initialize_storage(self, storage: dict):
 		assert storage['type'] is None
@@ -1,6 +1,6 @@
 import logging
 from ..abc import Service
-from ..log import LOG_NOTICE
+from ..log import LOG_NOTICE, AsyncIOHandler
 
 #
 
@@ -23,14 +23,44 @@ class NativeMetrics(Service):
 
 		# Injecting logging metrics into MetricsHandler and MetricsHandler into Root Logger
 		self.MetricsLoggingHandler = MetricsLoggingHandler()
-		self.MetricsLoggingHandler.LogCounter = metrics_svc.create_counter("logs", init_values={"warnings": 0, "errors": 0, "critical": 0}, help="Counts WARNING, ERROR and CRITICAL logs per minute.")
+		self.MetricsLoggingHandler.LogCounter = metrics_svc.create_counter("logs", init_values={"warnings": 0, "errors": 0, "critical": 0, "suppressed": 0}, help="Counts WARNING, ERROR and CRITICAL logs and logs suppressed by the rate limiting per minute.")
 		logging.root.addHandler(self.MetricsLoggingHandler)
 
+		# Rate limiting of logs
+		self.RateLimitFilter = getattr(getattr(app, "Logging", None), "RateLimitFilter", None)
+		self._RateLimitSuppressed = 0
+
+		# Queued logging
+		self.LogQueueHandler = getattr(getattr(app, "Logging", None), "QueueHandler", None)
+		if self.LogQueueHandler is not None:
+			self.LogQueueGauge = metrics_svc.create_gauge("logs.queue", init_values={"queued": 0}, help="Number of log records waiting for the writer thread.")
+			self.LogQueueCounter = metrics_svc.create_counter("logs.queue.records", init_values={"written": 0, "dropped": 0}, help="Counts log records written and dropped because the queue was full.")
+			self._LogQueueWritten = 0
+			self._LogQueueDropped = 0
+
+		# Syslog delivery
+		self.SyslogHandler = getattr(getattr(app, "Logging", None), "SyslogHandler", None)
+		if isinstance(self.SyslogHandler, AsyncIOHandler):
+			self.SyslogCounter = metrics_svc.create_counter("logs.syslog", init_values={"dropped": 0, "reconnects": 0}, help="Counts syslog messages dropped because the buffer was full and reconnections to syslog.")
+			self._SyslogDropped = 0
+			self._SyslogReconnects = 0
+		else:
+			self.SyslogHandler = None
+
 		app.PubSub.subscribe("Metrics.flush!", self._on_flushing_event)
 		self._on_flushing_event()
 
 
 	def _on_flushing_event(self, event_name=None):
+		if self.RateLimitFilter is not None:
+			suppressed = self.RateLimitFilter.Suppressed
+			self.MetricsLoggingHandler.LogCounter.add("suppressed", suppressed - self._RateLimitSuppressed)
+			self._RateLimitSuppressed = suppressed
+		if self.LogQueueHandler is not None:
+			self._update_log_queue_metrics()
+		if self.SyslogHandler is not None:
+			self._update_syslog_metrics()
+
 		if not self._MemoryMetricsAvailable:
 			return
 
@@ -57,6 +87,21 @@ class NativeMetrics(Service):
 			)
 
 
+	def _update_log_queue_metrics(self):
+		written, dropped = self.LogQueueHandler.Written, self.LogQueueHandler.Dropped
+		self.LogQueueGauge.set("queued", self.LogQueueHandler.Queued)
+		self.LogQueueCounter.add("written", written - self._LogQueueWritten)
+		self.LogQueueCounter.add("dropped", dropped - self._LogQueueDropped)
+		self._LogQueueWritten, self._LogQueueDropped = written, dropped
+
+
+	def _update_syslog_metrics(self):
+		dropped, reconnects = self.SyslogHandler.Dropped, self.SyslogHandler.Reconnects
+		self.SyslogCounter.add("dropped", dropped - self._SyslogDropped)
+		self.SyslogCounter.add("reconnects", reconnects - self._SyslogReconnects)
+		self._SyslogDropped, self._SyslogReconnects = dropped, reconnects
+
+
 class MetricsLoggingHandler(logging.Handler):
 
 	def emit(self, record):
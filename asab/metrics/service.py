@@ -21,6 +21,9 @@ L = logging.getLogger(__name__)
 
 class MetricsService(Service):
 
+	# Targets may upload the last metrics in the Proactor thread during finalization
+	Dependencies = ("asab.ProactorService",)
+
 	def __init__(self, app, service_name):
 
 		super().__init__(app, service_name)
@@ -33,6 +36,11 @@ class MetricsService(Service):
 			"appclass": app.__class__.__name__,
 		}
 
+		# Each prefork worker reports its own metrics
+		worker_id = getattr(app, "WorkerId", None)
+		if worker_id is not None:
+			self.Tags["worker"] = str(worker_id)
+
 		# A identified of the host machine (node); added if available at environment variables
 		node_id = os.getenv('NODE_ID', None)
 		if node_id is not None:
@@ -56,6 +64,7 @@ class MetricsService(Service):
 		self.TickIntervalMultiplier = Config.getint('asab:metrics', 'interval_multiplier')
 		self.TickCounter = 0
 		app.PubSub.subscribe("Application.tick/60!", self._on_tick60)
+		app.PubSub.subscribe("Config.changed!", self._on_config_changed)
 
 		if Config.has_option('asab:metrics', 'target'):
 			for target in Config.get('asab:metrics', 'target').split():
@@ -83,6 +92,9 @@ class MetricsService(Service):
 
 				self.Targets.append(target)
 
+		if app.PubSub.Instrumentation is not None:
+			app.PubSub.Instrumentation.attach_metrics(self)
+
 		if Config.getboolean('asab:metrics', 'native_metrics'):
 			from .native import NativeMetrics
 			self._native_svc = NativeMetrics(self.App, self)
@@ -92,6 +104,11 @@ class MetricsService(Service):
 		await self._on_flushing_event("finalize!")
 
 
+	def _on_config_changed(self, message_type, diff):
+		if "interval_multiplier" in diff.get("asab:metrics", {}):
+			self.TickIntervalMultiplier = Config.getint('asab:metrics', 'interval_multiplier')
+
+
 	def del_metric(self, metric_obj):
 		"""
 		This method deletes an existing metric from the service.
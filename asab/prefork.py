@@ -0,0 +1,205 @@
+import os
+import sys
+import time
+import signal
+import logging
+
+from .config import Config
+from .log import LOG_NOTICE, StructuredDataFormatter
+
+#
+
+L = logging.getLogger(__name__)
+
+#
+
+# Set in worker processes, so a worker that restarts itself by `exec` doesn't fork again
+WORKER_ID_ENV = "ASAB_WORKER_ID"
+
+_FORWARDED_SIGNALS = (signal.SIGINT, signal.SIGTERM, signal.SIGHUP)
+
+
+def is_supported() -> bool:
+	return hasattr(os, "fork") and hasattr(signal, "sigtimedwait")
+
+
+def parse_workers(value: str) -> int:
+	"""
+	Parse `[general] workers`: a number of worker processes, or `auto` for the number of CPUs.
+	"""
+	value = value.strip().lower()
+	if value in ("", "0", "1"):
+		return 1
+	if value == "auto":
+		return len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+	workers = int(value)
+	if workers < 1:
+		raise ValueError("Number of workers must be a positive number, not '{}'.".format(value))
+	return workers
+
+
+class Supervisor(object):
+	"""
+	Supervisor of prefork worker processes.
+
+	The supervisor forks the workers before the event loop is created, forwards SIGINT, SIGTERM and SIGHUP to them
+	and restarts workers that crashed, with an exponential backoff when they crash repeatedly right after the start.
+	It doesn't run the application itself.
+	"""
+
+	def __init__(self, workers: int, restart_backoff: float = 0.5, restart_backoff_max: float = 30.0):
+		self.WorkerCount = workers
+		self.RestartBackoff = restart_backoff
+		self.RestartBackoffMax = restart_backoff_max
+
+		self.Workers = {}  # pid -> worker id
+		self.StartedAt = {}  # worker id -> monotonic time of the start
+		self.Crashes = {}  # worker id -> number of consecutive early crashes
+		self.Restarts = {}  # worker id -> monotonic time of the planned restart
+		self.Stopping = False
+		self.ExitCode = 0
+
+		# The supervisor runs before `asab.Logging` configures the logging
+		self.LogHandler = None
+		self.LogLevel = None
+
+
+	def run(self) -> int:
+		"""
+		Fork the workers and supervise them.
+
+		Returns:
+			The id of the worker in a worker process. The supervisor process exits when all workers exited.
+		"""
+		signal.pthread_sigmask(signal.SIG_BLOCK, _FORWARDED_SIGNALS + (signal.SIGCHLD,))
+		self._configure_logging()
+
+		for worker_id in range(self.WorkerCount):
+			if self._spawn(worker_id):
+				return worker_id
+
+		L.log(LOG_NOTICE, "Prefork supervisor started", struct_data={'workers': self.WorkerCount, 'pid': os.getpid()})
+
+		while len(self.Workers) > 0 or (len(self.Restarts) > 0 and not self.Stopping):
+			timeout = None
+			if len(self.Restarts) > 0 and not self.Stopping:
+				timeout = max(0.0, min(self.Restarts.values()) - time.monotonic())
+
+			if timeout is None:
+				siginfo = signal.sigwaitinfo(_FORWARDED_SIGNALS + (signal.SIGCHLD,))
+			else:
+				siginfo = signal.sigtimedwait(_FORWARDED_SIGNALS + (signal.SIGCHLD,), timeout)
+
+			if siginfo is not None and siginfo.si_signo != signal.SIGCHLD:
+				self._forward(siginfo.si_signo)
+
+			self._reap()
+
+			now = time.monotonic()
+			for worker_id, restart_at in list(self.Restarts.items()):
+				if self.Stopping:
+					break
+				if restart_at <= now:
+					del self.Restarts[worker_id]
+					if self._spawn(worker_id):
+						return worker_id
+
+		sys.exit(self.ExitCode)
+
+
+	def _spawn(self, worker_id: int) -> bool:
+		"""
+		Fork a worker; returns True in the worker process.
+		"""
+		pid = os.fork()
+		if pid == 0:
+			# The worker gets signals only from the supervisor, not from the terminal
+			os.setpgid(0, 0)
+			os.environ[WORKER_ID_ENV] = str(worker_id)
+			signal.pthread_sigmask(signal.SIG_UNBLOCK, _FORWARDED_SIGNALS + (signal.SIGCHLD,))
+			self._restore_logging()
+			return True
+
+		self.Workers[pid] = worker_id
+		self.StartedAt[worker_id] = time.monotonic()
+		return False
+
+
+	def _configure_logging(self):
+		"""
+		Log to stderr in the supervisor process, unless the logging is already configured.
+		"""
+		root_logger = logging.getLogger()
+		if root_logger.hasHandlers():
+			return
+
+		self.LogHandler = logging.StreamHandler(stream=sys.stderr)
+		self.LogHandler.setFormatter(StructuredDataFormatter(
+			fmt=Config["logging:console"]["format"],
+			datefmt=Config["logging:console"]["datefmt"],
+			sd_id=Config["logging"]["sd_id"],
+		))
+		root_logger.addHandler(self.LogHandler)
+		self.LogLevel = root_logger.level
+		root_logger.setLevel(LOG_NOTICE)
+
+
+	def _restore_logging(self):
+		"""
+		Remove the supervisor's handler in a worker, the worker configures the logging by `asab.Logging`.
+		"""
+		if self.LogHandler is None:
+			return
+
+		root_logger = logging.getLogger()
+		root_logger.removeHandler(self.LogHandler)
+		root_logger.setLevel(self.LogLevel)
+		self.LogHandler = None
+
+
+	def _forward(self, signo):
+		if signo in (signal.SIGINT, signal.SIGTERM):
+			self.Stopping = True
+			self.Restarts.clear()
+
+		for pid in self.Workers:
+			try:
+				os.kill(pid, signo)
+			except ProcessLookupError:
+				pass
+
+
+	def _reap(self):
+		while len(self.Workers) > 0:
+			try:
+				pid, status = os.waitpid(-1, os.WNOHANG)
+			except ChildProcessError:
+				return
+			if pid == 0:
+				return
+
+			worker_id = self.Workers.pop(pid, None)
+			if worker_id is None:
+				continue
+
+			exit_code = os.waitstatus_to_exitcode(status)
+			if exit_code != 0:
+				self.ExitCode = exit_code if exit_code > 0 else 128 - exit_code
+
+			if self.Stopping or exit_code == 0:
+				continue
+
+			# The worker crashed, restart it; repeated crashes right after the start are delayed more and more
+			if time.monotonic() - self.StartedAt[worker_id] < self.RestartBackoffMax:
+				self.Crashes[worker_id] = self.Crashes.get(worker_id, 0) + 1
+			else:
+				self.Crashes[worker_id] = 0
+			delay = min(self.RestartBackoffMax, self.RestartBackoff * (2 ** self.Crashes[worker_id]) - self.RestartBackoff)
+			self.Restarts[worker_id] = time.monotonic() + delay
+
+			L.error("Worker process exited unexpectedly, restarting", struct_data={
+				'worker': worker_id,
+				'pid': pid,
+				'exit_code': exit_code,
+				'delay': round(delay, 1),
+			})
@@ -14,6 +14,16 @@ asab.Config.add_defaults(
 		'asab:proactor': {
 			'max_workers': '0',
 			'default_executor': True,
+
+			# Process pool for CPU-bound work, see `ProactorService.execute_cpu()`
+			# 0 means the number of CPUs
+			'cpu_max_workers': '0',
+			# Start all worker processes during the init-time instead of on the first call
+			'cpu_warm_up': 'no',
+			# 'fork', 'spawn' or 'forkserver'; empty means the platform default
+			'cpu_start_method': '',
+			# Bytes arguments and results of at least this size are passed through the shared memory; 0 disables it
+			'shared_memory_threshold': '1M',
 		}
 	}
 )
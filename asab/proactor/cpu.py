@@ -0,0 +1,58 @@
+import multiprocessing.shared_memory
+
+
+class SharedBytes(object):
+	"""
+	Reference to a bytes payload stored in the shared memory.
+
+	It is passed to/from the worker process instead of the payload itself, so that large payloads are not pickled.
+	"""
+
+	__slots__ = ('Name', 'Size')
+
+	def __init__(self, name, size):
+		self.Name = name
+		self.Size = size
+
+
+def export_bytes(data):
+	"""
+	Copy bytes-like `data` into a new shared memory block.
+
+	Returns:
+		Tuple `(SharedBytes, SharedMemory)`; the caller is responsible for closing and unlinking the shared memory.
+	"""
+	size = memoryview(data).nbytes
+	shm = multiprocessing.shared_memory.SharedMemory(create=True, size=max(size, 1))
+	shm.buf[:size] = data
+	return SharedBytes(shm.name, size), shm
+
+
+def import_bytes(ref, unlink=False):
+	"""
+	Read the payload referenced by `SharedBytes` and close the shared memory block.
+	"""
+	shm = multiprocessing.shared_memory.SharedMemory(name=ref.Name)
+	try:
+		return bytes(shm.buf[:ref.Size])
+	finally:
+		shm.close()
+		if unlink:
+			shm.unlink()
+
+
+def cpu_call(func, args, threshold):
+	"""
+	The entry point of the call in the worker process.
+
+	Shared arguments are resolved to bytes and the large bytes result is returned via the shared memory.
+	"""
+	args = [import_bytes(arg) if isinstance(arg, SharedBytes) else arg for arg in args]
+	result = func(*args)
+
+	if threshold > 0 and isinstance(result, (bytes, bytearray)) and len(result) >= threshold:
+		ref, shm = export_bytes(result)
+		shm.close()
+		return ref
+
+	return result
@@ -1,27 +1,41 @@
-import asab
+import os
+import time
+import asyncio
+import logging
+import functools
+import itertools
+import collections
+import threading
+import multiprocessing
+import multiprocessing.resource_tracker
 import concurrent.futures
+import typing
+
+import asab
+from ..utils import convert_to_bytes
+from .cpu import SharedBytes, export_bytes, import_bytes, cpu_call
+
+#
+
+L = logging.getLogger(__name__)
+
+#
 
 
 class ProactorService(asab.Service):
 	"""
 	Proactor service is useful for running CPU bound operations from asynchronous part of the code that would potentially block the main thread.
 	It allows to run these processes from different threads.
+
+	CPU-bound work that should not contend with the event loop for the GIL can be executed in a pool of worker processes by `execute_cpu()`.
 	"""
 
 	def __init__(self, app, service_name):
 		super().__init__(app, service_name)
 		self.Loop = app.Loop
 
-		max_workers = asab.Config.get('asab:proactor', 'max_workers')
-		try:
-			max_workers = int(max_workers)
-		except BaseException:
-			max_workers = None
-		if max_workers <= 0:
-			max_workers = None
-
 		self.Executor = concurrent.futures.ThreadPoolExecutor(
-			max_workers=max_workers,  # The maximum number of threads that can be used to execute the given calls.
+			max_workers=_max_workers('asab:proactor'),  # The maximum number of threads that can be used to execute the given calls.
 			# If None, ThreadPoolExecutor will determine the number itself based on number of CPU's.
 			thread_name_prefix="AsabProactorThread"
 		)
@@ -29,31 +43,404 @@ class ProactorService(asab.Service):
 		if asab.Config.get('asab:proactor', 'default_executor'):
 			self.Loop.set_default_executor(self.Executor)
 
+		# Named thread pools, see `get_executor()`; the default pool is registered under the name "default"
+		self.Executors = {"default": self.Executor}
+		self.Stats = {"default": ExecutorStats(self.Executor._max_workers)}
+
+		# The process pool is created on the first `execute_cpu()` call or in the init-time, if warm up is configured
+		self.CPUExecutor = None
+		self.CPUMaxWorkers = asab.Config.getint('asab:proactor', 'cpu_max_workers')
+		if self.CPUMaxWorkers <= 0:
+			self.CPUMaxWorkers = os.cpu_count() or 1
+		self.SharedMemoryThreshold = convert_to_bytes(asab.Config.get('asab:proactor', 'shared_memory_threshold'))
+		self.CPUStats = ExecutorStats(self.CPUMaxWorkers)
+
+		self.MetricsService = None
+		self.Gauges = {}
+		self._flushed_at = time.monotonic()
+
+
+	async def initialize(self, app):
+		self.MetricsService = app.get_service("asab.MetricsService")
+		if self.MetricsService is not None:
+			self._create_metrics("process", self.CPUStats)
+			for name, stats in self.Stats.items():
+				self._create_metrics(name, stats)
+			app.PubSub.subscribe("Metrics.flush!", self._on_flushing_event)
+
+		if asab.Config.getboolean('asab:proactor', 'cpu_warm_up'):
+			executor = self._get_cpu_executor()
+			await asyncio.gather(*(
+				self.Loop.run_in_executor(executor, os.getpid) for _ in range(self.CPUMaxWorkers)
+			))
+
+
+	async def finalize(self, app):
+		if self.CPUExecutor is not None:
+			self.CPUExecutor.shutdown(wait=False, cancel_futures=True)
+			self.CPUExecutor = None
+
+		for name, executor in self.Executors.items():
+			if executor is not self.Executor:
+				executor.shutdown(wait=False, cancel_futures=True)
+
 
 	# There was the method run, which is obsolete
-	def execute(self, func, *args):
+	def execute(self, func, *args, executor: typing.Optional[str] = None):
 		"""
 		Execute `func(*args)` in the thread from the Proactor Service pool.
 		Return Future or Task that must be awaited and it provides the result of the `func()` call.
+
+		Args:
+			executor: The name of the thread pool, see `get_executor()`. The default pool is used if not specified.
+
+		Examples:
+
+		```python
+		data, stat = await proactor_svc.execute(zk_client.get, path, executor="zookeeper")
+		```
+		"""
+		name = self._resolve(executor)
+		stats = self.Stats[name]
+		future = self.Loop.run_in_executor(self.Executors[name], stats.call, time.perf_counter(), func, args)
+		stats.Pending += 1
+		future.add_done_callback(functools.partial(self._completed, name))
+		return future
+
+
+	def get_executor(self, name: str) -> concurrent.futures.Executor:
 		"""
-		return self.Loop.run_in_executor(self.Executor, func, *args)
+		Get the thread pool of the given name.
+
+		Named thread pools isolate independent kinds of blocking work from each other,
+		so that e.g. slow ZooKeeper calls don't delay webhook calls or metrics uploads.
+		The pool is created on the first use from the `[asab:proactor:<name>]` configuration section.
+		If there is no such section, the default pool is returned.
+		The name `process` is reserved for the process pool of `execute_cpu()`.
+
+		Examples:
 
+		```ini
+		[asab:proactor:zookeeper]
+		max_workers=2
 
-	def schedule(self, func, *args):
+		[asab:proactor:io]
+		max_workers=16
+		```
+		"""
+		return self.Executors[self._resolve(name)]
+
+
+	async def execute_cpu(self, func, *args):
+		"""
+		Execute `func(*args)` in the worker process from the Proactor Service process pool and return the result.
+
+		Use it for CPU-bound work (e.g. parsing of large documents, cryptography or compression) that would otherwise hold the GIL.
+		The function and its arguments must be picklable, i.e. the function has to be defined at the module level.
+		Bytes-like arguments and bytes results larger than `shared_memory_threshold` are passed through the shared memory
+		instead of being pickled.
+
+		Examples:
+
+		```python
+		compressed = await proactor_svc.execute_cpu(gzip.compress, data)
+		```
+		"""
+		executor = self._get_cpu_executor()
+
+		shared = []
+		if self.SharedMemoryThreshold > 0:
+			args = tuple(self._share(arg, shared) for arg in args)
+
+		try:
+			future = self.Loop.run_in_executor(executor, cpu_call, func, args, self.SharedMemoryThreshold)
+			self.CPUStats.Pending += 1
+			future.add_done_callback(functools.partial(self._completed, "process"))
+			result = await future
+		finally:
+			for shm in shared:
+				shm.close()
+				shm.unlink()
+
+		if isinstance(result, SharedBytes):
+			result = import_bytes(result, unlink=True)
+
+		return result
+
+
+	async def map(
+		self, func, iterable, *,
+		chunksize: int = 64,
+		ordered: bool = True,
+		max_in_flight: typing.Optional[int] = None,
+		executor: typing.Optional[str] = None
+	):
+		"""
+		Apply `func` to every item of `iterable` in the threads from the Proactor Service pool and yield the results.
+
+		Items are sent to worker threads in chunks of `chunksize` items, so that a large number of small calls
+		doesn't flood the executor with futures and the event loop with wake-ups.
+		At most `max_in_flight` chunks are submitted at once (the number of workers of the executor by default),
+		the iterable is consumed only as fast as the results are produced.
+
+		If `ordered` is False, results are yielded as soon as their chunk is completed.
+		An exception raised by `func` is propagated and chunks not yet started are cancelled.
+
+		Args:
+			func: Blocking function called with a single item.
+			iterable: Items to be processed, it is consumed lazily.
+			chunksize: Number of items processed by one call in the worker thread.
+			ordered: Yield results in the order of the items.
+			max_in_flight: The maximum number of submitted chunks.
+			executor: The name of the thread pool, see `get_executor()`.
+
+		Examples:
+
+		```python
+		async for digest in proactor_svc.map(hash_file, paths, chunksize=16):
+			...
+		```
+		"""
+		if chunksize < 1:
+			raise ValueError("The chunksize must be a positive number.")
+
+		if max_in_flight is None:
+			max_in_flight = self.get_executor(executor)._max_workers
+
+		iterator = iter(iterable)
+		in_flight = collections.deque()
+
+		def submit():
+			while len(in_flight) < max_in_flight:
+				chunk = list(itertools.islice(iterator, chunksize))
+				if len(chunk) == 0:
+					return
+				in_flight.append(self.execute(_map_chunk, func, chunk, executor=executor))
+
+		try:
+			submit()
+			while len(in_flight) > 0:
+				if ordered:
+					future = in_flight.popleft()
+					results = await future
+				else:
+					done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+					future = done.pop()
+					in_flight.remove(future)
+					results = future.result()
+
+				submit()
+				for result in results:
+					yield result
+
+		finally:
+			for future in in_flight:
+				future.cancel()
+
+
+	def schedule(self, func, *args, executor: typing.Optional[str] = None):
 		"""
 		Execute `func(*args)` in the thread from the Proactor Service pool.
 		The result of the future is discarded (using Task Service).
 		"""
 
-		future = self.execute(func, *args)
+		future = self.execute(func, *args, executor=executor)
 		self.App.TaskService.schedule(future)
 
 
-	def schedule_threadsafe(self, func, *args):
+	def schedule_threadsafe(self, func, *args, executor: typing.Optional[str] = None):
 		"""
 		Execute `func(*args)` in the thread from the Proactor Service pool.
 		The result of the future is discarded (using Task Service).
 		"""
 
-		future = self.execute(func, *args)
+		future = self.execute(func, *args, executor=executor)
 		self.App.TaskService.schedule_threadsafe(future)
+
+
+	def _resolve(self, name):
+		if name is None:
+			return "default"
+
+		if name in self.Executors:
+			return name
+
+		if name == "process":
+			# Reserved for the process pool of `execute_cpu()`, its stats and metrics are tracked under this name
+			raise ValueError("Proactor executor name 'process' is reserved for the process pool")
+
+		section = "asab:proactor:{}".format(name)
+		if not asab.Config.has_section(section):
+			# Not configured, share the default pool
+			L.debug("Proactor executor is not configured, using the default one", struct_data={'executor': name})
+			self.Executors[name] = self.Executor
+			self.Stats[name] = self.Stats["default"]
+			return "default"
+
+		executor = concurrent.futures.ThreadPoolExecutor(
+			max_workers=_max_workers(section),
+			thread_name_prefix="AsabProactor-{}".format(name),
+		)
+		self.Executors[name] = executor
+		self.Stats[name] = ExecutorStats(executor._max_workers)
+		if self.MetricsService is not None:
+			self._create_metrics(name, self.Stats[name])
+		return name
+
+
+	def _get_cpu_executor(self):
+		if self.CPUExecutor is None:
+			# Worker processes have to share the resource tracker of this process,
+			# otherwise they report shared memory blocks unlinked here as leaked
+			multiprocessing.resource_tracker.ensure_running()
+
+			start_method = asab.Config.get('asab:proactor', 'cpu_start_method')
+			self.CPUExecutor = concurrent.futures.ProcessPoolExecutor(
+				max_workers=self.CPUMaxWorkers,
+				mp_context=multiprocessing.get_context(start_method) if len(start_method) > 0 else None,
+			)
+		return self.CPUExecutor
+
+
+	def _share(self, arg, shared):
+		if not isinstance(arg, (bytes, bytearray, memoryview)):
+			return arg
+		if memoryview(arg).nbytes < self.SharedMemoryThreshold:
+			return arg
+		ref, shm = export_bytes(arg)
+		shared.append(shm)
+		return ref
+
+
+	def _create_metrics(self, name, stats):
+		if name in self.Gauges:
+			return
+		tags = {"executor": name}
+		self.Gauges[name] = (
+			stats,
+			self.MetricsService.create_gauge(
+				"proactor",
+				tags=tags,
+				init_values={"pending": 0, "queued": 0, "utilization": 0.0},
+				help="Calls submitted to the Proactor executor, calls waiting for a free worker and the share of the busy worker time.",
+			),
+			self.MetricsService.create_counter(
+				"proactor.wait",
+				tags=tags,
+				init_values={"started": 0, "wait_time": 0.0},
+				help="Number of calls started by the Proactor executor and their total waiting time for a free worker.",
+				unit="seconds",
+			),
+			self.MetricsService.create_aggregation_counter(
+				"proactor.wait.max",
+				tags=tags,
+				init_values={"wait_time": 0.0},
+				help="The longest waiting time of a call for a free worker of the Proactor executor.",
+				unit="seconds",
+			),
+		)
+
+
+	def _completed(self, name, future):
+		if name == "process":
+			self.CPUStats.Pending -= 1
+			return
+
+		stats = self.Stats[name]
+		stats.Pending -= 1
+
+		metrics = self.Gauges.get(name)
+		if metrics is None:
+			return
+		_, _, wait_counter, wait_max = metrics
+		started, wait_time, wait_time_max = stats.collect_wait()
+		if started > 0:
+			wait_counter.add("started", started)
+			wait_counter.add("wait_time", wait_time)
+			wait_max.set("wait_time", wait_time_max)
+
+
+	def _on_flushing_event(self, message_type):
+		now = time.monotonic()
+		interval = now - self._flushed_at
+		self._flushed_at = now
+
+		for name, (stats, gauge, _, _) in self.Gauges.items():
+			pending = stats.Pending
+			gauge.set("pending", pending)
+			gauge.set("queued", max(0, pending - stats.MaxWorkers))
+			if interval > 0 and name != "process":
+				# Busy time is measured only in the worker threads
+				gauge.set("utilization", min(1.0, stats.collect_busy() / (interval * stats.MaxWorkers)))
+
+
+class ExecutorStats(object):
+	"""
+	Counters of a Proactor executor.
+
+	`Pending` is maintained in the event loop thread, the wait and busy times are recorded by worker threads.
+	"""
+
+	def __init__(self, max_workers):
+		self.MaxWorkers = max_workers or 1
+		self.Pending = 0
+
+		self.Lock = threading.Lock()
+		self.Started = 0
+		self.WaitTime = 0.0
+		self.WaitTimeMax = 0.0
+		self.BusyTime = 0.0
+
+
+	def call(self, submitted_at, func, args):
+		# Executed in the worker thread
+		started_at = time.perf_counter()
+		try:
+			return func(*args)
+		finally:
+			finished_at = time.perf_counter()
+			wait_time = started_at - submitted_at
+			with self.Lock:
+				self.Started += 1
+				self.WaitTime += wait_time
+				if wait_time > self.WaitTimeMax:
+					self.WaitTimeMax = wait_time
+				self.BusyTime += finished_at - started_at
+
+
+	def collect_wait(self):
+		"""
+		Return and reset the number of started calls and their total and maximum wait time.
+		"""
+		with self.Lock:
+			result = (self.Started, self.WaitTime, self.WaitTimeMax)
+			self.Started = 0
+			self.WaitTime = 0.0
+			self.WaitTimeMax = 0.0
+		return result
+
+
+	def collect_busy(self):
+		"""
+		Return and reset the time the workers spent executing calls.
+		"""
+		with self.Lock:
+			busy_time = self.BusyTime
+			self.BusyTime = 0.0
+		return busy_time
+
+
+def _map_chunk(func, chunk):
+	# Executed in the worker thread
+	return [func(item) for item in chunk]
+
+
+def _max_workers(section):
+	max_workers = asab.Config.get(section, 'max_workers', fallback='0')
+	try:
+		max_workers = int(max_workers)
+	except ValueError:
+		return None
+	if max_workers <= 0:
+		return None
+	return max_workers
@@ -3,6 +3,9 @@ import asyncio
 import weakref
 import functools
 import typing
+import time
+
+from .config import Config
 
 
 L = logging.getLogger(__name__)
@@ -20,6 +23,13 @@ class PubSub(object):
 		self.Subscribers = {}
 		self.Loop = app.Loop
 
+		# Optional per-message and per-subscriber statistics, see `PubSubInstrumentation`
+		self.Instrumentation = None
+		if Config.getboolean("asab:pubsub", "instrumentation", fallback=False):
+			self.Instrumentation = PubSubInstrumentation(
+				slow_threshold=Config.getseconds("asab:pubsub", "slow_threshold", fallback=0.1)
+			)
+
 
 	def subscribe(self, message_type: str, callback: typing.Callable):
 		"""
@@ -151,7 +161,13 @@ class PubSub(object):
 				remove_list.append(callback_ref)
 				continue
 
-			if asyncio.iscoroutinefunction(callback):
+			if self.Instrumentation is not None:
+				if asyncio.iscoroutinefunction(callback):
+					callback = functools.partial(self.Instrumentation.deliver_async, callback)
+				else:
+					callback = functools.partial(self.Instrumentation.deliver_sync, callback)
+
+			elif asyncio.iscoroutinefunction(callback):
 				callback = functools.partial(_deliver_async, self.Loop, callback)
 
 			yield callback
@@ -192,6 +208,9 @@ class PubSub(object):
 
 		asynchronously = kwargs.pop('asynchronously', False)
 
+		if self.Instrumentation is not None:
+			self.Instrumentation.published(message_type)
+
 		if asynchronously:
 			for callback in self._callback_iter(message_type):
 				self.Loop.call_soon(functools.partial(callback, message_type, *args, **kwargs))
@@ -291,6 +310,142 @@ def _deliver_async(loop, callback, message_type, *args, **kwargs):
 	task.add_done_callback(_deliver_async_exited)
 
 
+class PubSubInstrumentation(object):
+	"""
+	Statistics of the PubSub message delivery.
+
+	It counts published messages per message type and measures the duration of each delivery per subscriber.
+	Synchronous callbacks are measured by the duration of the call, asynchronous callbacks by the duration of the delivery task.
+	Deliveries that take longer than `slow_threshold` seconds are counted as slow and reported to the log.
+
+	The instrumentation is enabled in the configuration; when disabled, `PubSub.Instrumentation` is `None` and the delivery is not affected.
+	Statistics are exported via `asab.MetricsService` when it is available.
+
+	```ini
+	[asab:pubsub]
+	instrumentation=yes
+	slow_threshold=100ms
+	```
+	"""
+
+	def __init__(self, slow_threshold: float = 0.1):
+		self.SlowThreshold = slow_threshold
+
+		# message_type -> number of publish calls
+		self.Published = {}
+
+		# (message_type, subscriber, mode) -> [calls, total duration, max duration, slow calls]
+		self.Deliveries = {}
+
+		# Subscribers that have been already reported as slow in the current metrics interval
+		self._SlowReported = set()
+
+		self.PublishedCounter = None
+		self.DeliveryCounter = None
+		self.DeliveryMaxDuration = None
+
+
+	def attach_metrics(self, metrics_svc):
+		"""
+		Create metrics for the statistics and export them at every `Metrics.flush!`.
+		"""
+		self.PublishedCounter = metrics_svc.create_counter(
+			"pubsub.published",
+			dynamic_tags=True,
+			help="Counts published PubSub messages per message type.",
+		)
+		self.DeliveryCounter = metrics_svc.create_counter(
+			"pubsub.delivery",
+			dynamic_tags=True,
+			help="Counts PubSub deliveries, their total duration and slow deliveries per subscriber.",
+		)
+		self.DeliveryMaxDuration = metrics_svc.create_aggregation_counter(
+			"pubsub.delivery.max",
+			aggregator=max,
+			dynamic_tags=True,
+			help="The longest PubSub delivery per subscriber.",
+			unit="seconds",
+		)
+		metrics_svc.App.PubSub.subscribe("Metrics.flush!", self._on_flushing_event)
+
+
+	def published(self, message_type):
+		try:
+			self.Published[message_type] += 1
+		except KeyError:
+			self.Published[message_type] = 1
+
+
+	def deliver_sync(self, callback, message_type, *args, **kwargs):
+		t0 = time.perf_counter()
+		try:
+			callback(message_type, *args, **kwargs)
+		finally:
+			self._record(message_type, callback, "sync", time.perf_counter() - t0)
+
+
+	def deliver_async(self, callback, message_type, *args, **kwargs):
+		task = asyncio.create_task(callback(message_type, *args, **kwargs))
+		task.set_name("asab.PubSub.{}".format(message_type))
+		task.add_done_callback(_deliver_async_exited)
+		task.add_done_callback(functools.partial(self._on_task_done, message_type, callback, time.perf_counter()))
+
+
+	def _on_task_done(self, message_type, callback, t0, task):
+		self._record(message_type, callback, "async", time.perf_counter() - t0)
+
+
+	def _record(self, message_type, callback, mode, duration):
+		subscriber = _subscriber_name(callback)
+		key = (message_type, subscriber, mode)
+		stats = self.Deliveries.get(key)
+		if stats is None:
+			stats = self.Deliveries[key] = [0, 0.0, 0.0, 0]
+
+		stats[0] += 1
+		stats[1] += duration
+		if duration > stats[2]:
+			stats[2] = duration
+
+		if duration > self.SlowThreshold:
+			stats[3] += 1
+			if key not in self._SlowReported:
+				self._SlowReported.add(key)
+				L.warning("Slow PubSub subscriber", struct_data={
+					'message_type': message_type,
+					'subscriber': subscriber,
+					'mode': mode,
+					'duration': round(duration, 6),
+				})
+
+
+	def _on_flushing_event(self, message_type):
+		for msg_type, count in self.Published.items():
+			self.PublishedCounter.add("published", count, {"message_type": msg_type})
+
+		for (msg_type, subscriber, mode), (calls, total, maximum, slow) in self.Deliveries.items():
+			tags = {"message_type": msg_type, "subscriber": subscriber, "mode": mode}
+			self.DeliveryCounter.add("calls", calls, tags)
+			self.DeliveryCounter.add("duration", total, tags)
+			self.DeliveryCounter.add("slow", slow, tags)
+			self.DeliveryMaxDuration.set("duration", maximum, tags)
+
+		self.Published = {}
+		self.Deliveries = {}
+		self._SlowReported.clear()
+
+
+def _subscriber_name(callback):
+	name = getattr(callback, '__qualname__', None)
+	if name is None:
+		# Callable objects such as `Subscriber`
+		name = type(callback).__qualname__
+	module = getattr(callback, '__module__', None)
+	if module is not None:
+		return "{}.{}".format(module, name)
+	return name
+
+
 class Subscriber(object):
 	"""
 	Object for consuming PubSub messages in coroutines.
@@ -0,0 +1,29 @@
+import logging
+import asab
+
+from .service import SchedulerService, Job
+from .cron import Cron
+
+#
+
+L = logging.getLogger(__name__)
+
+#
+
+
+class Module(asab.Module):
+	'''
+	Scheduler of periodic jobs in intervals or by cron expressions, with jitter.
+	'''
+
+	def __init__(self, app):
+		super().__init__(app)
+		self.service = SchedulerService(app, "asab.SchedulerService")
+
+
+__all__ = (
+	'Module',
+	'SchedulerService',
+	'Job',
+	'Cron',
+)
@@ -0,0 +1,134 @@
+import datetime
+
+
+_ALIASES = {
+	"@yearly": "0 0 1 1 *",
+	"@annually": "0 0 1 1 *",
+	"@monthly": "0 0 1 * *",
+	"@weekly": "0 0 * * 0",
+	"@daily": "0 0 * * *",
+	"@midnight": "0 0 * * *",
+	"@hourly": "0 * * * *",
+}
+
+_MONTHS = {name: i for i, name in enumerate(
+	["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], start=1
+)}
+
+_DAYS = {name: i for i, name in enumerate(["sun", "mon", "tue", "wed", "thu", "fri", "sat"])}
+
+
+class Cron(object):
+	"""
+	Cron expression with five fields: minute, hour, day of month, month and day of week.
+
+	Fields accept `*`, numbers, ranges (`1-5`), lists (`1,15`) and steps (`*/15`, `0-30/10`).
+	Months and days of week can be given by their three-letter English names, Sunday is 0 or 7.
+	Aliases `@yearly`, `@monthly`, `@weekly`, `@daily` and `@hourly` are supported as well.
+	When both the day of month and the day of week are restricted, a day matching either of them matches (as in cron).
+
+	Examples:
+
+	```python
+	>>> cron = Cron("*/15 8-17 * * mon-fri")
+	>>> cron.next(datetime.datetime(2024, 1, 5, 17, 50, tzinfo=datetime.timezone.utc))
+	datetime.datetime(2024, 1, 8, 8, 0, tzinfo=datetime.timezone.utc)
+	```
+	"""
+
+	def __init__(self, expression: str):
+		self.Expression = expression
+		fields = _ALIASES.get(expression.strip().lower(), expression).split()
+		if len(fields) != 5:
+			raise ValueError("Cron expression '{}' must have five fields.".format(expression))
+
+		self.Minutes = _parse_field(fields[0], 0, 59)
+		self.Hours = _parse_field(fields[1], 0, 23)
+		self.DaysOfMonth = _parse_field(fields[2], 1, 31)
+		self.Months = _parse_field(fields[3], 1, 12, _MONTHS)
+		self.DaysOfWeek = set(day % 7 for day in _parse_field(fields[4], 0, 7, _DAYS))
+
+		self.DayOfMonthRestricted = fields[2] != "*"
+		self.DayOfWeekRestricted = fields[4] != "*"
+
+
+	def next(self, after: datetime.datetime) -> datetime.datetime:
+		"""
+		Return the first matching time (with the minute precision) strictly after `after`.
+
+		Raises:
+			ValueError: If the expression never matches, e.g. `0 0 30 2 *`.
+		"""
+		t = after.replace(second=0, microsecond=0) + datetime.timedelta(minutes=1)
+		limit = after.year + 8  # Covers leap years
+
+		while t.year <= limit:
+			if t.month not in self.Months:
+				year, month = (t.year + 1, 1) if t.month == 12 else (t.year, t.month + 1)
+				t = t.replace(year=year, month=month, day=1, hour=0, minute=0)
+				continue
+
+			if not self._day_matches(t):
+				t = t.replace(hour=0, minute=0) + datetime.timedelta(days=1)
+				continue
+
+			if t.hour not in self.Hours:
+				t = t.replace(minute=0) + datetime.timedelta(hours=1)
+				continue
+
+			if t.minute not in self.Minutes:
+				t += datetime.timedelta(minutes=1)
+				continue
+
+			return t
+
+		raise ValueError("Cron expression '{}' never matches.".format(self.Expression))
+
+
+	def _day_matches(self, t):
+		dom = t.day in self.DaysOfMonth
+		dow = ((t.weekday() + 1) % 7) in self.DaysOfWeek
+		if self.DayOfMonthRestricted and self.DayOfWeekRestricted:
+			return dom or dow
+		return dom and dow
+
+
+	def __repr__(self):
+		return "Cron({!r})".format(self.Expression)
+
+
+def _parse_field(field, minimum, maximum, names=None):
+	values = set()
+	for part in field.lower().split(","):
+		step = 1
+		if "/" in part:
+			part, step = part.split("/", 1)
+			step = int(step)
+			if step < 1:
+				raise ValueError("Invalid step in cron field '{}'.".format(field))
+
+		if part == "*":
+			start, end = minimum, maximum
+		elif "-" in part:
+			start, end = part.split("-", 1)
+			start, end = _parse_value(start, names), _parse_value(end, names)
+		else:
+			start = _parse_value(part, names)
+			# '5/10' means from 5 to the maximum with the step 10
+			end = maximum if step > 1 else start
+
+		if start < minimum or end > maximum or start > end:
+			raise ValueError("Cron field '{}' is out of the range {}-{}.".format(field, minimum, maximum))
+
+		values.update(range(start, end + 1, step))
+
+	return values
+
+
+def _parse_value(value, names):
+	if names is not None and value in names:
+		return names[value]
+	try:
+		return int(value)
+	except ValueError:
+		raise ValueError("Invalid value '{}' in cron expression.".format(value)) from None
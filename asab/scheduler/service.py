@@ -0,0 +1,192 @@
+import abc
+import random
+import inspect
+import logging
+import datetime
+import typing
+
+from ..abc.service import Service
+from ..timer import Timer
+from .cron import Cron
+
+#
+
+L = logging.getLogger(__name__)
+
+#
+
+
+class SchedulerService(Service):
+	"""
+	Scheduler of periodic jobs, either in regular intervals or by a cron expression.
+
+	Run times are derived from the previous planned run time, not from the time when the previous run finished,
+	so they don't drift.
+	Each job can be given a `jitter`: a random offset from `[0, jitter)` seconds, drawn once for the job, is added to every its run time.
+	This spreads the periodic load of many jobs and many processes that would otherwise run at the same instant.
+
+	A job doesn't run concurrently with itself; if its previous run is still in progress, the run is skipped.
+	If the application was blocked and missed several runs, only one of them is executed.
+
+	Examples:
+
+	```python
+	from asab.scheduler import Module
+	app.add_module(Module)
+	scheduler_svc = app.get_service("asab.SchedulerService")
+
+	scheduler_svc.interval(self.refresh_cache, 60, jitter=10)
+	scheduler_svc.cron("30 3 * * *", self.cleanup, jitter=300)
+	```
+	"""
+
+	def __init__(self, app, service_name="asab.SchedulerService"):
+		super().__init__(app, service_name)
+		self.Jobs = set()
+
+
+	async def finalize(self, app):
+		for job in list(self.Jobs):
+			job.cancel()
+
+
+	def interval(self, handler, interval: float, *args, jitter: float = 0.0, name: typing.Optional[str] = None) -> "Job":
+		"""
+		Run `handler(*args)` every `interval` seconds; the first run is after one interval.
+
+		Args:
+			handler: A coroutine function or a function.
+			interval: Period in seconds.
+			jitter: Maximum random offset of run times in seconds.
+			name: Name of the job used in the log, the name of the handler by default.
+
+		Returns:
+			The scheduled job, it can be cancelled by `Job.cancel()`.
+		"""
+		if interval <= 0:
+			raise ValueError("Interval must be a positive number.")
+		job = IntervalJob(self, handler, args, interval, jitter, name)
+		job.schedule()
+		return job
+
+
+	def cron(self, expression: str, handler, *args, jitter: float = 0.0, name: typing.Optional[str] = None, timezone: datetime.tzinfo = datetime.timezone.utc) -> "Job":
+		"""
+		Run `handler(*args)` at times given by the cron expression, see `asab.scheduler.Cron`.
+
+		Args:
+			expression: The cron expression, e.g. `*/5 * * * *`.
+			handler: A coroutine function or a function.
+			jitter: Maximum random offset of run times in seconds.
+			name: Name of the job used in the log, the name of the handler by default.
+			timezone: The time zone of the cron expression, UTC by default.
+
+		Returns:
+			The scheduled job, it can be cancelled by `Job.cancel()`.
+		"""
+		job = CronJob(self, handler, args, Cron(expression), timezone, jitter, name)
+		job.schedule()
+		return job
+
+
+class Job(abc.ABC):
+	"""
+	A periodic job of the Scheduler Service.
+
+	Attributes:
+		Name (str): Name of the job.
+		Offset (float): The random offset of run times in seconds.
+		Runs (int): Number of started runs.
+		Skipped (int): Number of runs skipped, because the previous run was still in progress.
+	"""
+
+	def __init__(self, scheduler, handler, args, jitter, name):
+		self.Scheduler = scheduler
+		self.App = scheduler.App
+		self.Handler = handler
+		self.Args = args
+		self.Name = name if name is not None else getattr(handler, "__qualname__", str(handler))
+		self.Offset = random.uniform(0, jitter) if jitter > 0 else 0.0
+
+		self.Runs = 0
+		self.Skipped = 0
+		self.Running = False
+
+		self.Timer = Timer(self.App, self._on_timer)
+		scheduler.Jobs.add(self)
+
+
+	def cancel(self):
+		"""
+		Stop the job, a run in progress is not interrupted.
+		"""
+		self.Timer.stop()
+		self.Scheduler.Jobs.discard(self)
+
+
+	@abc.abstractmethod
+	def schedule(self):
+		"""
+		Plan the next run of the job.
+		"""
+		pass
+
+
+	async def _on_timer(self):
+		self.schedule()
+
+		if self.Running:
+			self.Skipped += 1
+			L.warning("Scheduled job skipped, the previous run is still in progress", struct_data={'job': self.Name})
+			return
+
+		self.Running = True
+		self.Runs += 1
+		try:
+			result = self.Handler(*self.Args)
+			if inspect.isawaitable(result):
+				await result
+		except Exception:
+			L.exception("Error in the scheduled job", struct_data={'job': self.Name})
+		finally:
+			self.Running = False
+
+
+class IntervalJob(Job):
+
+	def __init__(self, scheduler, handler, args, interval, jitter, name):
+		super().__init__(scheduler, handler, args, jitter, name)
+		self.Interval = interval
+		# The planned loop time of the next run, without the offset
+		self.PlannedAt = self.App.Loop.time()
+
+
+	def schedule(self):
+		now = self.App.Loop.time()
+		self.PlannedAt += self.Interval
+		if self.PlannedAt + self.Offset < now:
+			# Runs were missed, continue with the next one in the future
+			missed = (now - self.PlannedAt - self.Offset) // self.Interval + 1
+			self.PlannedAt += missed * self.Interval
+		self.Timer.restart(self.PlannedAt + self.Offset - now)
+
+
+class CronJob(Job):
+
+	def __init__(self, scheduler, handler, args, cron, timezone, jitter, name):
+		super().__init__(scheduler, handler, args, jitter, name)
+		self.Cron = cron
+		self.Timezone = timezone
+		# The planned wall-clock time of the next run, without the offset
+		self.PlannedAt = None
+
+
+	def schedule(self):
+		now = datetime.datetime.now(self.Timezone)
+		after = now - datetime.timedelta(seconds=self.Offset)
+		if self.PlannedAt is not None and self.PlannedAt > after:
+			# The timer triggered a bit earlier than the wall clock reached the planned time
+			after = self.PlannedAt
+		self.PlannedAt = self.Cron.next(after)
+		delay = (self.PlannedAt - now).total_seconds() + self.Offset
+		self.Timer.restart(max(0.0, delay))
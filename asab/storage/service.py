@@ -29,6 +29,9 @@ class StorageServiceABC(asab.Service):
 
 	"""
 
+	# Webhooks are called in the Proactor thread
+	Dependencies = ("asab.ProactorService",)
+
 	def __init__(self, app, service_name):
 		super().__init__(app, service_name)
 		self.WebhookURIs = asab.Config.get("asab:storage:changestream", "webhook_uri", fallback="") or None
@@ -139,7 +139,7 @@ class UpsertorABC(abc.ABC):
 		json_dump = asab.web.rest.json.JSONDumper(pretty=False)(data)
 		for uri in self.Storage.WebhookURIs:
 			self.WebhookResponseData[uri] = await self.Storage.ProactorService.execute(
-				self._webhook, json_dump, uri, self.Storage.WebhookAuth)
+				self._webhook, json_dump, uri, self.Storage.WebhookAuth, executor="webhook")
 
 
 
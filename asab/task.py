@@ -1,8 +1,13 @@
 import logging
 import asyncio
+import collections
+import heapq
+import itertools
+import sys
 import typing
 
 import asab
+from .config import Configurable
 
 #
 
@@ -18,14 +23,21 @@ class TaskService(asab.Service):
 
 	The result of the task is collected (and discarded) automatically.
 	When the task raises Exception, it will be printed to the log.
+
+	Tasks scheduled before the service is started (i.e. before the application init-time) are started when the service starts.
+	The completion of each task is handled by its done callback, so the cost of scheduling and collecting a task does not depend on the number of pending tasks.
 	"""
 
 	def __init__(self, app, service_name="asab.TaskService"):
 		super().__init__(app, service_name)
 
-		self.NewTasks = asyncio.Queue()
+		self.NewTasks = []
 		self.PendingTasks = set()
-		self.Main = None
+		self.Started = False
+		self.Pools = {}
+
+		# Pending task -> (loop time when started, the place where it has been scheduled)
+		self.TaskInfo = {}
 
 
 	async def initialize(self, app):
@@ -33,54 +45,32 @@ class TaskService(asab.Service):
 
 
 	def start(self):
-		assert self.Main is None
-		self.Main = asyncio.ensure_future(self.main())
-		self.Main.add_done_callback(self._main_task_exited)
+		assert not self.Started
+		self.Started = True
 
+		new_tasks = self.NewTasks
+		self.NewTasks = []
+		for task, origin in new_tasks:
+			self._start_task(task, origin)
 
-	async def finalize(self, app):
-		if self.Main is not None:
+		for pool in self.Pools.values():
+			pool._dispatch()
 
-			task = self.Main
-			self.Main = None
 
-			task.cancel()
-			try:
-				await task
-			except asyncio.CancelledError:
-				pass
-			except Exception as e:
-				L.exception("Error '{}' during task service:".format(e))
+	async def finalize(self, app):
+		for pool in self.Pools.values():
+			pool._discard_queued()
 
-		for task in list(self.PendingTasks):
+		pending_tasks = list(self.PendingTasks)
+		for task in pending_tasks:
 			task.cancel()
-			try:
-				await task
-				self.PendingTasks.remove(task)
-			except asyncio.CancelledError:
-				self.PendingTasks.remove(task)
-			except Exception as e:
-				L.exception("Error '{}' during task service:".format(e))
 
+		# Errors are logged by the done callback of each task
+		await asyncio.gather(*pending_tasks, return_exceptions=True)
 
-		total_tasks = len(self.PendingTasks) + self.NewTasks.qsize()
+		total_tasks = len(self.PendingTasks) + len(self.NewTasks)
 		if total_tasks > 0:
-			L.warning("{}+{} pending and incomplete tasks".format(len(self.PendingTasks), self.NewTasks.qsize()))
-
-
-	def _main_task_exited(self, ctx):
-		if self.Main is None:
-			return
-		try:
-			self.Main.result()
-		except asyncio.CancelledError:
-			pass
-		except Exception as e:
-			L.exception("Error '{}' during task service:".format(e))
-
-		self.Main = None
-		L.warning("Main task exited unexpectedly, restarting ...")
-		self.start()
+			L.warning("{}+{} pending and incomplete tasks".format(len(self.PendingTasks), len(self.NewTasks)))
 
 
 	def schedule(self, *tasks):
@@ -93,8 +83,9 @@ class TaskService(asab.Service):
 		app.TaskService.schedule(self._start())
 		```
 		"""
+		origin = _caller_origin()
 		for task in tasks:
-			self.NewTasks.put_nowait(task)
+			self._schedule(task, origin)
 
 
 	def schedule_threadsafe(self, *tasks):
@@ -108,8 +99,9 @@ class TaskService(asab.Service):
 		app.TaskService.schedule_threadsafe(self._start())
 		```
 		"""
+		origin = _caller_origin()
 		for task in tasks:
-			self.App.Loop.call_soon_threadsafe(self.NewTasks.put_nowait, task)
+			self.App.Loop.call_soon_threadsafe(self._schedule, task, origin)
 
 
 	def run_forever(self, *async_functions):
@@ -132,40 +124,345 @@ class TaskService(asab.Service):
 					await ...
 		```
 		"""
+		origin = _caller_origin()
 		for async_fn in async_functions:
-			self.NewTasks.put_nowait(
-				forever(async_fn)
+			self._schedule(forever(async_fn), origin)
+
+
+	def create_pool(self, name: str, config: typing.Optional[dict] = None):
+		"""
+		Create a named task pool with bounded concurrency.
+
+		The pool is configured from the `[asab:task:pool:<name>]` configuration section, overridden by `config`.
+		See `TaskPool` for available options.
+
+		Args:
+			name: Name of the pool.
+			config: Configuration options of the pool.
+
+		Returns:
+			The `TaskPool` object.
+
+		Examples:
+
+		```python
+		pool = app.TaskService.create_pool("webhooks", config={"max_concurrency": 5})
+		for url in urls:
+			pool.schedule(self.call_webhook(url))
+		await pool.join()
+		```
+		"""
+		if name in self.Pools:
+			raise RuntimeError("Task pool '{}' already exists".format(name))
+
+		pool = TaskPool(self, name, config=config)
+		self.Pools[name] = pool
+		return pool
+
+
+	def get_pool(self, name: str):
+		"""
+		Get the task pool by its name.
+
+		Returns:
+			The `TaskPool` object or `None` if the pool does not exist.
+		"""
+		return self.Pools.get(name)
+
+
+	def get_tasks_info(self, stack_limit: int = 5, coroutine: typing.Optional[str] = None) -> dict:
+		"""
+		Describe all live asyncio tasks of the application loop, not only those scheduled by the Task Service.
+
+		For each task, it reports its name, the coroutine, the current await point (the innermost `stack_limit` frames of the await chain)
+		and, for tasks scheduled by the Task Service, the age in seconds and the place in the code where the task has been scheduled.
+		Tasks are counted by the coroutine name to help find leaked or stuck tasks.
+
+		Args:
+			stack_limit: The maximum number of frames reported for each task.
+			coroutine: Describe and count only tasks of the coroutine with this name.
+
+		Returns:
+			Dictionary with `count`, `coroutines` (coroutine name -> count) and `tasks` (list of task descriptions, the oldest first).
+		"""
+		now = self.App.Loop.time()
+		coroutines = collections.Counter()
+		tasks = []
+
+		for task in asyncio.all_tasks(self.App.Loop):
+			coro = task.get_coro()
+			coro_name = getattr(coro, '__qualname__', None) or type(coro).__qualname__
+			if coroutine is not None and coro_name != coroutine:
+				continue
+			coroutines[coro_name] += 1
+
+			task_info = {
+				"name": task.get_name(),
+				"coroutine": coro_name,
+				"stack": _await_stack(coro, stack_limit),
+			}
+
+			started_at, origin = self.TaskInfo.get(task, (None, None))
+			if started_at is not None:
+				task_info["age"] = round(now - started_at, 3)
+
+			if origin is not None:
+				task_info["origin"] = _format_origin(origin)
+			else:
+				# Available when the loop runs in the debug mode
+				source_traceback = getattr(task, '_source_traceback', None)
+				if source_traceback:
+					frame = source_traceback[-1]
+					task_info["origin"] = "{}:{} {}".format(frame.filename, frame.lineno, frame.name)
+
+			tasks.append(task_info)
+
+		tasks.sort(key=lambda t: t.get("age", -1), reverse=True)
+
+		return {
+			"count": len(tasks),
+			"coroutines": dict(coroutines.most_common()),
+			"tasks": tasks,
+		}
+
+
+	def _schedule(self, task, origin=None):
+		if self.Started:
+			self._start_task(task, origin)
+		else:
+			self.NewTasks.append((task, origin))
+
+
+	def _start_task(self, task, origin=None):
+		if isinstance(task, typing.Coroutine):
+			task = self.App.Loop.create_task(task)
+		self.PendingTasks.add(task)
+		self.TaskInfo[task] = (self.App.Loop.time(), origin)
+		task.add_done_callback(self._on_task_done)
+		return task
+
+
+	def _on_task_done(self, task):
+		self.PendingTasks.discard(task)
+		self.TaskInfo.pop(task, None)
+
+		if not task.cancelled():
+			try:
+				exc = task.exception()
+				if exc is not None:
+					L.exception("Error during task:", exc_info=exc)
+			except Exception:
+				L.exception("Error during task (no stack trace available)")
+
+		self.App.PubSub.publish("TaskService.task_done!", task)
+
+
+class TaskPool(Configurable):
+	"""
+	Task pool runs scheduled coroutines with the limited concurrency.
+
+	Coroutines wait in the queue until there is a free slot in the pool.
+	The queue is FIFO or, with `queue=priority`, the coroutine with the lowest `priority` number is started first.
+	When `rate` is set, the pool starts at most `rate` coroutines per second (with the burst of `burst` coroutines).
+
+	Tasks started by the pool are managed by `TaskService`, i.e. their errors are logged and they are cancelled at the application exit.
+
+	```ini
+	[asab:task:pool:webhooks]
+	max_concurrency=5
+	queue=priority
+	rate=20
+	```
+
+	When `asab.MetricsService` is available, the pool exports the queue depth and the time coroutines wait in the queue.
+	"""
+
+	ConfigDefaults = {
+		'max_concurrency': 10,
+		'queue': 'fifo',  # or 'priority'
+		'rate': 0,  # Tasks per second, 0 means unlimited
+		'burst': 1,
+	}
+
+
+	def __init__(self, task_service, name, config=None):
+		super().__init__(config_section_name="asab:task:pool:{}".format(name), config=config)
+		self.TaskService = task_service
+		self.Loop = task_service.App.Loop
+		self.Name = name
+
+		self.MaxConcurrency = self.Config.getint('max_concurrency')
+		if self.MaxConcurrency <= 0:
+			raise ValueError("Task pool '{}' requires positive 'max_concurrency'".format(name))
+
+		queue = self.Config['queue'].lower()
+		if queue == 'priority':
+			self.Queue = []
+			self._push = heapq.heappush
+			self._pop = heapq.heappop
+		elif queue == 'fifo':
+			self.Queue = collections.deque()
+			self._push = collections.deque.append
+			self._pop = collections.deque.popleft
+		else:
+			raise ValueError("Unknown queue type '{}' of the task pool '{}'".format(queue, name))
+		self._sequence = itertools.count()
+
+		self.Rate = self.Config.getfloat('rate')
+		self.Burst = max(self.Config.getfloat('burst'), 1.0)
+		self.Tokens = self.Burst
+		self._refilled_at = self.Loop.time()
+		self._wakeup = None
+
+		self.Running = set()
+		self._idle = asyncio.Event()
+		self._idle.set()
+
+		self.QueueGauge = None
+		metrics_svc = task_service.App.get_service("asab.MetricsService")
+		if metrics_svc is not None:
+			tags = {"pool": name}
+			self.QueueGauge = metrics_svc.create_gauge(
+				"task_pool",
+				tags=tags,
+				init_values={"queued": 0, "running": 0},
+				help="Number of queued and running tasks of the task pool.",
+			)
+			self.StartedCounter = metrics_svc.create_counter(
+				"task_pool.started",
+				tags=tags,
+				init_values={"started": 0},
+				help="Number of tasks started by the task pool.",
 			)
+			self.WaitCounter = metrics_svc.create_counter(
+				"task_pool.wait",
+				tags=tags,
+				init_values={"wait_time": 0.0},
+				help="The total waiting time of started tasks in the queue.",
+				unit="seconds",
+			)
+			self.WaitMax = metrics_svc.create_aggregation_counter(
+				"task_pool.wait.max",
+				tags=tags,
+				init_values={"wait_time": 0.0},
+				help="The longest waiting time of a task in the queue.",
+				unit="seconds",
+			)
+			task_service.App.PubSub.subscribe("Metrics.flush!", self._on_flushing_event)
+
 
+	def schedule(self, *coroutines, priority: int = 0):
+		"""
+		Enqueue a coroutine (or coroutines) for the execution in the pool.
+
+		Args:
+			priority: Lower number is started sooner; applicable only to the pool with the `priority` queue.
+		"""
+		now = self.Loop.time()
+		origin = _caller_origin()
+		for coro in coroutines:
+			self._push(self.Queue, (priority, next(self._sequence), now, coro, origin))
 
-	async def main(self):
-		while True:
+		if len(self.Queue) > 0:
+			self._idle.clear()
+		self._dispatch()
 
-			while self.NewTasks.qsize() > 0:
-				task = self.NewTasks.get_nowait()
-				if isinstance(task, typing.Coroutine):
-					task = asyncio.create_task(task)
-				self.PendingTasks.add(task)
 
-			if len(self.PendingTasks) == 0:
-				# Block until a new task is scheduled
-				task = await self.NewTasks.get()
-				if isinstance(task, typing.Coroutine):
-					task = asyncio.create_task(task)
-				self.PendingTasks.add(task)
+	async def join(self):
+		"""
+		Wait until all enqueued and running tasks of the pool are finished.
+		"""
+		await self._idle.wait()
+
+
+	def _dispatch(self):
+		if not self.TaskService.Started:
+			return
 
+		while len(self.Queue) > 0 and len(self.Running) < self.MaxConcurrency:
+			now = self.Loop.time()
+
+			if self.Rate > 0:
+				self.Tokens = min(self.Burst, self.Tokens + (now - self._refilled_at) * self.Rate)
+				self._refilled_at = now
+				if self.Tokens < 1.0:
+					if self._wakeup is None:
+						self._wakeup = self.Loop.call_later((1.0 - self.Tokens) / self.Rate, self._on_wakeup)
+					return
+				self.Tokens -= 1.0
+
+			_, _, enqueued_at, coro, origin = self._pop(self.Queue)
+			if self.QueueGauge is not None:
+				wait_time = now - enqueued_at
+				self.StartedCounter.add("started", 1)
+				self.WaitCounter.add("wait_time", wait_time)
+				self.WaitMax.set("wait_time", wait_time)
+
+			task = self.TaskService._start_task(coro, origin)
+			self.Running.add(task)
+			task.add_done_callback(self._on_task_done)
+
+
+	def _on_wakeup(self):
+		self._wakeup = None
+		self._dispatch()
+
+
+	def _on_task_done(self, task):
+		self.Running.discard(task)
+		self._dispatch()
+		if len(self.Queue) == 0 and len(self.Running) == 0:
+			self._idle.set()
+
+
+	def _discard_queued(self):
+		if self._wakeup is not None:
+			self._wakeup.cancel()
+			self._wakeup = None
+
+		if len(self.Queue) > 0:
+			L.warning("Discarding queued tasks of the task pool", struct_data={'pool': self.Name, 'queued': len(self.Queue)})
+		while len(self.Queue) > 0:
+			_, _, _, task, _ = self._pop(self.Queue)
+			if isinstance(task, typing.Coroutine):
+				task.close()
 			else:
-				done, self.PendingTasks = await asyncio.wait(self.PendingTasks, timeout=1.0)
-				for task in done:
-					try:
-						await task
-					except Exception:
-						try:
-							exc = task.exception()
-							L.exception("Error during task:", exc_info=exc)
-						except Exception:
-							L.exception("Error during task (no stack trace available)")
-					self.App.PubSub.publish("TaskService.task_done!", task)
+				task.cancel()
+
+		if len(self.Running) == 0:
+			self._idle.set()
+
+
+	def _on_flushing_event(self, message_type):
+		self.QueueGauge.set("queued", len(self.Queue))
+		self.QueueGauge.set("running", len(self.Running))
+
+
+def _caller_origin():
+	# The caller of the public scheduling method, e.g. the code that called `TaskService.schedule()`;
+	# it is formatted only by `get_tasks_info()`, so the scheduling stays cheap
+	try:
+		frame = sys._getframe(2)
+	except ValueError:
+		return None
+	return (frame.f_code, frame.f_lineno)
+
+
+def _format_origin(origin):
+	code, lineno = origin
+	return "{}:{} {}".format(code.co_filename, lineno, code.co_name)
+
+
+def _await_stack(coro, limit):
+	# Follow the chain of awaited coroutines and generators to the current await point
+	frames = []
+	while coro is not None:
+		frame = getattr(coro, 'cr_frame', None) or getattr(coro, 'gi_frame', None) or getattr(coro, 'ag_frame', None)
+		if frame is None:
+			break
+		frames.append("{}:{} {}".format(frame.f_code.co_filename, frame.f_lineno, frame.f_code.co_name))
+		coro = getattr(coro, 'cr_await', None) or getattr(coro, 'gi_yieldfrom', None) or getattr(coro, 'ag_await', None)
+	return frames[-limit:]
 
 
 async def forever(async_fn):
@@ -1,4 +1,3 @@
-import asyncio
 import typing
 
 
@@ -10,10 +9,14 @@ class Timer(object):
 	and optionally repeating in regular intervals after that.
 	The timer object is initialized as stopped.
 
+	Timers are driven by the application's timing wheel (`asab.TimingWheelService`),
+	so starting, stopping and restarting a timer is cheap even with many thousands of timers.
+	The timer triggers with the precision of the wheel resolution, see `[asab:timer] resolution`.
+	The handler is executed as a task by the Task Service.
+
 	Attributes:
 		App (asab.Application): Reference to the ASAB application.
 		Handler (asyncio.Coroutine | asyncio.Task): A coroutine or future that will be called when a timer triggers.
-		Task (asyncio.Future | asyncio.Task | None): A future that represents the timer task.
 		AutoRestart (bool): If `True` then a timer will be automatically restarted after triggering.
 
 	Examples:
@@ -30,17 +33,27 @@ class Timer(object):
 	1. The timer will trigger a message publishing at every second.
 	2. This function has to be a coroutine.
 
-	!!! note
-		The implementation idea was borrowed from [StackOverflow discussion](https://stackoverflow.com/questions/45419723/python-timer-with-asyncio-coroutine).
 	"""
 
 	def __init__(self, app, handler, autorestart=False):
 		self.App = app
 		self.Handler = handler
-		self.Task = None
 		self.AutoRestart = autorestart
+		self.Timeout = None
+
+		# Managed by the timing wheel
+		self._wheel_slot = None
+		self._wheel_deadline = None
+
+
+	@property
+	def Task(self):
+		"""
+		REMOVED. The timer is driven by the timing wheel, it has no task while waiting.
 
-		app.PubSub.subscribe("Application.stop!", self._on_stop)
+		Use `is_started()` and `stop()` instead.
+		"""
+		raise AttributeError("Property `Timer.Task` has been removed. Use `Timer.is_started()` and `Timer.stop()` instead.")
 
 
 	def start(self, timeout: typing.Union[int, float]):
@@ -55,16 +68,16 @@ class Timer(object):
 		"""
 		if self.is_started():
 			raise RuntimeError("Timer is already started")
-		self.Task = asyncio.ensure_future(self._job(timeout))
+		self.Timeout = timeout
+		self.App.TimingWheelService.add(self, timeout)
 
 
 	def stop(self):
 		"""
 		Stop the timer.
 		"""
-		if self.Task is not None:
-			self.Task.cancel()
-			self.Task = None
+		if self._wheel_slot is not None:
+			self.App.TimingWheelService.remove(self)
 
 
 	def restart(self, timeout: typing.Union[int, float]):
@@ -87,17 +100,11 @@ class Timer(object):
 		Returns:
 			`True` if the `Timer` has started.
 		"""
-		return self.Task is not None
+		return self._wheel_slot is not None
 
 
-	async def _job(self, timeout):
-		await asyncio.sleep(timeout)
-		self.Task = None
+	def _on_timer(self):
+		# Called by the timing wheel when the timer is due
 		if self.AutoRestart:
-			self.start(timeout)
-		await self.Handler()
-
-
-	def _on_stop(self, message_type, n):
-		# This is to ensure timer stop on application exit
-		self.stop()
+			self.start(self.Timeout)
+		self.App.TaskService.schedule(self.Handler())
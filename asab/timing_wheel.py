@@ -0,0 +1,222 @@
+import math
+import logging
+
+from .abc.service import Service
+from .config import Config
+
+#
+
+L = logging.getLogger(__name__)
+
+#
+
+# Every level of the wheel has 64 slots, the slot of the level k spans 64^k ticks
+SLOT_BITS = 6
+SLOTS = 1 << SLOT_BITS
+SLOT_MASK = SLOTS - 1
+LEVELS = 4
+
+
+class TimingWheelService(Service):
+	"""
+	Hierarchical timing wheel that drives `asab.Timer` objects.
+
+	All timers of the application share one event loop callback, which is scheduled only when a timer is due
+	or when timers from the coarser level of the wheel have to be moved to the finer one.
+	Starting, stopping and restarting a timer is O(1) and it doesn't allocate any task.
+
+	The time is divided into ticks of `resolution` seconds; a timer is triggered at the first tick after its timeout elapses,
+	i.e. up to `resolution` seconds late.
+	The level 0 of the wheel covers 64 ticks, each next level covers 64 times more;
+	timers further in the future than the top level covers are moved down in several steps.
+
+	```ini
+	[asab:timer]
+	resolution=10ms
+	```
+	"""
+
+	def __init__(self, app, service_name="asab.TimingWheelService"):
+		super().__init__(app, service_name)
+		self.Loop = app.Loop
+
+		self.Resolution = Config.getseconds("asab:timer", "resolution", fallback=0.01)
+		if self.Resolution <= 0:
+			raise ValueError("Timer resolution must be a positive number.")
+
+		self.BaseTime = self.Loop.time()
+		self.Tick = 0  # The last processed tick
+		self.Count = 0  # Number of timers in the wheel
+
+		# Each slot is a dictionary used as an ordered set of timers
+		self.Wheel = [[dict() for _ in range(SLOTS)] for _ in range(LEVELS)]
+
+		self._wakeup = None
+		self._wakeup_tick = None
+
+		app.PubSub.subscribe("Application.stop!", self._on_stop)
+
+
+	def add(self, timer, timeout: float):
+		"""
+		Insert the timer into the wheel, it will be triggered after `timeout` seconds.
+		"""
+		now = self._current_tick()
+		if self.Count == 0:
+			# The wheel is empty, skip the ticks that passed since it was idle
+			self.Tick = max(self.Tick, now)
+
+		deadline = math.ceil((self.Loop.time() + timeout - self.BaseTime) / self.Resolution)
+		self._schedule(self._insert(timer, max(deadline, self.Tick + 1)))
+		self.Count += 1
+
+
+	def remove(self, timer):
+		"""
+		Remove the timer from the wheel.
+		"""
+		slot = timer._wheel_slot
+		if slot is None:
+			return
+		del slot[timer]
+		timer._wheel_slot = None
+		self.Count -= 1
+
+
+	def _current_tick(self):
+		return int((self.Loop.time() - self.BaseTime) / self.Resolution)
+
+
+	def _insert(self, timer, deadline):
+		# Returns the tick, in which the wheel has to process the slot of the timer
+		timer._wheel_deadline = deadline
+		delta = deadline - self.Tick
+
+		if delta < SLOTS:
+			slot = self.Wheel[0][deadline & SLOT_MASK]
+			due = deadline
+
+		else:
+			for level in range(1, LEVELS):
+				shift = SLOT_BITS * level
+				if delta < (1 << (shift + SLOT_BITS)):
+					block = deadline >> shift
+					break
+			else:
+				# Beyond the range of the wheel, park the timer in the last reachable slot of the top level
+				shift = SLOT_BITS * level
+				block = (self.Tick >> shift) + SLOTS - 1
+
+			slot = self.Wheel[level][block & SLOT_MASK]
+			due = block << shift
+
+		slot[timer] = None
+		timer._wheel_slot = slot
+		return due
+
+
+	def _schedule(self, tick):
+		if self._wakeup is not None:
+			if self._wakeup_tick <= tick:
+				return
+			self._wakeup.cancel()
+
+		self._wakeup_tick = tick
+		self._wakeup = self.Loop.call_at(self.BaseTime + tick * self.Resolution, self._on_wakeup)
+
+
+	def _next_event(self):
+		# The nearest tick with a non-empty slot of the level 0 or with a cascade of a non-empty slot of a higher level
+		best = None
+
+		level0 = self.Wheel[0]
+		for tick in range(self.Tick + 1, self.Tick + SLOTS):
+			if len(level0[tick & SLOT_MASK]) > 0:
+				best = tick
+				break
+
+		for level in range(1, LEVELS):
+			shift = SLOT_BITS * level
+			current = self.Tick >> shift
+			if best is not None and ((current + 1) << shift) >= best:
+				# Higher levels cascade even later
+				break
+			slots = self.Wheel[level]
+			for block in range(current + 1, current + SLOTS + 1):
+				if len(slots[block & SLOT_MASK]) > 0:
+					if best is None or (block << shift) < best:
+						best = block << shift
+					break
+
+		return best
+
+
+	def _on_wakeup(self):
+		# The loop calls this handler when its time is due, even if the clock is a bit behind the tick boundary
+		target = max(self._current_tick(), self._wakeup_tick)
+		self._wakeup = None
+		self._wakeup_tick = None
+
+		while self.Count > 0:
+			tick = self._next_event()
+			if tick > target:
+				break
+			# Ticks in between have nothing to process
+			self.Tick = tick
+			self._cascade()
+			self._fire()
+
+		self.Tick = max(self.Tick, target)
+
+		if self.Count > 0:
+			self._schedule(self._next_event())
+
+
+	def _cascade(self):
+		tick = self.Tick
+		for level in range(1, LEVELS):
+			if tick & ((1 << (SLOT_BITS * level)) - 1) != 0:
+				# Not at the boundary of this level
+				return
+
+			index = (tick >> (SLOT_BITS * level)) & SLOT_MASK
+			slot = self.Wheel[level][index]
+			if len(slot) == 0:
+				continue
+
+			self.Wheel[level][index] = dict()
+			for timer in slot:
+				self._insert(timer, timer._wheel_deadline)
+
+
+	def _fire(self):
+		index = self.Tick & SLOT_MASK
+		slot = self.Wheel[0][index]
+		if len(slot) == 0:
+			return
+
+		self.Wheel[0][index] = dict()
+		for timer in slot:
+			timer._wheel_slot = None
+			self.Count -= 1
+			try:
+				timer._on_timer()
+			except Exception:
+				L.exception("Error in the timer")
+
+
+	def _on_stop(self, message_type, n):
+		# This is to ensure timers stop on application exit
+		for level in self.Wheel:
+			for index, slot in enumerate(level):
+				if len(slot) == 0:
+					continue
+				level[index] = dict()
+				for timer in slot:
+					timer._wheel_slot = None
+
+		self.Count = 0
+		if self._wakeup is not None:
+			self._wakeup.cancel()
+			self._wakeup = None
+			self._wakeup_tick = None
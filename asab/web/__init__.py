@@ -1,10 +1,29 @@
 import typing
-import aiohttp.web
+import importlib
 
 from ..abc import Module
-from .container import WebContainer
-from .websocket import WebSocketFactory
-from .staticdir import StaticDirProvider
+
+if typing.TYPE_CHECKING:
+	import aiohttp.web
+	from .container import WebContainer
+	from .websocket import WebSocketFactory
+	from .staticdir import StaticDirProvider
+
+# aiohttp is imported on the first use of these, not by `import asab.web`
+_LAZY_IMPORTS = {
+	'WebContainer': '.container',
+	'WebSocketFactory': '.websocket',
+	'StaticDirProvider': '.staticdir',
+}
+
+
+def __getattr__(name):
+	module_name = _LAZY_IMPORTS.get(name)
+	if module_name is None:
+		raise AttributeError("module '{}' has no attribute '{}'".format(__name__, name))
+	value = getattr(importlib.import_module(module_name, __name__), name)
+	globals()[name] = value
+	return value
 
 
 class Module(Module):
@@ -19,7 +38,7 @@ class Module(Module):
 		self.service = WebService(app, "asab.WebService")
 
 
-def create_web_server(app, section: str = "web", config: typing.Optional[dict] = None, api: bool = False) -> aiohttp.web.UrlDispatcher:
+def create_web_server(app, section: str = "web", config: typing.Optional[dict] = None, api: bool = False) -> "aiohttp.web.UrlDispatcher":
 	"""
 Build the web server with the specified configuration.
 
@@ -46,6 +65,8 @@ class MyApplication(asab.Application):
 
 ```
 	"""
+	from .container import WebContainer
+
 	app.add_module(Module)
 	websvc = app.get_service("asab.WebService")
 	container = WebContainer(websvc, section, config=config)
@@ -10,7 +10,8 @@ class AccessLogger(aiohttp.abc.AbstractAccessLogger):
 		super().__init__(logger, log_format)
 		self.App = logger.App
 		self.WebService = self.App.get_service("asab.WebService")
-		self.web_metrics_config = Config.getboolean("asab:metrics", "web_requests_metrics", fallback=False)
+		# The access logger is created for every connection
+		self.web_metrics_config = Config.snapshot().getboolean("asab:metrics", "web_requests_metrics", fallback=False)
 
 	def log(self, request, response, time):
 		struct_data = {
@@ -37,6 +37,8 @@ class AuthService(Service):
 	Provides authentication and authorization of incoming requests.
 	"""
 
+	Dependencies = ("asab.TenantService", "asab.DiscoveryService")
+
 	def __init__(self, app, service_name="asab.AuthService"):
 		super().__init__(app, service_name)
 
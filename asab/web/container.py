@@ -157,6 +157,8 @@ class WebContainer(Configurable):
 				self.WebAppRunner,
 				host=addr, port=port, backlog=self.BackLog,
 				ssl_context=ssl_context,
+				# Prefork workers bind the same address, the kernel balances connections among them
+				reuse_port=True if getattr(app, "WorkerId", None) is not None else None,
 			)
 			try:
 				await site.start()
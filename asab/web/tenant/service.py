@@ -20,6 +20,8 @@ class TenantService(Service):
 	Provides set of known tenants and tenant extraction for web requests.
 	"""
 
+	Dependencies = ("asab.DiscoveryService", "asab.ZooKeeperService")
+
 	def __init__(
 		self,
 		app,
@@ -0,0 +1,108 @@
+import os
+import logging
+
+import kazoo.recipe.watchers
+
+from ..abc.service import Service
+from ..config import Config
+from ..log import LOG_NOTICE
+from .container import ZooKeeperContainer
+
+#
+
+L = logging.getLogger(__name__)
+
+#
+
+
+class ConfigWatchService(Service):
+	"""
+	Watch ZooKeeper nodes included in the configuration and apply their changes without a restart.
+
+	Every node included by `[general] include=zookeeper://...` is watched.
+	When it changes, only this node is parsed again, `asab.Config` is updated
+	and `Config.changed!` is published with the changed options, section -> option -> (old value, new value)
+	(raw values, before interpolation; `None` means that the option is not set).
+
+	The service is created by the application when `[general] config_watch` is enabled.
+
+	Example:
+		```python
+		def __init__(self, app):
+			app.PubSub.subscribe("Config.changed!", self._on_config_changed)
+
+		def _on_config_changed(self, message_type, diff):
+			if "timeout" in diff.get("my:section", {}):
+				self.Timeout = asab.Config.getseconds("my:section", "timeout")
+		```
+	"""
+
+	Dependencies = ("asab.ZooKeeperService",)
+
+	def __init__(self, app, service_name="asab.ConfigWatchService"):
+		super().__init__(app, service_name)
+
+		zksvc = app.get_service("asab.ZooKeeperService")
+
+		self.Containers = {}  # ZooKeeper servers -> (container, list of include URLs)
+		self.Watches = {}  # include URL -> DataWatch
+		self.Stopped = False
+
+		for url, (servers, path) in Config.get_zookeeper_includes().items():
+			if servers not in self.Containers:
+				container = ZooKeeperContainer(zksvc, z_path="zookeeper://{}{}".format(servers, os.path.dirname(path)))
+				self.Containers[servers] = (container, [])
+			self.Containers[servers][1].append(url)
+
+		app.PubSub.subscribe("ZooKeeperContainer.state/CONNECTED!", self._on_zk_connected)
+
+
+	async def finalize(self, app):
+		self.Stopped = True
+
+
+	async def _on_zk_connected(self, event_name, zkcontainer):
+		for container, urls in self.Containers.values():
+			if container != zkcontainer:
+				continue
+
+			for url in urls:
+				if url in self.Watches:
+					# The watch is restored by Kazoo after a reconnect
+					continue
+				self.Watches[url] = await zkcontainer.ProactorService.execute(
+					self._install_watch, zkcontainer, url,
+					executor="zookeeper"
+				)
+
+
+	def _install_watch(self, zkcontainer, url):
+		_, path = Config.get_zookeeper_includes()[url]
+
+		def on_change(data, stat):
+			if self.Stopped:
+				# Returning False removes the watch
+				return False
+			if data is None:
+				L.warning("Included configuration node doesn't exist, the configuration is kept.", struct_data={'url': url})
+				return
+			self.App.Loop.call_soon_threadsafe(self._on_include_changed, url, data)
+
+		return kazoo.recipe.watchers.DataWatch(zkcontainer.ZooKeeper.Client, path, on_change)
+
+
+	def _on_include_changed(self, url, data):
+		try:
+			diff = Config.reload_zookeeper_include(url, data)
+		except Exception:
+			L.exception("Failed to reload the configuration from ZooKeeper, the configuration is kept.", struct_data={'url': url})
+			return
+
+		if len(diff) == 0:
+			return
+
+		L.log(LOG_NOTICE, "Configuration reloaded from ZooKeeper", struct_data={
+			'url': url,
+			'changed': ", ".join("{}:{}".format(section, option) for section, options in diff.items() for option in options),
+		})
+		self.App.PubSub.publish("Config.changed!", diff)
@@ -134,7 +134,7 @@ class ZooKeeperContainer(Configurable):
 				self.ZooKeeper.Client.stop()
 				self.ZooKeeper.Client.close()
 
-		await self.ProactorService.execute(do)
+		await self.ProactorService.execute(do, executor="zookeeper")
 
 
 	def _listener(self, state):
@@ -176,7 +176,7 @@ class ZooKeeperContainer(Configurable):
 			# Update cached identifiers on successful connection
 			self._cached_session_id = session_id
 			self._cached_connected_node = connected_node
-			self.ProactorService.schedule_threadsafe(self._on_connected_at_proactor_thread)
+			self.ProactorService.schedule_threadsafe(self._on_connected_at_proactor_thread, executor="zookeeper")
 			L.log(LOG_NOTICE, "Connected to ZooKeeper", struct_data={"node": connected_node, "session_id": session_id})
 		else:
 			# Use cached values when the connection is not active, since
@@ -217,7 +217,7 @@ class ZooKeeperContainer(Configurable):
 	def _on_tick300(self, *args):
 		# Re-publish all existing advertisements every 300 seconds
 		if len(self.Advertisments) > 0:
-			self.ProactorService.schedule(self._publish_adv_at_proactor_thread)
+			self.ProactorService.schedule(self._publish_adv_at_proactor_thread, executor="zookeeper")
 
 
 	def is_connected(self):
@@ -246,7 +246,7 @@ class ZooKeeperContainer(Configurable):
 			adv = ZooKeeperAdvertisement(path=full_path, data=data)
 			self.Advertisments[full_path] = adv
 
-		self.ProactorService.schedule(self._publish_adv_at_proactor_thread)
+		self.ProactorService.schedule(self._publish_adv_at_proactor_thread, executor="zookeeper")
 
 
 	def _publish_adv_at_proactor_thread(self):
@@ -136,7 +136,7 @@ class LeaderService(Service):
 		If the election znode cannot be deleted (e.g. transient ZooKeeper error),
 		local leadership is retained and `Application.tick60!` retries the release.
 		"""
-		self.ZkContainer.ProactorService.schedule(self._step_down_thread)
+		self.ZkContainer.ProactorService.schedule(self._step_down_thread, executor="zookeeper")
 
 
 	def SetUp(self):
@@ -149,7 +149,7 @@ class LeaderService(Service):
 
 		Safe to call when already participating.
 		"""
-		self.ZkContainer.ProactorService.schedule(self._set_up_thread)
+		self.ZkContainer.ProactorService.schedule(self._set_up_thread, executor="zookeeper")
 
 
 	def _capture_election_key(self):
@@ -231,7 +231,7 @@ class LeaderService(Service):
 		# Keep `_leader_zxid` / LeaderInfo across reconnect: a still-valid
 		# session retains the ephemeral election node, and NodeExistsError
 		# handling must compare stats.czxid with the prior zxid.
-		zkcontainer.ProactorService.schedule(setup)
+		zkcontainer.ProactorService.schedule(setup, executor="zookeeper")
 
 
 	def _on_zk_suspended(self, event_name, zkcontainer):
@@ -268,11 +268,11 @@ class LeaderService(Service):
 		if not self._participating:
 			if self.IsLeader():
 				# Stepped down but still hold leadership (e.g. prior delete failed); finish resigning.
-				return self.ZkContainer.ProactorService.schedule(self._step_down_thread)
+				return self.ZkContainer.ProactorService.schedule(self._step_down_thread, executor="zookeeper")
 			return
 		if not self.IsLeader():
 			# Speculatively run the election thread to become leader - this is a last resort recovery mechanism
-			return self.ZkContainer.ProactorService.schedule(self._election_thread)
+			return self.ZkContainer.ProactorService.schedule(self._election_thread, executor="zookeeper")
 
 
 	def _election_thread(self):
@@ -11,6 +11,8 @@ L = logging.getLogger(__name__)
 
 class ZooKeeperService(Service):
 
+	Dependencies = ("asab.ProactorService",)
+
 	def __init__(self, app, service_name):
 		super().__init__(app, service_name)
 
@@ -42,7 +42,7 @@ class KazooWrapper(object):
 		Recursively create a path if it does not exist.
 		"""
 		ret = await self.ProactorService.execute(
-			self.Client.ensure_path, path
+			self.Client.ensure_path, path, executor="zookeeper"
 		)
 		return ret
 
@@ -52,7 +52,7 @@ class KazooWrapper(object):
 		Check if a node exists.
 		"""
 		ret = await self.ProactorService.execute(
-			self.Client.exists, path
+			self.Client.exists, path, executor="zookeeper"
 		)
 		return ret
 
@@ -70,7 +70,7 @@ class KazooWrapper(object):
 		"""
 		try:
 			data, stat = await self.ProactorService.execute(
-				self.Client.get, path
+				self.Client.get, path, executor="zookeeper"
 			)
 		except kazoo.exceptions.NoNodeError:
 			# This is a silent error, it is indicated by None in the return
@@ -84,7 +84,7 @@ class KazooWrapper(object):
 		"""
 		try:
 			children = await self.ProactorService.execute(
-				self.Client.get_children, path
+				self.Client.get_children, path, executor="zookeeper"
 			)
 		except kazoo.exceptions.NoNodeError:
 			# This is a silent error, it is indicated by None in the return
@@ -98,7 +98,7 @@ class KazooWrapper(object):
 		"""
 		try:
 			data, stat = await self.ProactorService.execute(
-				self.Client.get, path
+				self.Client.get, path, executor="zookeeper"
 			)
 		except kazoo.exceptions.NoNodeError:
 			# This is a silent error, it is indicated by None in the return
@@ -112,7 +112,7 @@ class KazooWrapper(object):
 		"""
 		try:
 			ret = await self.ProactorService.execute(
-				self.Client.set, path, data
+				self.Client.set, path, data, executor="zookeeper"
 			)
 		except kazoo.exceptions.NoNodeError:
 			L.warning("Failed to write the data. Reason: Node '{}' does not exist.".format(path))
@@ -125,7 +125,7 @@ class KazooWrapper(object):
 		"""
 		try:
 			ret = await self.ProactorService.execute(
-				self.Client.delete, path, version, recursive
+				self.Client.delete, path, version, recursive, executor="zookeeper"
 			)
 		except kazoo.exceptions.NoNodeError:
 			L.warning("Failed to delete node. Reason: Node '{}' does not exist.".format(path))
@@ -139,7 +139,7 @@ class KazooWrapper(object):
 		def do():
 			return self.Client.create(path, value=value, ephemeral=ephemeral, sequence=sequence, makepath=makepath)
 
-		return await self.ProactorService.execute(do)
+		return await self.ProactorService.execute(do, executor="zookeeper")
 
 
 	async def upsert(self, path, value):
@@ -156,4 +156,4 @@ class KazooWrapper(object):
 					# Defense against race condition
 					return self.Client.set(path, value=value)
 
-		return await self.ProactorService.execute(do)
+		return await self.ProactorService.execute(do, executor="zookeeper")
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Benchmark of configuration access.
+
+Compares reading of typed values from `asab.Config` (interpolated and parsed at every call)
+with `asab.Config.snapshot()` (interpolated once, parsed at the first access).
+
+Usage:
+	python3 benchmarks/config_access.py [iterations]
+"""
+import sys
+import time
+
+import asab
+
+
+ACCESSES = [
+	("get", "web", "listen"),
+	("getboolean", "asab:metrics", "web_requests_metrics"),
+	("getint", "logging:file", "backup_count"),
+	("getseconds", "asab:pubsub", "slow_threshold"),
+	("get", "urls", "api"),
+]
+
+
+def measure(function, iterations):
+	t0 = time.perf_counter()
+	for _ in range(iterations):
+		function()
+	return (time.perf_counter() - t0) / iterations * 1e9
+
+
+def main(iterations):
+	asab.Config.add_defaults({
+		"web": {"listen": "0.0.0.0 8080"},
+		"urls": {"host": "example.com", "api": "https://${host}/api"},
+	})
+	asab.Config._load()
+
+	print("{:<52} {:>14} {:>14} {:>14}".format("access", "Config [ns]", "snapshot [ns]", "section [ns]"))
+	for method, section, option in ACCESSES:
+		raw = getattr(asab.Config, method)
+		snapshot_getter = getattr(asab.Config.snapshot(), method)
+		section_getter = getattr(asab.Config.snapshot()[section], method)
+
+		t_raw = measure(lambda: raw(section, option), iterations)
+		t_snapshot = measure(lambda: snapshot_getter(section, option), iterations)
+		t_section = measure(lambda: section_getter(option), iterations)
+		print("{:<52} {:>14.0f} {:>14.0f} {:>14.0f}".format(
+			"{}('{}', '{}')".format(method, section, option), t_raw, t_snapshot, t_section
+		))
+
+	# The snapshot as used by a hot path: obtained at every call, then read
+	t_raw = measure(lambda: asab.Config.getboolean("asab:metrics", "web_requests_metrics", fallback=False), iterations)
+	t_snapshot = measure(lambda: asab.Config.snapshot().getboolean("asab:metrics", "web_requests_metrics", fallback=False), iterations)
+	print("{:<52} {:>14.0f} {:>14.0f}".format("getboolean(..., fallback) with snapshot()", t_raw, t_snapshot))
+
+
+if __name__ == '__main__':
+	main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
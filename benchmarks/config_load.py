@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the configuration load with and without the configuration cache (`ASAB_CONFIG_CACHE`).
+
+Creates a configuration file that includes a directory of configuration files and loads it
+without the cache and from the cache.
+
+Usage:
+	python3 benchmarks/config_load.py [included files] [repeats]
+"""
+import os
+import sys
+import time
+import tempfile
+
+from asab.config import ConfigParser, _Interpolation
+
+
+def create_config(directory, files):
+	os.makedirs(os.path.join(directory, "conf.d"))
+	for i in range(files):
+		with open(os.path.join(directory, "conf.d", "{:03d}.conf".format(i)), "w") as f:
+			for s in range(10):
+				f.write("[section:{}:{}]\n".format(i, s))
+				for o in range(10):
+					f.write("option{}=${{HOME}}/value/{}/{}\n".format(o, s, o))
+				f.write("\n")
+
+	config_file = os.path.join(directory, "site.conf")
+	with open(config_file, "w") as f:
+		f.write("[general]\ninclude={}/conf.d/*.conf\n".format(directory))
+	return config_file
+
+
+def measure(config_file, cache_path, repeats):
+	ConfigParser._default_values['general']['config_file'] = config_file
+	ConfigParser._default_values['general']['config_cache'] = cache_path
+
+	t0 = time.perf_counter()
+	for _ in range(repeats):
+		ConfigParser(interpolation=_Interpolation())._load()
+	return (time.perf_counter() - t0) / repeats
+
+
+def main(files, repeats):
+	with tempfile.TemporaryDirectory() as directory:
+		config_file = create_config(directory, files)
+		cache_path = os.path.join(directory, "config.cache")
+
+		# Create the cache
+		measure(config_file, cache_path, 1)
+
+		print("{:<10} {:>14}".format("load", "per load [ms]"))
+		print("{:<10} {:>14.2f}".format("no cache", measure(config_file, '', repeats) * 1e3))
+		print("{:<10} {:>14.2f}".format("cache", measure(config_file, cache_path, repeats) * 1e3))
+
+
+if __name__ == '__main__':
+	main(
+		int(sys.argv[1]) if len(sys.argv) > 1 else 50,
+		int(sys.argv[2]) if len(sys.argv) > 2 else 20,
+	)
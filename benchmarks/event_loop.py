@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Benchmark of event loop implementations selected by `[general] event_loop`.
+
+Every loop is measured in its own process with:
+- HTTP request throughput of an asab.web server with concurrent aiohttp clients,
+- PubSub publish rate to a single synchronous subscriber,
+- TaskService churn of short tasks.
+
+Loops that are not installed are reported and skipped.
+
+Usage:
+	python3 benchmarks/event_loop.py [loop ...]
+"""
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import subprocess
+
+import aiohttp
+import aiohttp.web
+
+import asab
+import asab.web
+
+
+HTTP_REQUESTS = 20000
+HTTP_CONCURRENCY = 64
+PUBSUB_MESSAGES = 500000
+TASKS = 100000
+
+
+class BenchmarkApplication(asab.Application):
+
+	def __init__(self, port):
+		super().__init__(args=[])
+		self.Port = port
+		self.Results = {
+			"loop": "{}.{}".format(type(self.Loop).__module__, type(self.Loop).__qualname__),
+		}
+
+		router = asab.web.create_web_server(self, config={"listen": "127.0.0.1 {}".format(port)})
+		router.add_get("/", self.hello)
+
+		self.Received = 0
+		self.PubSub.subscribe("Benchmark.message!", self._on_message)
+		self.Done = 0
+		self.PubSub.subscribe("TaskService.task_done!", self._on_task_done)
+
+
+	async def hello(self, request):
+		return aiohttp.web.Response(text="Hello, world!\n")
+
+
+	def _on_message(self, message_type):
+		self.Received += 1
+
+
+	def _on_task_done(self, message_type, task):
+		self.Done += 1
+
+
+	async def main(self):
+		try:
+			self.Results["http [req/s]"] = await self.measure_http()
+			self.Results["pubsub [msg/s]"] = self.measure_pubsub()
+			self.Results["tasks [task/s]"] = await self.measure_tasks()
+		finally:
+			self.stop()
+
+
+	async def measure_http(self):
+		url = "http://127.0.0.1:{}/".format(self.Port)
+		remaining = HTTP_REQUESTS
+
+		async def client(session):
+			nonlocal remaining
+			while remaining > 0:
+				remaining -= 1
+				async with session.get(url) as response:
+					await response.read()
+
+		connector = aiohttp.TCPConnector(limit=HTTP_CONCURRENCY)
+		async with aiohttp.ClientSession(connector=connector) as session:
+			# Warm up the connection pool
+			async with session.get(url) as response:
+				await response.read()
+
+			t0 = time.perf_counter()
+			await asyncio.gather(*(client(session) for _ in range(HTTP_CONCURRENCY)))
+			return HTTP_REQUESTS / (time.perf_counter() - t0)
+
+
+	def measure_pubsub(self):
+		t0 = time.perf_counter()
+		for _ in range(PUBSUB_MESSAGES):
+			self.PubSub.publish("Benchmark.message!")
+		return PUBSUB_MESSAGES / (time.perf_counter() - t0)
+
+
+	async def measure_tasks(self):
+		self.Done = 0
+		t0 = time.perf_counter()
+		self.TaskService.schedule(*(asyncio.sleep(0) for _ in range(TASKS)))
+		while self.Done < TASKS:
+			await asyncio.sleep(0)
+		return TASKS / (time.perf_counter() - t0)
+
+
+def run(event_loop):
+	with socket.socket() as s:
+		s.bind(("127.0.0.1", 0))
+		port = s.getsockname()[1]
+
+	asab.Config.add_defaults({
+		"general": {"event_loop": event_loop},
+		"logging": {"level": "WARNING"},
+	})
+	app = BenchmarkApplication(port)
+	app.run()
+	print(json.dumps(app.Results))
+
+
+def main(loops):
+	columns = ["http [req/s]", "pubsub [msg/s]", "tasks [task/s]"]
+	print("{:<10} {:<48}".format("loop", "class") + "".join("{:>16}".format(c) for c in columns))
+	for event_loop in loops:
+		result = subprocess.run(
+			[sys.executable, os.path.abspath(__file__), "--run", event_loop],
+			capture_output=True, text=True,
+		)
+		try:
+			results = json.loads(result.stdout.strip().splitlines()[-1])
+		except (IndexError, ValueError):
+			print("{:<10} failed: {}".format(event_loop, result.stderr.strip().splitlines()[-1:]))
+			continue
+
+		if event_loop.lower() == "uvloop" and not results["loop"].startswith("uvloop"):
+			print("{:<10} not available".format(event_loop))
+			continue
+
+		print("{:<10} {:<48}".format(event_loop, results["loop"]) + "".join("{:>16.0f}".format(results[c]) for c in columns))
+
+
+if __name__ == '__main__':
+	if len(sys.argv) == 3 and sys.argv[1] == "--run":
+		run(sys.argv[2])
+	else:
+		main(sys.argv[1:] or ["asyncio", "uvloop"])
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the import time of the asab package.
+
+Every statement is executed in a fresh interpreter several times;
+the time of an empty interpreter start is subtracted.
+Use `ASAB_IMPORT_PROFILE=1 python3 -c "import asab.web"` to see the time of individual modules.
+
+Usage:
+	python3 benchmarks/import_time.py [repeat]
+"""
+import os
+import sys
+import time
+import statistics
+import subprocess
+
+
+STATEMENTS = [
+	"import asab",
+	"import asab; asab.Config",
+	"import asab; asab.Application",
+	"import asab.web",
+	"import asab.web; asab.web.WebContainer",
+]
+
+
+def measure(statement, repeat):
+	env = dict(os.environ)
+	env.pop("ASAB_IMPORT_PROFILE", None)
+	env["PYTHONPATH"] = os.pathsep.join(filter(None, [os.path.dirname(os.path.dirname(os.path.abspath(__file__))), env.get("PYTHONPATH")]))
+
+	durations = []
+	for _ in range(repeat):
+		t0 = time.perf_counter()
+		subprocess.run([sys.executable, "-c", statement], env=env, check=True)
+		durations.append(time.perf_counter() - t0)
+	return min(durations), statistics.median(durations)
+
+
+if __name__ == '__main__':
+	repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+	base_min, base_median = measure("pass", repeat)
+	print("{:<45} {:>10} {:>12}".format("statement", "min [ms]", "median [ms]"))
+	for statement in STATEMENTS:
+		t_min, t_median = measure(statement, repeat)
+		print("{:<45} {:>10.1f} {:>12.1f}".format(statement, (t_min - base_min) * 1000, (t_median - base_median) * 1000))
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the TaskService bookkeeping.
+
+Schedules a large number of long-lived tasks (e.g. WebSocket handlers) and then measures
+how long it takes to schedule and collect short one-off tasks while the long-lived ones are pending.
+
+Usage:
+	python3 benchmarks/task_service.py [pending ...]
+"""
+import sys
+import time
+import asyncio
+
+import asab
+
+
+class BenchmarkApplication(asab.Application):
+
+	def __init__(self, pending_counts):
+		super().__init__(args=[])
+		self.PendingCounts = pending_counts
+		self.ShortTasks = 10000
+		self.Done = 0
+		self.PubSub.subscribe("TaskService.task_done!", self._on_task_done)
+
+
+	def _on_task_done(self, message_type, task):
+		self.Done += 1
+
+
+	async def main(self):
+		print("{:>10} {:>16} {:>16}".format("pending", "schedule [s]", "churn [s]"))
+		for pending in self.PendingCounts:
+			stop = asyncio.Event()
+
+			t0 = time.perf_counter()
+			self.TaskService.schedule(*(stop.wait() for _ in range(pending)))
+			await asyncio.sleep(0)
+			t_schedule = time.perf_counter() - t0
+
+			self.Done = 0
+			t0 = time.perf_counter()
+			self.TaskService.schedule(*(asyncio.sleep(0) for _ in range(self.ShortTasks)))
+			while self.Done < self.ShortTasks:
+				await asyncio.sleep(0)
+			t_churn = time.perf_counter() - t0
+
+			print("{:>10} {:>16.3f} {:>16.3f}".format(pending, t_schedule, t_churn))
+
+			self.Done = 0
+			stop.set()
+			while self.Done < pending:
+				await asyncio.sleep(0.01)
+
+		self.stop()
+
+
+if __name__ == '__main__':
+	pending_counts = [int(arg) for arg in sys.argv[1:]] or [10000, 100000]
+	app = BenchmarkApplication(pending_counts)
+	app.run()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark of `asab.Timer` with many timers, e.g. per-connection idle timeouts.
+
+Starts, restarts and stops a large number of timers and then lets all of them trigger.
+For comparison, the same is done with timers implemented by a task per timer,
+which is how `asab.Timer` worked before the timing wheel.
+
+Usage:
+	python3 benchmarks/timer.py [count]
+"""
+import sys
+import time
+import asyncio
+
+import asab
+
+
+class TaskTimer(object):
+	"""
+	Timer that runs a sleeping task for every start.
+	"""
+
+	def __init__(self, app, handler):
+		self.Handler = handler
+		self.Task = None
+
+	def start(self, timeout):
+		self.Task = asyncio.ensure_future(self._job(timeout))
+
+	def stop(self):
+		if self.Task is not None:
+			self.Task.cancel()
+			self.Task = None
+
+	def restart(self, timeout):
+		self.stop()
+		self.start(timeout)
+
+	async def _job(self, timeout):
+		await asyncio.sleep(timeout)
+		self.Task = None
+		await self.Handler()
+
+
+class BenchmarkApplication(asab.Application):
+
+	def __init__(self, count):
+		super().__init__(args=[])
+		self.Count = count
+		self.Triggered = 0
+
+
+	async def on_timer(self):
+		self.Triggered += 1
+
+
+	async def measure(self, timer_class):
+		timers = [timer_class(self, self.on_timer) for _ in range(self.Count)]
+
+		t0 = time.perf_counter()
+		for timer in timers:
+			timer.start(60.0)
+		await asyncio.sleep(0)
+		t_start = time.perf_counter() - t0
+
+		t0 = time.perf_counter()
+		for timer in timers:
+			timer.restart(120.0)
+		await asyncio.sleep(0)
+		t_restart = time.perf_counter() - t0
+
+		t0 = time.perf_counter()
+		for timer in timers:
+			timer.stop()
+		await asyncio.sleep(0)
+		t_stop = time.perf_counter() - t0
+
+		self.Triggered = 0
+		t0 = time.perf_counter()
+		for timer in timers:
+			timer.start(0.1)
+		while self.Triggered < self.Count:
+			await asyncio.sleep(0.01)
+		t_trigger = time.perf_counter() - t0 - 0.1
+
+		return t_start, t_restart, t_stop, t_trigger
+
+
+	async def main(self):
+		print("{} timers".format(self.Count))
+		print("{:>10} {:>12} {:>12} {:>12} {:>12}".format("", "start [s]", "restart [s]", "stop [s]", "trigger [s]"))
+		for name, timer_class in [("task", TaskTimer), ("wheel", asab.Timer)]:
+			result = await self.measure(timer_class)
+			print("{:>10} {:>12.3f} {:>12.3f} {:>12.3f} {:>12.3f}".format(name, *result))
+
+		self.stop()
+
+
+if __name__ == '__main__':
+	count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+	app = BenchmarkApplication(count)
+	app.run()
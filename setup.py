@@ -92,7 +92,9 @@ setup(
 		'git': ['pygit2<1.12'],
 		'encryption': ['cryptography'],
 		'monitoring': ['sentry-sdk==1.45.1'],
-		'authz': ['jwcrypto==1.5.7']
+		'authz': ['jwcrypto==1.5.7'],
+		'uvloop': ['uvloop; platform_system != "Windows"'],
+		'orjson': ['orjson'],
 	},
 	cmdclass={
 		'build_py': CustomBuildPy,
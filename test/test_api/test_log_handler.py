@@ -0,0 +1,120 @@
+import json
+import types
+import asyncio
+import logging
+import threading
+import unittest
+
+from asab.api.log import WebApiLoggingHandler, _LogViewer
+
+
+class WebSocketMock(object):
+
+	def __init__(self, stalled=False):
+		self.Sent = []
+		self.Closed = False
+		self.Stalled = stalled
+
+
+	async def send_str(self, data):
+		if self.Stalled:
+			await asyncio.Event().wait()
+		self.Sent.append(data)
+
+
+	async def close(self, **kwargs):
+		self.Closed = True
+
+
+class TestWebApiLoggingHandler(unittest.TestCase):
+
+	def setUp(self):
+		self.Loop = asyncio.new_event_loop()
+		app = types.SimpleNamespace(Loop=self.Loop, PubSub=types.SimpleNamespace(subscribe=lambda *args: None))
+		self.Handler = WebApiLoggingHandler(app, buffer_size=3, ws_queue_size=5)
+		self.Logger = logging.getLogger("test.api.log")
+		self.Logger.propagate = False
+		self.Logger.setLevel(logging.INFO)
+		self.Logger.addHandler(self.Handler)
+		self.Tasks = []
+
+
+	def tearDown(self):
+		self.Logger.removeHandler(self.Handler)
+		for task in self.Tasks:
+			task.cancel()
+		self.Loop.run_until_complete(asyncio.sleep(0))
+		self.Loop.close()
+
+
+	def viewer(self, ws):
+		viewer = _LogViewer(ws)
+		self.Handler.WebSockets[ws] = viewer
+		self.Tasks.append(self.Loop.create_task(viewer.send()))
+		return viewer
+
+
+	def test_ring_buffer(self):
+		for i in range(10):
+			self.Logger.info("Message %d", i)
+
+		self.assertEqual([json.loads(entry)["M"] for entry in self.Handler.Buffer], ["Message 7", "Message 8", "Message 9"])
+
+
+	def test_batched_fan_out(self):
+		ws1 = WebSocketMock()
+		ws2 = WebSocketMock()
+		self.viewer(ws1)
+		self.viewer(ws2)
+
+		for i in range(4):
+			self.Logger.info("Message %d", i, struct_data={'i': i})
+		# Entries are passed to the viewers in the next loop iteration
+		self.assertEqual(ws1.Sent, [])
+
+		self.Loop.run_until_complete(asyncio.sleep(0.01))
+		for ws in (ws1, ws2):
+			self.assertEqual([json.loads(entry)["sd"]["i"] for entry in ws.Sent], [0, 1, 2, 3])
+
+
+	def test_slow_viewer_is_dropped(self):
+		fast = WebSocketMock()
+		slow = WebSocketMock(stalled=True)
+		self.viewer(fast)
+		self.viewer(slow)
+
+		for i in range(3):
+			for _ in range(3):
+				self.Logger.info("Message")
+			self.Loop.run_until_complete(asyncio.sleep(0.01))
+
+		self.assertNotIn(slow, self.Handler.WebSockets)
+		self.assertTrue(slow.Closed)
+		self.assertIn(fast, self.Handler.WebSockets)
+		self.assertEqual(len(fast.Sent), 9)
+
+
+	def test_other_threads(self):
+		self.Handler.WSQueueSize = 100000
+		ws = WebSocketMock()
+		self.viewer(ws)
+
+		def log(n):
+			for i in range(1000):
+				self.Logger.info("Thread %d message %d", n, i)
+
+		threads = [threading.Thread(target=log, args=(n,)) for n in range(4)]
+		for thread in threads:
+			thread.start()
+
+		async def wait():
+			# The loop flushes entries while the threads log
+			while any(thread.is_alive() for thread in threads) or len(ws.Sent) < 4000:
+				await asyncio.sleep(0.001)
+		self.Loop.run_until_complete(asyncio.wait_for(wait(), 10))
+
+		self.assertEqual(len(ws.Sent), 4000)
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,42 @@
+import asyncio
+import unittest
+
+from asab.application import _new_event_loop
+
+
+class TestEventLoopSelection(unittest.TestCase):
+
+	def test_default(self):
+		self.assertEqual(_new_event_loop("asyncio"), (None, None))
+		self.assertEqual(_new_event_loop(""), (None, None))
+
+
+	def test_factory(self):
+		loop, fallback = _new_event_loop("asyncio:new_event_loop")
+		try:
+			self.assertIsInstance(loop, asyncio.AbstractEventLoop)
+			self.assertIsNone(fallback)
+		finally:
+			loop.close()
+
+
+	def test_fallback(self):
+		loop, fallback = _new_event_loop("no_such_module:new_event_loop")
+		self.assertIsNone(loop)
+		self.assertIn("ModuleNotFoundError", fallback)
+
+		loop, fallback = _new_event_loop("nonsense")
+		self.assertIsNone(loop)
+		self.assertIsNotNone(fallback)
+
+
+	def test_auto(self):
+		loop, fallback = _new_event_loop("auto")
+		self.assertIsNone(fallback)
+		if loop is not None:
+			self.assertEqual(type(loop).__module__.split(".")[0], "uvloop")
+			loop.close()
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,40 @@
+import os
+import sys
+import subprocess
+import unittest
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def run(code, **env):
+	environ = dict(os.environ, PYTHONPATH=ROOT)
+	environ.pop("ASAB_IMPORT_PROFILE", None)
+	environ.update(env)
+	return subprocess.run([sys.executable, "-c", code], env=environ, capture_output=True, text=True, check=True)
+
+
+class TestLazyImport(unittest.TestCase):
+
+	def test_import_is_lazy(self):
+		result = run(
+			"import sys, asab; print(','.join(sorted(m for m in sys.modules if m in ('asyncio', 'asab.application', 'asab.config', 'importlib.abc'))))"
+		)
+		self.assertEqual(result.stdout.strip(), "")
+
+
+	def test_attribute_loads_submodule(self):
+		result = run(
+			"import sys, asab; asab.Config; print('asab.config' in sys.modules, 'Config' in dir(asab))"
+		)
+		self.assertEqual(result.stdout.strip(), "True True")
+
+
+	def test_import_profile(self):
+		result = run("import asab; asab.Config", ASAB_IMPORT_PROFILE="1")
+		self.assertIn("ASAB import profile", result.stderr)
+		self.assertIn("asab.config", result.stderr)
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,67 @@
+import os
+import sys
+import unittest
+import subprocess
+
+from asab.prefork import parse_workers, is_supported
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+APP = """
+import os
+import asab
+
+asab.Config.add_defaults({"general": {"workers": 3}})
+
+
+class LeaderService(asab.Service):
+	LeaderOnly = True
+
+	async def initialize(self, app):
+		# A single write, so lines of the workers sharing the pipe don't interleave
+		os.write(1, "leader {}\\n".format(app.WorkerId).encode())
+
+
+class PreforkApplication(asab.Application):
+
+	def __init__(self):
+		super().__init__(args=[])
+		LeaderService(self, "LeaderService")
+
+	async def main(self):
+		os.write(1, "worker {} {}\\n".format(self.WorkerId, self.WorkerCount).encode())
+		self.stop()
+
+
+PreforkApplication().run()
+"""
+
+
+class TestPrefork(unittest.TestCase):
+
+	def test_parse_workers(self):
+		self.assertEqual(parse_workers("1"), 1)
+		self.assertEqual(parse_workers("0"), 1)
+		self.assertEqual(parse_workers("4"), 4)
+		self.assertGreaterEqual(parse_workers("auto"), 1)
+		with self.assertRaises(ValueError):
+			parse_workers("-2")
+
+
+	@unittest.skipUnless(is_supported(), "Prefork is not supported on this platform")
+	def test_workers(self):
+		env = dict(os.environ, PYTHONPATH=ROOT)
+		result = subprocess.run([sys.executable, "-c", APP], env=env, capture_output=True, text=True, timeout=60)
+		self.assertEqual(result.returncode, 0, result.stderr)
+
+		lines = result.stdout.splitlines()
+		self.assertEqual(sorted(line for line in lines if line.startswith("worker")), ["worker 0 3", "worker 1 3", "worker 2 3"])
+		self.assertEqual([line for line in lines if line.startswith("leader")], ["leader 0"])
+
+		# The supervisor logs before the logging is configured by the application
+		self.assertEqual(result.stderr.count("Prefork supervisor started"), 1, result.stderr)
+
+
+if __name__ == '__main__':
+	unittest.main()
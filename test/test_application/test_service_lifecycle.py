@@ -0,0 +1,145 @@
+import asyncio
+import logging
+import unittest
+
+import asab
+import asab.abc
+
+
+class SlowService(asab.Service):
+
+	def __init__(self, app, service_name, events, dependencies=()):
+		super().__init__(app, service_name)
+		self.Events = events
+		self.Dependencies = dependencies
+
+	async def initialize(self, app):
+		self.Events.append(("init-start", self.Name))
+		await asyncio.sleep(0.05)
+		self.Events.append(("init-end", self.Name))
+
+	async def finalize(self, app):
+		self.Events.append(("finalize-start", self.Name))
+		await asyncio.sleep(0.05)
+		self.Events.append(("finalize-end", self.Name))
+
+
+class TestServiceLifecycle(unittest.TestCase):
+
+	def setUp(self):
+		super().setUp()
+		self.App = asab.Application(args=[], modules=[])
+		self.Events = []
+
+	def tearDown(self):
+		asab.abc.singleton.Singleton.delete(self.App.__class__)
+		self.App = None
+		root_logger = logging.getLogger()
+		root_logger.handlers = []
+
+
+	def test_sequential(self):
+		SlowService(self.App, "test.database", self.Events)
+		SlowService(self.App, "test.api", self.Events, dependencies=("test.database",))
+		SlowService(self.App, "test.cache", self.Events)
+
+		self.App.Loop.run_until_complete(self.App._init_time_governor())
+
+		# One by one in the reversed order of registration, the dependency first
+		self.assertEqual(self.Events, [
+			("init-start", "test.cache"), ("init-end", "test.cache"),
+			("init-start", "test.database"), ("init-end", "test.database"),
+			("init-start", "test.api"), ("init-end", "test.api"),
+		])
+
+		self.Events.clear()
+		self.App.Loop.run_until_complete(self.App._finalize_services())
+		self.assertEqual(self.Events, [
+			("finalize-start", "test.cache"), ("finalize-end", "test.cache"),
+			("finalize-start", "test.api"), ("finalize-end", "test.api"),
+			("finalize-start", "test.database"), ("finalize-end", "test.database"),
+		])
+
+
+	def test_dependencies(self):
+		asab.Config.set("general", "concurrent_services", "yes")
+		self.addCleanup(asab.Config.remove_option, "general", "concurrent_services")
+
+		SlowService(self.App, "test.database", self.Events)
+		SlowService(self.App, "test.cache", self.Events)
+		SlowService(self.App, "test.api", self.Events, dependencies=("test.database", "test.missing"))
+
+		t0 = self.App.Loop.time()
+		self.App.Loop.run_until_complete(self.App._init_time_governor())
+		duration = self.App.Loop.time() - t0
+
+		# Independent services are initialized concurrently
+		self.assertLess(duration, 0.14)
+		self.assertLess(
+			self.Events.index(("init-start", "test.cache")),
+			self.Events.index(("init-end", "test.database")),
+		)
+		self.assertLess(
+			self.Events.index(("init-end", "test.database")),
+			self.Events.index(("init-start", "test.api")),
+		)
+		self.assertEqual(set(self.App.ServiceInitTimes), set(self.App.Services))
+
+		self.Events.clear()
+		self.App.Loop.run_until_complete(self.App._finalize_services())
+
+		# Reversed order: the dependency is finalized after its dependent
+		self.assertLess(
+			self.Events.index(("finalize-end", "test.api")),
+			self.Events.index(("finalize-start", "test.database")),
+		)
+		self.assertLess(
+			self.Events.index(("finalize-start", "test.cache")),
+			self.Events.index(("finalize-end", "test.api")),
+		)
+
+
+	def test_cycle(self):
+		SlowService(self.App, "test.a", self.Events, dependencies=("test.b",))
+		SlowService(self.App, "test.b", self.Events, dependencies=("test.a",))
+
+		with self.assertLogs("asab.application", level="ERROR"):
+			self.App.Loop.run_until_complete(self.App._init_time_governor())
+
+		self.assertIn(("init-end", "test.a"), self.Events)
+		self.assertIn(("init-end", "test.b"), self.Events)
+
+
+	def test_exit_waits_for_tasks(self):
+		stop = asyncio.Event()
+
+		async def short():
+			await asyncio.sleep(0.05)
+
+		async def stuck():
+			await stop.wait()
+
+		asab.Config.set("general", "shutdown_timeout", "200ms")
+		try:
+			async def run():
+				self.App.Loop.create_task(short())
+				self.App.Loop.create_task(stuck(), name="stuck-task")
+
+				t0 = self.App.Loop.time()
+				with self.assertLogs("asab.application", level="WARNING") as logs:
+					await self.App._exit_time_governor()
+				duration = self.App.Loop.time() - t0
+				stop.set()
+				return duration, logs
+
+			duration, logs = self.App.Loop.run_until_complete(run())
+		finally:
+			asab.Config.remove_option("general", "shutdown_timeout")
+
+		self.assertGreaterEqual(duration, 0.2)
+		self.assertLess(duration, 0.5)
+		self.assertIn("stuck-task", logs.records[-1]._struct_data["tasks"])
+
+
+if __name__ == '__main__':
+	unittest.main()
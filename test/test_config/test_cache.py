@@ -0,0 +1,126 @@
+import os
+import stat
+import time
+import tempfile
+import unittest
+
+from asab.config import ConfigParser, _Interpolation
+
+
+class CountingConfigParser(ConfigParser):
+
+	def __init__(self, *args, **kwargs):
+		super().__init__(*args, **kwargs)
+		self.FilesRead = 0
+
+	def _read_file_layer(self, path):
+		self.FilesRead += 1
+		return super()._read_file_layer(path)
+
+
+class TestConfigCache(unittest.TestCase):
+
+	def setUp(self):
+		self.TmpDir = tempfile.TemporaryDirectory()
+		self.Dir = self.TmpDir.name
+		self.CachePath = os.path.join(self.Dir, "config.cache")
+		os.makedirs(os.path.join(self.Dir, "conf.d"))
+
+		self.write("site.conf", "[general]\ninclude={}/conf.d/*.conf\n\n[web]\nlisten=8080\npath=$ASAB_TEST_DIR/web\n".format(self.Dir))
+		self.write("conf.d/a.conf", "[logging]\nlevel=INFO\n\n[web]\nlisten=9090\n")
+
+		self.General = dict(ConfigParser._default_values['general'])
+		ConfigParser._default_values['general']['config_file'] = os.path.join(self.Dir, "site.conf")
+		ConfigParser._default_values['general']['config_cache'] = self.CachePath
+		os.environ["ASAB_TEST_DIR"] = "/srv"
+
+
+	def tearDown(self):
+		ConfigParser._default_values['general'] = self.General
+		os.environ.pop("ASAB_TEST_DIR", None)
+		self.TmpDir.cleanup()
+
+
+	def write(self, name, content):
+		path = os.path.join(self.Dir, name)
+		with open(path, "w") as f:
+			f.write(content)
+		# Older than the cache, so files are not hashed
+		os.utime(path, (1700000000, 1700000000))
+
+
+	def load(self):
+		config = CountingConfigParser(interpolation=_Interpolation())
+		config._load()
+		return config
+
+
+	def test_cache(self):
+		first = self.load()
+		self.assertEqual(first.FilesRead, 2)
+		self.assertEqual(stat.S_IMODE(os.stat(self.CachePath).st_mode), 0o600)
+
+		second = self.load()
+		self.assertEqual(second.FilesRead, 0)
+		self.assertEqual(second._raw_sections(), first._raw_sections())
+		self.assertEqual(second.get("web", "listen"), "9090")
+		self.assertEqual(second.get("web", "path"), "/srv/web")
+		self.assertEqual(second.get("logging", "level"), "INFO")
+
+
+	def test_invalidation(self):
+		self.load()
+
+		self.write("conf.d/a.conf", "[logging]\nlevel=DEBUG\n")
+		config = self.load()
+		self.assertEqual(config.FilesRead, 2)
+		self.assertEqual(config.get("logging", "level"), "DEBUG")
+		self.assertEqual(config.get("web", "listen"), "8080")
+
+		self.write("conf.d/b.conf", "[web]\nlisten=1\n")
+		config = self.load()
+		self.assertEqual(config.FilesRead, 3)
+		self.assertEqual(config.get("web", "listen"), "1")
+
+		os.environ["ASAB_TEST_DIR"] = "/opt"
+		config = self.load()
+		self.assertEqual(config.FilesRead, 3)
+		self.assertEqual(config.get("web", "path"), "/opt/web")
+
+		self.assertEqual(self.load().FilesRead, 0)
+
+
+	def test_recently_modified_file_is_hashed(self):
+		path = os.path.join(self.Dir, "conf.d/a.conf")
+		now = time.time()
+		with open(path, "w") as f:
+			f.write("[logging]\nlevel=ERROR\n\n[web]\nlisten=9092\n")
+		os.utime(path, (now, now))
+		self.load()
+
+		# Same size and modification time, as when the file is changed right after it was cached
+		with open(path, "w") as f:
+			f.write("[logging]\nlevel=ERROR\n\n[web]\nlisten=9093\n")
+		os.utime(path, (now, now))
+		config = self.load()
+		self.assertEqual(config.FilesRead, 2)
+		self.assertEqual(config.get("web", "listen"), "9093")
+
+
+	def test_corrupted_cache(self):
+		with open(self.CachePath, "w") as f:
+			f.write("{corrupted")
+		config = self.load()
+		self.assertEqual(config.FilesRead, 2)
+		self.assertEqual(config.get("web", "listen"), "9090")
+		self.assertEqual(self.load().FilesRead, 0)
+
+
+	def test_bypass(self):
+		ConfigParser._default_values['general']['config_cache'] = ''
+		self.load()
+		self.assertFalse(os.path.exists(self.CachePath))
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,91 @@
+import os
+import tempfile
+import unittest
+
+from asab.config import ConfigParser, _Interpolation
+
+
+class TestZooKeeperIncludeReload(unittest.TestCase):
+
+	def setUp(self):
+		self.TmpDir = tempfile.TemporaryDirectory()
+		self.Config = ConfigParser(interpolation=_Interpolation())
+		self.Config.add_defaults({
+			"logging": {"level": "NOTICE"},
+			"asab:metrics": {"interval_multiplier": 1},
+		})
+
+		config_file = self.write("site.conf", "[logging]\nlevel=INFO\n\n[web]\nlisten=8080\n")
+		override = self.write("override.conf", "[web]\nlisten=7070\n")
+
+		# The configuration file, a ZooKeeper include and a file include after it, as loaded by `_load()`
+		self.Config._load_dir_stack = [self.TmpDir.name]
+		self.Config._read_file_layer(config_file)
+		self.Config.config_contents_list = []
+		self.Config.config_name_list = []
+		self.Config._apply_zookeeper_include(
+			"zookeeper://zk:2181/asab/config/site.conf", "zk:2181", "/asab/config/site.conf",
+			b"[logging]\nlevels=foo DEBUG\n\n[asab:metrics]\ninterval_multiplier=2\n\n[web]\nlisten=9090\n"
+		)
+		self.Config._read_file_layer(override)
+
+
+	def tearDown(self):
+		self.TmpDir.cleanup()
+
+
+	def write(self, name, content):
+		path = os.path.join(self.TmpDir.name, name)
+		with open(path, "w") as f:
+			f.write(content)
+		return path
+
+
+	def reload(self, data):
+		return self.Config.reload_zookeeper_include("zookeeper://zk:2181/asab/config/site.conf", data)
+
+
+	def test_includes(self):
+		self.assertEqual(self.Config.get_zookeeper_includes(), {
+			"zookeeper://zk:2181/asab/config/site.conf": ("zk:2181", "/asab/config/site.conf"),
+		})
+		self.assertEqual(self.Config.get("logging", "levels"), "foo DEBUG")
+		self.assertEqual(self.Config.get("web", "listen"), "7070")
+
+
+	def test_reload_diff(self):
+		snapshot = self.Config.snapshot()
+		diff = self.reload(b"[logging]\nlevel=DEBUG\n\n[web]\nlisten=1\n\n[new]\nurl=http://${web:listen}\n")
+
+		self.assertEqual(diff, {
+			"asab:metrics": {"interval_multiplier": ("2", "1")},  # Back to the default
+			"logging": {"level": ("INFO", "DEBUG"), "levels": ("foo DEBUG", None)},
+			"new": {"url": (None, "http://${web:listen}")},
+		})
+		self.assertEqual(self.Config.get("logging", "level"), "DEBUG")
+		self.assertFalse(self.Config.has_option("logging", "levels"))
+		self.assertEqual(self.Config.getint("asab:metrics", "interval_multiplier"), 1)
+		# Overridden by the later include
+		self.assertEqual(self.Config.get("web", "listen"), "7070")
+		self.assertEqual(self.Config.get("new", "url"), "http://7070")
+		self.assertIsNot(self.Config.snapshot(), snapshot)
+
+
+	def test_reload_fallback(self):
+		diff = self.reload(b"[logging]\n")
+		# Back to the configuration file
+		self.assertEqual(diff["logging"], {"levels": ("foo DEBUG", None)})
+		self.assertEqual(self.Config.get("logging", "level"), "INFO")
+
+
+	def test_reload_unchanged(self):
+		data = b"[logging]\nlevel=DEBUG\n"
+		self.assertNotEqual(self.reload(data), {})
+		snapshot = self.Config.snapshot()
+		self.assertEqual(self.reload(data), {})
+		self.assertEqual(self.reload(data.replace(b"\n", b"\n\n")), {})
+		self.assertIs(self.Config.snapshot(), snapshot)
+
+
+if __name__ == '__main__':
+	unittest.main()
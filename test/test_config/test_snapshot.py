@@ -0,0 +1,90 @@
+import unittest
+import configparser
+
+from asab.config import ConfigParser, ConfigurableDict
+
+
+class TestConfigSnapshot(unittest.TestCase):
+
+	def setUp(self):
+		self.Config = ConfigParser(interpolation=configparser.ExtendedInterpolation())
+		self.Config.read_string("""
+[web]
+listen=0.0.0.0 8080
+backlog=128
+timeout=2m
+debug=yes
+url=https://example.com/api/
+hosts=
+	alpha
+	beta
+base=http://${url}
+
+[broken]
+value=${missing:option}
+""")
+
+
+	def test_typed_values(self):
+		snapshot = self.Config.snapshot()
+		web = snapshot["web"]
+		self.assertEqual(web["listen"], "0.0.0.0 8080")
+		self.assertEqual(web.getint("backlog"), 128)
+		self.assertEqual(web.getseconds("timeout"), 120.0)
+		self.assertIs(web.getboolean("debug"), True)
+		self.assertEqual(web.geturl("url", scheme="https"), "https://example.com/api")
+		self.assertEqual(web.getmultiline("hosts"), ("alpha", "beta"))
+		self.assertEqual(web["base"], "http://https://example.com/api/")
+
+		self.assertEqual(snapshot.getint("web", "backlog"), 128)
+		self.assertEqual(snapshot.getint("web", "missing", fallback=7), 7)
+		self.assertEqual(snapshot.getboolean("missing", "debug", fallback=False), False)
+
+
+	def test_errors(self):
+		snapshot = self.Config.snapshot()
+		with self.assertRaises(configparser.NoSectionError):
+			snapshot.getint("missing", "backlog")
+		with self.assertRaises(configparser.NoOptionError):
+			snapshot.getint("web", "missing")
+		with self.assertRaises(configparser.InterpolationError):
+			snapshot["broken"]["value"]
+		with self.assertRaises(ValueError):
+			snapshot["web"].getint("listen")
+
+
+	def test_cached_and_invalidated(self):
+		snapshot = self.Config.snapshot()
+		self.assertIs(self.Config.snapshot(), snapshot)
+		self.assertIs(snapshot["web"].getmultiline("hosts"), snapshot["web"].getmultiline("hosts"))
+
+		self.Config.set("web", "backlog", "256")
+		new_snapshot = self.Config.snapshot()
+		self.assertIsNot(new_snapshot, snapshot)
+		# The old snapshot is immutable
+		self.assertEqual(snapshot["web"].getint("backlog"), 128)
+		self.assertEqual(new_snapshot["web"].getint("backlog"), 256)
+
+		self.Config.read_string("[new]\nkey=value\n")
+		self.assertEqual(self.Config.snapshot()["new"]["key"], "value")
+
+		self.Config.remove_section("new")
+		self.assertNotIn("new", self.Config.snapshot())
+
+		self.Config.snapshot()
+		self.Config.add_section("empty")
+		self.assertIn("empty", self.Config.snapshot())
+
+
+class TestConfigurableDict(unittest.TestCase):
+
+	def test_cache(self):
+		config = ConfigurableDict()
+		config["timeout"] = "1m"
+		self.assertEqual(config.getseconds("timeout"), 60.0)
+		config["timeout"] = "2m"
+		self.assertEqual(config.getseconds("timeout"), 120.0)
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -90,5 +90,5 @@ class MockProactorService():
 	def __init__(self):
 		pass
 
-	async def execute(self, func, *args):
+	async def execute(self, func, *args, executor=None):
 		return func(*args)
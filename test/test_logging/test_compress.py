@@ -0,0 +1,106 @@
+import os
+import gzip
+import lzma
+import logging
+import tempfile
+import unittest
+
+from asab.log import CompressingRotatingFileHandler
+
+
+class TestCompressingRotatingFileHandler(unittest.TestCase):
+
+	def setUp(self):
+		self.TmpDir = tempfile.TemporaryDirectory()
+		self.Path = os.path.join(self.TmpDir.name, "app.log")
+		self.Handlers = []
+
+
+	def tearDown(self):
+		for handler in self.Handlers:
+			handler.close()
+		self.TmpDir.cleanup()
+
+
+	def handler(self, **kwargs):
+		handler = CompressingRotatingFileHandler(self.Path, **kwargs)
+		handler.setFormatter(logging.Formatter("%(message)s"))
+		self.Handlers.append(handler)
+		return handler
+
+
+	def log(self, handler, message):
+		handler.handle(logging.LogRecord("test", logging.INFO, __file__, 1, message, (), None))
+
+
+	def rotated(self):
+		return sorted(name for name in os.listdir(self.TmpDir.name) if name != "app.log")
+
+
+	def test_gzip(self):
+		handler = self.handler(backupCount=3)
+		self.log(handler, "first")
+		handler.doRollover()
+		self.log(handler, "second")
+		handler.wait()
+
+		rotated = self.rotated()
+		self.assertEqual(len(rotated), 1)
+		self.assertTrue(rotated[0].endswith(".gz"))
+		with gzip.open(os.path.join(self.TmpDir.name, rotated[0]), "rt") as f:
+			self.assertEqual(f.read(), "first\n")
+		with open(self.Path) as f:
+			self.assertEqual(f.read(), "second\n")
+
+
+	def test_xz_and_size_rollover(self):
+		handler = self.handler(backupCount=10, maxBytes=100, compression="xz")
+		for i in range(10):
+			self.log(handler, "{:<39}".format(i))
+		handler.wait()
+
+		# From the oldest, rotated within the same second
+		rotated = handler._rotated_files()[::-1]
+		self.assertEqual(len(rotated), 4)
+		content = ""
+		for path in rotated:
+			self.assertTrue(path.endswith(".xz"))
+			with lzma.open(path, "rt") as f:
+				content += f.read()
+		with open(self.Path) as f:
+			content += f.read()
+		self.assertEqual([int(line) for line in content.split()], list(range(10)))
+
+
+	def test_retention(self):
+		handler = self.handler(backupCount=3)
+		for i in range(6):
+			self.log(handler, "message {}".format(i))
+			handler.doRollover()
+		handler.wait()
+
+		rotated = handler._rotated_files()
+		self.assertEqual(len(rotated), 3)
+		with gzip.open(rotated[-1], "rt") as f:
+			self.assertEqual(f.read(), "message 3\n")
+
+		handler.MaxTotalBytes = os.path.getsize(rotated[0]) + 1
+		self.log(handler, "message 6")
+		handler.doRollover()
+		handler.wait()
+		self.assertEqual(len(self.rotated()), 1)
+
+
+	def test_leftover_is_compressed(self):
+		with open(self.Path + ".20240101-000000", "w") as f:
+			f.write("leftover\n")
+
+		handler = self.handler(backupCount=3)
+		handler.wait()
+
+		self.assertEqual(self.rotated(), ["app.log.20240101-000000.gz"])
+		self.assertEqual(handler.Compressed, 1)
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,185 @@
+import os
+import copy
+import time
+import socket
+import sys
+import logging
+import unittest
+
+import asab
+from asab.log import (
+	LOG_NOTICE, StructuredDataFormatter,
+	SyslogRFC3164Formatter, SyslogRFC5424Formatter, SyslogRFC5424microFormatter, MacOSXSyslogFormatter,
+)
+
+
+CONSOLE_FORMAT = "%(asctime)s %(levelname)s %(name)s %(struct_data)s%(message)s"
+
+# Rendered by the formatters before they were compiled, in the UTC time zone
+GOLDEN = {
+	'console-color': [
+		'14-Nov-2023 22:13:20.123456 \x1b[1;32mINFO\x1b[0m test.golden [sd a="1" b="x y"] Hello world',
+		'14-Nov-2023 22:13:20.123456 \x1b[1;34mDEBUG\x1b[0m test.golden debug',
+		'14-Nov-2023 22:13:20.123456 \x1b[1;36mNOTICE\x1b[0m test.golden [sd ] notice',
+		'14-Nov-2023 22:13:21.000000 \x1b[1;33mWARNING\x1b[0m test.golden warn',
+		'14-Nov-2023 22:13:21.000000 \x1b[1;31mERROR\x1b[0m test.golden [sd k="None"] error',
+		'14-Nov-2023 22:13:20.123456 \x1b[1;35mLevel 45\x1b[0m test.golden between',
+		'14-Nov-2023 22:13:20.123456 \x1b[1;35mCRITICAL\x1b[0m test.golden critical',
+		'14-Nov-2023 22:13:20.123456 \x1b[1;37mLevel 60\x1b[0m test.golden alert',
+	],
+	'file': [
+		'14-Nov-2023 22:13:20.123456 INFO test.golden [sd a="1" b="x y"] Hello world',
+		'14-Nov-2023 22:13:20.123456 DEBUG test.golden debug',
+		'14-Nov-2023 22:13:20.123456 NOTICE test.golden [sd ] notice',
+		'14-Nov-2023 22:13:21.000000 WARNING test.golden warn',
+		'14-Nov-2023 22:13:21.000000 ERROR test.golden [sd k="None"] error',
+		'14-Nov-2023 22:13:20.123456 Level 45 test.golden between',
+		'14-Nov-2023 22:13:20.123456 CRITICAL test.golden critical',
+		'14-Nov-2023 22:13:20.123456 Level 60 test.golden alert',
+	],
+	'nodatefmt': [
+		'2023-11-14 22:13:20.123 134 %(literal)s 123 [sd a="1" b="x y"] Hello world',
+		'2023-11-14 22:13:20.123 135 %(literal)s 123 debug',
+		'2023-11-14 22:13:20.123 133 %(literal)s 123 [sd ] notice',
+		'2023-11-14 22:13:21.999 132 %(literal)s 999 warn',
+		'2023-11-14 22:13:21.000 131 %(literal)s 000 [sd k="None"] error',
+		'2023-11-14 22:13:20.123 130 %(literal)s 123 between',
+		'2023-11-14 22:13:20.123 130 %(literal)s 123 critical',
+		'2023-11-14 22:13:20.123 129 %(literal)s 123 alert',
+	],
+	'3': [
+		'<134>Nov 14 22:13:20 {host} {app}[{pid}]:INFO test.golden [sd a="1" b="x y"] Hello world\x00',
+		'<135>Nov 14 22:13:20 {host} {app}[{pid}]:DEBUG test.golden debug\x00',
+		'<133>Nov 14 22:13:20 {host} {app}[{pid}]:NOTICE test.golden [sd ] notice\x00',
+		'<132>Nov 14 22:13:21 {host} {app}[{pid}]:WARNING test.golden warn\x00',
+		'<131>Nov 14 22:13:21 {host} {app}[{pid}]:ERROR test.golden [sd k="None"] error\x00',
+		'<130>Nov 14 22:13:20 {host} {app}[{pid}]:Level 45 test.golden between\x00',
+		'<130>Nov 14 22:13:20 {host} {app}[{pid}]:CRITICAL test.golden critical\x00',
+		'<129>Nov 14 22:13:20 {host} {app}[{pid}]:Level 60 test.golden alert\x00',
+	],
+	'5': [
+		'<134>1 2023-11-14T22:13:20.123Z {host} {app} {pid} test.golden [log l="INFO"][sd a="1" b="x y"] Hello world',
+		'<135>1 2023-11-14T22:13:20.123Z {host} {app} {pid} test.golden [log l="DEBUG"] debug',
+		'<133>1 2023-11-14T22:13:20.123Z {host} {app} {pid} test.golden [log l="NOTICE"][sd ] notice',
+		'<132>1 2023-11-14T22:13:21.999Z {host} {app} {pid} test.golden [log l="WARNING"] warn',
+		'<131>1 2023-11-14T22:13:21.0Z {host} {app} {pid} test.golden [log l="ERROR"][sd k="None"] error',
+		'<130>1 2023-11-14T22:13:20.123Z {host} {app} {pid} test.golden [log l="Level 45"] between',
+		'<130>1 2023-11-14T22:13:20.123Z {host} {app} {pid} test.golden [log l="CRITICAL"] critical',
+		'<129>1 2023-11-14T22:13:20.123Z {host} {app} {pid} test.golden [log l="Level 60"] alert',
+	],
+	'5micro': [
+		'<134>1 2023-11-14T22:13:20.123456Z {host} {app} {pid} test.golden [log l="INFO"][sd a="1" b="x y"] Hello world',
+		'<135>1 2023-11-14T22:13:20.123456Z {host} {app} {pid} test.golden [log l="DEBUG"]-debug',
+		'<133>1 2023-11-14T22:13:20.123456Z {host} {app} {pid} test.golden [log l="NOTICE"][sd ] notice',
+		'<132>1 2023-11-14T22:13:21.000000Z {host} {app} {pid} test.golden [log l="WARNING"]-warn',
+		'<131>1 2023-11-14T22:13:21.000000Z {host} {app} {pid} test.golden [log l="ERROR"][sd k="None"] error',
+		'<130>1 2023-11-14T22:13:20.123456Z {host} {app} {pid} test.golden [log l="Level 45"]-between',
+		'<130>1 2023-11-14T22:13:20.123456Z {host} {app} {pid} test.golden [log l="CRITICAL"]-critical',
+		'<129>1 2023-11-14T22:13:20.123456Z {host} {app} {pid} test.golden [log l="Level 60"]-alert',
+	],
+	'm': [
+		'<134>Nov 14 22:13:20 {app}[{pid}]: INFO test.golden [sd a="1" b="x y"] Hello world\x00',
+		'<135>Nov 14 22:13:20 {app}[{pid}]: DEBUG test.golden debug\x00',
+		'<133>Nov 14 22:13:20 {app}[{pid}]: NOTICE test.golden [sd ] notice\x00',
+		'<132>Nov 14 22:13:21 {app}[{pid}]: WARNING test.golden warn\x00',
+		'<131>Nov 14 22:13:21 {app}[{pid}]: ERROR test.golden [sd k="None"] error\x00',
+		'<130>Nov 14 22:13:20 {app}[{pid}]: Level 45 test.golden between\x00',
+		'<130>Nov 14 22:13:20 {app}[{pid}]: CRITICAL test.golden critical\x00',
+		'<129>Nov 14 22:13:20 {app}[{pid}]: Level 60 test.golden alert\x00',
+	],
+}
+
+
+def create_record(level, msg, args=(), created=1700000000.123456, struct_data=None):
+	record = logging.LogRecord("test.golden", level, __file__, 10, msg, args, None)
+	record.created = created
+	record.msecs = int((created - int(created)) * 1000) + 0.0
+	if struct_data is not None:
+		record._struct_data = struct_data
+	return record
+
+
+RECORDS = [
+	create_record(logging.INFO, "Hello %s", ("world",), struct_data={"a": 1, "b": "x y"}),
+	create_record(logging.DEBUG, "debug"),
+	create_record(LOG_NOTICE, "notice", struct_data={}),
+	# Microseconds are rounded up to the next second
+	create_record(logging.WARNING, "warn", created=1700000000.9999996),
+	create_record(logging.ERROR, "error", created=1700000001.0000004, struct_data={"k": None}),
+	create_record(45, "between"),
+	create_record(logging.CRITICAL, "critical"),
+	create_record(60, "alert"),
+]
+
+
+class TestFormatterGolden(unittest.TestCase):
+
+	@classmethod
+	def setUpClass(cls):
+		cls.TZ = os.environ.get("TZ")
+		os.environ["TZ"] = "UTC"
+		time.tzset()
+		asab.Config.add_defaults({"logging": {"app_name": "golden"}})
+
+
+	@classmethod
+	def tearDownClass(cls):
+		if cls.TZ is None:
+			del os.environ["TZ"]
+		else:
+			os.environ["TZ"] = cls.TZ
+		time.tzset()
+
+
+	def assertGolden(self, name, formatter):
+		placeholders = {
+			"host": socket.gethostname(),
+			"app": asab.Config["logging"]["app_name"],
+			"pid": os.getpid(),
+		}
+		expected = [line.format(**placeholders) if "{" in line else line for line in GOLDEN[name]]
+		self.assertEqual([formatter.format(copy.copy(record)) for record in RECORDS], expected)
+
+
+	def test_console(self):
+		self.assertGolden("console-color", StructuredDataFormatter(fmt=CONSOLE_FORMAT, datefmt="%d-%b-%Y %H:%M:%S.%f", use_color=True))
+
+
+	def test_file(self):
+		self.assertGolden("file", StructuredDataFormatter(fmt=CONSOLE_FORMAT, datefmt="%d-%b-%Y %H:%M:%S.%f"))
+
+
+	def test_default_datefmt(self):
+		self.assertGolden("nodatefmt", StructuredDataFormatter(fmt="%(asctime)s %(priority)s %%(literal)s %(msecs)03d %(struct_data)s%(message)s"))
+
+
+	def test_syslog(self):
+		self.assertGolden("3", SyslogRFC3164Formatter())
+		self.assertGolden("5", SyslogRFC5424Formatter())
+		self.assertGolden("5micro", SyslogRFC5424microFormatter())
+		self.assertGolden("m", MacOSXSyslogFormatter())
+
+
+	def test_time_cache(self):
+		formatter = StructuredDataFormatter(fmt="%(asctime)s", datefmt="%H:%M:%S.%f %%f")
+		times = [1700000000.5, 1700000000.25, 1700000001.75, 1700000000.5]
+		self.assertEqual(
+			[formatter.format(create_record(logging.INFO, "", created=created)) for created in times],
+			["22:13:20.500000 %f", "22:13:20.250000 %f", "22:13:21.750000 %f", "22:13:20.500000 %f"],
+		)
+
+
+	def test_exception(self):
+		formatter = StructuredDataFormatter(fmt="%(levelname)s %(message)s")
+		try:
+			raise ValueError("failed")
+		except ValueError:
+			record = logging.LogRecord("test.golden", logging.ERROR, __file__, 10, "error", (), sys.exc_info())
+
+		output = formatter.format(record)
+		self.assertTrue(output.startswith("ERROR error\nTraceback (most recent call last):\n"))
+		self.assertTrue(output.endswith("ValueError: failed"))
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,67 @@
+import sys
+import json
+import socket
+import logging
+import unittest
+
+from asab.log import JSONFormatter, orjson
+
+
+def create_record(msg="Hello %s", args=("world",), exc_info=None):
+	record = logging.LogRecord("test.json", logging.WARNING, __file__, 10, msg, args, exc_info)
+	record._struct_data = {"a": 1, "b": "x y", "obj": object}
+	return record
+
+
+class TestJSONFormatter(unittest.TestCase):
+
+	def test_legacy(self):
+		output = json.loads(JSONFormatter().format(create_record()))
+		self.assertEqual(output["msg"], "Hello %s")
+		self.assertEqual(output["args"], ["world"])
+		self.assertEqual(output["hostname"], socket.gethostname())
+		self.assertEqual(output["_struct_data"]["obj"], str(object))
+
+
+	def test_fields(self):
+		formatter = JSONFormatter(fields=("levelname", "name", "message", "_struct_data", "exc_text", "missing"), encoder=None)
+		output = formatter.format(create_record())
+		self.assertNotIn('": ', output)
+
+		output = json.loads(output)
+		self.assertEqual(output, dict(formatter.Enricher, **{
+			"levelname": "WARNING",
+			"name": "test.json",
+			"message": "Hello world",
+			"_struct_data": {"a": 1, "b": "x y", "obj": str(object)},
+		}))
+
+
+	def test_exception(self):
+		try:
+			raise ValueError("failed")
+		except ValueError:
+			record = create_record(exc_info=sys.exc_info())
+
+		output = json.loads(JSONFormatter(fields=("message", "exc_text")).format(record))
+		self.assertTrue(output["exc_text"].endswith("ValueError: failed"))
+
+
+	def test_no_fields_present(self):
+		formatter = JSONFormatter(fields=("missing",))
+		self.assertEqual(json.loads(formatter.format(create_record())), formatter.Enricher)
+
+
+	def test_encoders(self):
+		record = create_record()
+		formatter = JSONFormatter(fields=("message", "_struct_data"), encoder=lambda obj: json.dumps(obj, default=str, separators=(",", ":")))
+		expected = formatter.format(record)
+
+		self.assertEqual(JSONFormatter(fields=("message", "_struct_data")).format(record), expected)
+		if orjson is not None:
+			formatter = JSONFormatter(fields=("message", "_struct_data"))
+			self.assertEqual(formatter.Encoder, formatter._encode_orjson)
+
+
+if __name__ == '__main__':
+	unittest.main()
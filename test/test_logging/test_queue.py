@@ -0,0 +1,159 @@
+import io
+import os
+import logging
+import logging.handlers
+import tempfile
+import threading
+import unittest
+
+from asab.log import QueuedLoggingHandler
+
+
+class BlockingHandler(logging.Handler):
+	"""
+	Blocks the writer thread until released.
+	"""
+
+	def __init__(self):
+		super().__init__()
+		self.Entered = threading.Event()
+		self.Released = threading.Event()
+		self.Records = []
+
+	def emit(self, record):
+		self.Entered.set()
+		self.Released.wait(5)
+		self.Records.append(record.getMessage())
+
+
+class TestQueuedLoggingHandler(unittest.TestCase):
+
+	def setUp(self):
+		self.Logger = logging.getLogger("test.queue.{}".format(self.id()))
+		self.Logger.propagate = False
+		self.Logger.setLevel(logging.DEBUG)
+
+
+	def tearDown(self):
+		for handler in list(self.Logger.handlers):
+			self.Logger.removeHandler(handler)
+			handler.close()
+
+
+	def test_stream(self):
+		stream = io.StringIO()
+		target = logging.StreamHandler(stream)
+		target.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+		handler = QueuedLoggingHandler([target])
+		self.Logger.addHandler(handler)
+
+		args = ["a"]
+		self.Logger.info("first %s", args)
+		args.append("b")  # Arguments are rendered when logged, not when written
+		self.Logger.warning("second")
+		handler.close()
+
+		self.assertEqual(stream.getvalue(), "INFO first ['a']\nWARNING second\n")
+		self.assertEqual(handler.Written, 2)
+
+
+	def test_overflow_drop(self):
+		target = BlockingHandler()
+		handler = QueuedLoggingHandler([target], queue_size=2, overflow="drop")
+		self.Logger.addHandler(handler)
+
+		self.Logger.info("0")
+		self.assertTrue(target.Entered.wait(5))
+		for i in range(1, 5):
+			self.Logger.info(str(i))
+		self.assertEqual(handler.Queued, 2)
+		self.assertEqual(handler.Dropped, 2)
+
+		target.Released.set()
+		handler.close()
+		self.assertEqual(target.Records, ["0", "1", "2"])
+
+
+	def test_overflow_drop_oldest(self):
+		target = BlockingHandler()
+		handler = QueuedLoggingHandler([target], queue_size=2, overflow="drop_oldest")
+		self.Logger.addHandler(handler)
+
+		self.Logger.info("0")
+		self.assertTrue(target.Entered.wait(5))
+		for i in range(1, 5):
+			self.Logger.info(str(i))
+		self.assertEqual(handler.Dropped, 2)
+
+		target.Released.set()
+		handler.close()
+		self.assertEqual(target.Records, ["0", "3", "4"])
+
+
+	def test_record_not_modified(self):
+		records = []
+
+		class RecordingHandler(logging.Handler):
+			def emit(self, record):
+				records.append((record.msg, record.args))
+
+		handler = QueuedLoggingHandler([logging.NullHandler()])
+		self.Logger.addHandler(handler)
+		self.Logger.addHandler(RecordingHandler())
+
+		self.Logger.info("message %s", "argument")
+		handler.close()
+		self.assertEqual(records, [("message %s", ("argument",))])
+
+
+	def test_call_when_full(self):
+		target = BlockingHandler()
+		handler = QueuedLoggingHandler([target], queue_size=2, overflow="block")
+		self.Logger.addHandler(handler)
+
+		self.Logger.info("0")
+		self.assertTrue(target.Entered.wait(5))
+		self.Logger.info("1")
+		self.Logger.info("2")
+
+		# The queue is full, the call doesn't wait for a space in it
+		called = threading.Event()
+		handler.call(called.set)
+		self.assertEqual(len(handler.Calls), 1)
+
+		target.Released.set()
+		self.assertTrue(called.wait(5))
+		handler.close()
+		self.assertEqual(target.Records, ["0", "1", "2"])
+
+
+	def test_rollover(self):
+		with tempfile.TemporaryDirectory() as tmpdir:
+			path = os.path.join(tmpdir, "app.log")
+			target = logging.handlers.RotatingFileHandler(path, maxBytes=100, backupCount=2)
+			handler = QueuedLoggingHandler([target])
+			self.Logger.addHandler(handler)
+
+			for i in range(10):
+				self.Logger.info("message number %d", i)
+				# Wait until written, so every batch has one record
+				written = threading.Event()
+				handler.call(written.set)
+				self.assertTrue(written.wait(5))
+			handler.call(target.doRollover)
+			handler.close()
+			target.close()
+
+			self.assertTrue(os.path.exists(path + ".1"))
+			self.assertTrue(os.path.exists(path + ".2"))
+			for name in os.listdir(tmpdir):
+				self.assertLessEqual(os.path.getsize(os.path.join(tmpdir, name)), 100)
+
+
+	def test_invalid_overflow(self):
+		with self.assertRaises(ValueError):
+			QueuedLoggingHandler([], overflow="ignore")
+
+
+if __name__ == '__main__':
+	unittest.main()
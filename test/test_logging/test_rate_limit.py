@@ -0,0 +1,92 @@
+import logging
+import unittest
+import unittest.mock
+
+from asab.log import Logging, RateLimitingFilter
+
+
+def create_record(msg, *args, name="test.rate", level=logging.WARNING):
+	return logging.LogRecord(name, level, __file__, 10, msg, args, None)
+
+
+class TestRateLimitingFilter(unittest.TestCase):
+
+	def setUp(self):
+		self.Now = 1000.0
+		patcher = unittest.mock.patch("asab.log.time.monotonic", lambda: self.Now)
+		patcher.start()
+		self.addCleanup(patcher.stop)
+
+
+	def test_burst(self):
+		f = RateLimitingFilter(burst=3, rate=0)
+		passed = [f.filter(create_record("Connection to %s failed", i)) for i in range(10)]
+		self.assertEqual(passed, [True] * 3 + [False] * 7)
+		self.assertEqual(f.Suppressed, 7)
+
+		# Other messages and loggers have their own buckets
+		self.assertTrue(f.filter(create_record("Other message")))
+		self.assertTrue(f.filter(create_record("Connection to %s failed", 1, name="test.other")))
+
+		self.assertEqual(f.summary(), ([("test.rate", "Connection to %s failed", logging.WARNING, 7)], 0))
+		self.assertEqual(f.summary(), ([], 0))
+
+
+	def test_refill(self):
+		f = RateLimitingFilter(burst=2, rate=1)
+		self.assertEqual([f.filter(create_record("failed")) for _ in range(3)], [True, True, False])
+
+		self.Now += 2.5
+		self.assertEqual([f.filter(create_record("failed")) for _ in range(3)], [True, True, False])
+
+		# The bucket is not filled over the burst
+		self.Now += 100
+		self.assertEqual([f.filter(create_record("failed")) for _ in range(3)], [True, True, False])
+
+
+	def test_decision_per_record(self):
+		f = RateLimitingFilter(burst=1, rate=0)
+		record = create_record("failed")
+		# The filter is shared by several handlers
+		self.assertTrue(f.filter(record))
+		self.assertTrue(f.filter(record))
+		self.assertFalse(f.filter(create_record("failed")))
+
+
+	def test_max_keys(self):
+		f = RateLimitingFilter(burst=1, rate=0, max_keys=2)
+		for msg in ("a", "a", "a", "b", "c"):
+			f.filter(create_record(msg))
+
+		self.assertEqual(len(f.Buckets), 2)
+		self.assertEqual(f.summary(), ([], 2))
+
+
+	def test_summary_level(self):
+		f = RateLimitingFilter(burst=0, rate=0)
+		f.filter(create_record("failed", level=logging.WARNING))
+		f.filter(create_record("failed", level=logging.ERROR))
+		self.assertEqual(f.summary(), ([("test.rate", "failed", logging.ERROR, 2)], 0))
+
+
+	def test_added_handler(self):
+		# A handler added by Logging.add_handler() is rate limited also for records of child loggers
+		logging_ = Logging.__new__(Logging)
+		logging_.RootLogger = logging.getLogger("test.rate.added")
+		logging_.RateLimitFilter = RateLimitingFilter(burst=2, rate=0)
+
+		records = []
+		handler = logging.Handler()
+		handler.emit = records.append
+		logging_.add_handler(handler)
+		self.addCleanup(logging_.RootLogger.removeHandler, handler)
+
+		child = logging.getLogger("test.rate.added.child")
+		for _ in range(5):
+			child.warning("Flood")
+		self.assertEqual(len(records), 2)
+		self.assertEqual(logging_.RateLimitFilter.Suppressed, 3)
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,156 @@
+import os
+import re
+import socket
+import asyncio
+import logging
+import tempfile
+import threading
+import unittest
+
+from asab.log import AsyncIOHandler
+
+
+class TestAsyncIOHandler(unittest.TestCase):
+
+	def setUp(self):
+		self.Loop = asyncio.new_event_loop()
+		self.TmpDir = tempfile.TemporaryDirectory()
+		self.Path = os.path.join(self.TmpDir.name, "syslog.sock")
+		self.Received = bytearray()
+		self.Server = None
+		self.Handlers = []
+
+
+	def tearDown(self):
+		for handler in self.Handlers:
+			handler.close()
+		# Let the server see that the connection was closed
+		self.Loop.run_until_complete(asyncio.sleep(0.01))
+		if self.Server is not None:
+			self.Server.close()
+			self.Loop.run_until_complete(self.Server.wait_closed())
+		self.Loop.close()
+		self.TmpDir.cleanup()
+
+
+	def handler(self, **kwargs):
+		handler = AsyncIOHandler(self.Loop, socket.AF_UNIX, socket.SOCK_STREAM, self.Path, **kwargs)
+		handler.setFormatter(logging.Formatter("%(message)s\n"))
+		self.Handlers.append(handler)
+		return handler
+
+
+	def start_server(self):
+		async def on_client(reader, writer):
+			while True:
+				data = await reader.read(65536)
+				if len(data) == 0:
+					break
+				self.Received.extend(data)
+
+		self.Server = self.Loop.run_until_complete(asyncio.start_unix_server(on_client, path=self.Path))
+
+
+	def run_until(self, condition, timeout=5.0):
+		async def wait():
+			while not condition():
+				await asyncio.sleep(0.01)
+		self.Loop.run_until_complete(asyncio.wait_for(wait(), timeout))
+
+
+	def emit(self, handler, message):
+		handler.handle(logging.makeLogRecord({"msg": message, "levelno": logging.INFO}))
+
+
+	def test_delivery(self):
+		self.start_server()
+		handler = self.handler()
+		for i in range(1000):
+			self.emit(handler, "message {}".format(i))
+
+		expected = "".join("message {}\n".format(i) for i in range(1000)).encode()
+		self.run_until(lambda: len(self.Received) >= len(expected))
+		self.assertEqual(bytes(self.Received), expected)
+		self.assertEqual(handler.Dropped, 0)
+
+
+	def test_outage(self):
+		handler = self.handler(queue_size=10, reconnect_backoff=0.01, reconnect_backoff_max=0.05)
+		for i in range(100):
+			self.emit(handler, "message {}".format(i))
+
+		# The collector is not available, the buffer is bounded
+		self.run_until(lambda: handler.Reconnects >= 3)
+		self.assertEqual(handler.Dropped, 90)
+		self.assertEqual(len(handler._queue), 10)
+
+		# The collector is back, the newest messages are delivered
+		self.start_server()
+		expected = "".join("message {}\n".format(i) for i in range(90, 100)).encode()
+		self.run_until(lambda: len(self.Received) >= len(expected))
+		self.assertEqual(bytes(self.Received), expected)
+
+
+	def test_other_thread(self):
+		self.start_server()
+		handler = self.handler()
+		self.run_until(lambda: handler._write_ready)
+
+		thread = threading.Thread(target=lambda: [self.emit(handler, "message {}".format(i)) for i in range(100)])
+		thread.start()
+		thread.join()
+
+		expected = "".join("message {}\n".format(i) for i in range(100)).encode()
+		self.run_until(lambda: len(self.Received) >= len(expected))
+		self.assertEqual(bytes(self.Received), expected)
+
+
+	def test_other_thread_partial_writes(self):
+		reading = asyncio.Event()
+
+		async def on_client(reader, writer):
+			await reading.wait()
+			while True:
+				data = await reader.read(65536)
+				if len(data) == 0:
+					break
+				self.Received.extend(data)
+
+		self.Server = self.Loop.run_until_complete(asyncio.start_unix_server(on_client, path=self.Path))
+		handler = self.handler(queue_size=50)
+		self.run_until(lambda: handler._write_ready)
+
+		# The collector doesn't read, the socket accepts only a part of a batch, while another thread emits and drops messages
+		padding = "x" * 1000
+		thread = threading.Thread(target=lambda: [self.emit(handler, "message {} {}".format(i, padding)) for i in range(5000)])
+		thread.start()
+		self.run_until(lambda: not thread.is_alive(), timeout=30.0)
+		thread.join()
+		self.assertGreater(handler.Dropped, 0)
+
+		reading.set()
+		last = "message 4999 {}\n".format(padding).encode()
+		self.run_until(lambda: self.Received.endswith(last))
+
+		numbers = []
+		for line in bytes(self.Received).decode().splitlines():
+			match = re.fullmatch(r"message (\d+) x{1000}", line)
+			self.assertIsNotNone(match, "Broken framing: {!r}".format(line[:40]))
+			numbers.append(int(match.group(1)))
+		self.assertEqual(numbers, sorted(numbers))
+		self.assertEqual(len(numbers) + handler.Dropped, 5000)
+
+
+	def test_reconnect_drops_partial_message(self):
+		handler = self.handler(reconnect_backoff=10.0)
+		handler._queue.extend([b"age 1\n", b"message 2\n"])
+		handler._partial_head = True
+
+		handler._reconnect()
+		self.assertEqual(list(handler._queue), [b"message 2\n"])
+		self.assertFalse(handler._partial_head)
+		self.assertEqual(handler.Dropped, 1)
+
+
+if __name__ == '__main__':
+	unittest.main()
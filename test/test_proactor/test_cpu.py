@@ -0,0 +1,48 @@
+import unittest
+
+from asab.proactor.cpu import SharedBytes, export_bytes, import_bytes, cpu_call
+
+
+def concat(a, b):
+	return a + b
+
+
+class TestSharedBytes(unittest.TestCase):
+
+	def test_roundtrip(self):
+		data = bytes(range(256)) * 100
+		ref, shm = export_bytes(data)
+		try:
+			self.assertEqual(ref.Size, len(data))
+			self.assertEqual(import_bytes(ref), data)
+		finally:
+			shm.close()
+			shm.unlink()
+
+
+	def test_empty(self):
+		ref, shm = export_bytes(b"")
+		shm.close()
+		self.assertEqual(import_bytes(ref, unlink=True), b"")
+
+
+	def test_cpu_call(self):
+		ref, shm = export_bytes(b"x" * 1000)
+		try:
+			# Shared argument is resolved, small result is returned directly
+			self.assertEqual(cpu_call(len, [ref], 10000), 1000)
+
+			# Large result is returned via shared memory
+			result = cpu_call(concat, [ref, b"y"], 100)
+			self.assertIsInstance(result, SharedBytes)
+			self.assertEqual(import_bytes(result, unlink=True), b"x" * 1000 + b"y")
+
+			# Threshold 0 disables the shared memory for results
+			self.assertEqual(cpu_call(concat, [b"a", b"b"], 0), b"ab")
+		finally:
+			shm.close()
+			shm.unlink()
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,116 @@
+import logging
+import threading
+import unittest
+
+import asab
+import asab.abc
+import asab.proactor
+
+
+class TestNamedExecutors(unittest.TestCase):
+
+	def setUp(self):
+		super().setUp()
+		asab.Config.read_dict({"asab:proactor:isolated": {"max_workers": "2"}})
+		self.App = asab.Application(args=[], modules=[asab.proactor.Module])
+		self.ProactorService = self.App.get_service("asab.ProactorService")
+
+	def tearDown(self):
+		asab.Config.remove_section("asab:proactor:isolated")
+		asab.abc.singleton.Singleton.delete(self.App.__class__)
+		self.App = None
+		root_logger = logging.getLogger()
+		root_logger.handlers = []
+
+
+	def test_named_executor(self):
+		def thread_name():
+			return threading.current_thread().name
+
+		async def run():
+			default = await self.ProactorService.execute(thread_name)
+			isolated = await self.ProactorService.execute(thread_name, executor="isolated")
+			fallback = await self.ProactorService.execute(thread_name, executor="not-configured")
+			return default, isolated, fallback
+
+		default, isolated, fallback = self.App.Loop.run_until_complete(run())
+
+		self.assertTrue(default.startswith("AsabProactorThread"))
+		self.assertTrue(isolated.startswith("AsabProactor-isolated"))
+		self.assertTrue(fallback.startswith("AsabProactorThread"))
+
+		self.assertEqual(self.ProactorService.get_executor("isolated")._max_workers, 2)
+		self.assertIs(self.ProactorService.get_executor("not-configured"), self.ProactorService.Executor)
+
+
+	def test_reserved_name(self):
+		asab.Config.read_dict({"asab:proactor:process": {"max_workers": "2"}})
+		try:
+			with self.assertRaises(ValueError):
+				self.ProactorService.get_executor("process")
+		finally:
+			asab.Config.remove_section("asab:proactor:process")
+		self.assertNotIn("process", self.ProactorService.Stats)
+
+
+	def test_stats(self):
+		async def run():
+			for _ in range(3):
+				await self.ProactorService.execute(sum, [1, 2], executor="isolated")
+
+		self.App.Loop.run_until_complete(run())
+
+		stats = self.ProactorService.Stats["isolated"]
+		self.assertEqual(stats.Pending, 0)
+		started, wait_time, wait_time_max = stats.collect_wait()
+		self.assertEqual(started, 3)
+		self.assertGreaterEqual(wait_time, wait_time_max)
+		self.assertEqual(stats.collect_wait()[0], 0)
+		self.assertGreater(stats.collect_busy(), 0.0)
+
+
+	def test_map(self):
+		threads = set()
+
+		def square(x):
+			threads.add(threading.current_thread().name)
+			return x * x
+
+		async def collect(**kwargs):
+			return [y async for y in self.ProactorService.map(square, range(1000), **kwargs)]
+
+		ordered = self.App.Loop.run_until_complete(collect(chunksize=10))
+		self.assertEqual(ordered, [x * x for x in range(1000)])
+
+		unordered = self.App.Loop.run_until_complete(collect(chunksize=7, ordered=False, executor="isolated"))
+		self.assertEqual(sorted(unordered), ordered)
+		self.assertIn("AsabProactor-isolated", " ".join(threads))
+
+
+	def test_map_lazy_and_error(self):
+		consumed = []
+
+		def items():
+			for x in range(100):
+				consumed.append(x)
+				yield x
+
+		def fail(x):
+			if x == 5:
+				raise ValueError(x)
+			return x
+
+		async def run():
+			agen = self.ProactorService.map(fail, items(), chunksize=2, max_in_flight=2)
+			self.assertEqual(await agen.__anext__(), 0)
+			# Two chunks are processed, two more are in flight
+			self.assertLessEqual(len(consumed), 8)
+			with self.assertRaises(ValueError):
+				async for _ in agen:
+					pass
+
+		self.App.Loop.run_until_complete(run())
+
+
+if __name__ == '__main__':
+	unittest.main()
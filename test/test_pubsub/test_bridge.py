@@ -0,0 +1,138 @@
+import os
+import asyncio
+import tempfile
+import unittest
+
+import asab
+from asab.bridge import PubSubBridgeService
+
+
+class CounterStub(object):
+
+	def __init__(self):
+		self.Values = {}
+
+	def add(self, name, value):
+		self.Values[name] = self.Values.get(name, 0) + value
+
+
+class MetricsServiceStub(object):
+
+	def __init__(self):
+		self.Counters = {}
+
+	def create_counter(self, name, init_values=None, help=None):
+		self.Counters[name] = CounterStub()
+		return self.Counters[name]
+
+
+class ProcessStub(object):
+	"""
+	A sibling process as seen by the bridge, with its own PubSub.
+	"""
+
+	def __init__(self, loop):
+		self.Loop = loop
+		self.PubSub = asab.PubSub(self)
+		self.Services = {"asab.MetricsService": MetricsServiceStub()}
+
+	def _register_service(self, service):
+		self.Services[service.Name] = service
+
+	def get_service(self, service_name):
+		return self.Services.get(service_name)
+
+
+class TestPubSubBridge(unittest.TestCase):
+
+	def setUp(self):
+		self.Loop = asyncio.new_event_loop()
+		self.TmpDir = tempfile.TemporaryDirectory()
+		self.Path = asab.Config.get("asab:pubsub:bridge", "path")
+		asab.Config.set("asab:pubsub:bridge", "path", self.TmpDir.name)
+
+		self.Processes = []
+		self.Bridges = []
+		for i in range(2):
+			process = ProcessStub(self.Loop)
+			bridge = PubSubBridgeService(process)
+			bridge.forward("Test.message!")
+			# Both bridges run in this process, they need distinct sockets
+			bridge.SocketPath = os.path.join(self.TmpDir.name, "{}.sock".format(i))
+			self.Processes.append(process)
+			self.Bridges.append(bridge)
+
+		for bridge, process in zip(self.Bridges, self.Processes):
+			self.Loop.run_until_complete(bridge.initialize(process))
+		# The first bridge learns about the second one from the directory
+		for bridge in self.Bridges:
+			bridge._discover_peers()
+
+		self.Received = [[], []]
+		# PubSub holds subscribers by weak references
+		self.Subscribers = []
+		for process, received in zip(self.Processes, self.Received):
+			def on_message(message_type, *args, received=received, **kwargs):
+				received.append((args, kwargs))
+			self.Subscribers.append(on_message)
+			process.PubSub.subscribe("Test.message!", on_message)
+
+
+	def tearDown(self):
+		for bridge, process in zip(self.Bridges, self.Processes):
+			self.Loop.run_until_complete(bridge.finalize(process))
+		self.Loop.close()
+		self.TmpDir.cleanup()
+		asab.Config.set("asab:pubsub:bridge", "path", self.Path)
+
+
+	def run_until(self, condition, timeout=5.0):
+		async def wait():
+			while not condition():
+				await asyncio.sleep(0.01)
+		self.Loop.run_until_complete(asyncio.wait_for(wait(), timeout))
+
+
+	def counter(self, index):
+		return self.Processes[index].Services["asab.MetricsService"].Counters["pubsub.bridge"].Values
+
+
+	def test_forwarding(self):
+		self.Processes[0].PubSub.publish("Test.message!", "tenant-1", keys=["users", "roles"])
+		self.Processes[0].PubSub.publish("Test.message!", 2)
+		self.Processes[0].PubSub.publish("Test.other!", 3)
+
+		self.run_until(lambda: len(self.Received[1]) >= 2)
+		self.assertEqual(self.Received[1], [
+			(("tenant-1",), {"keys": ["users", "roles"]}),
+			((2,), {}),
+		])
+		# Both messages were sent in one datagram, the counter is in messages
+		self.assertEqual(self.counter(0).get("sent"), 2)
+		self.assertEqual(self.counter(1).get("received"), 2)
+
+
+	def test_no_rebroadcast(self):
+		self.Processes[0].PubSub.publish("Test.message!", 1)
+		self.run_until(lambda: len(self.Received[1]) >= 1)
+
+		# Give the second bridge a chance to send the message back
+		self.Loop.run_until_complete(asyncio.sleep(0.05))
+		self.assertEqual(self.Received[0], [((1,), {})])
+		self.assertEqual(self.counter(1).get("sent"), None)
+		self.assertEqual(self.counter(0).get("received"), None)
+
+
+	def test_dropped(self):
+		self.Bridges[0].MaxDatagramSize = 200
+		self.Processes[0].PubSub.publish("Test.message!", "x" * 1000)
+		self.Processes[0].PubSub.publish("Test.message!", object())
+		self.Processes[0].PubSub.publish("Test.message!", "delivered")
+
+		self.run_until(lambda: len(self.Received[1]) >= 1)
+		self.assertEqual(self.Received[1], [(("delivered",), {})])
+		self.assertEqual(self.counter(0).get("dropped"), 2)
+
+
+if __name__ == '__main__':
+	unittest.main()
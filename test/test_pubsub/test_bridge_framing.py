@@ -0,0 +1,49 @@
+import struct
+import unittest
+
+from asab.bridge.framing import encode_message, encode_batch, decode_batch
+
+
+class TestBridgeFraming(unittest.TestCase):
+
+	def test_roundtrip(self):
+		datagram = encode_batch([
+			encode_message("Library.change!", ("provider", "/path/"), {}),
+			encode_message("Cache.invalidate!", (), {"key": "tenant-1", "all": False}),
+		])
+
+		self.assertEqual(list(decode_batch(datagram)), [
+			("Library.change!", ["provider", "/path/"], {}),
+			("Cache.invalidate!", [], {"key": "tenant-1", "all": False}),
+		])
+
+
+	def test_not_serializable(self):
+		with self.assertRaises(TypeError):
+			encode_message("Test!", (object(),), {})
+
+		with self.assertRaises(ValueError):
+			encode_message("Test!", (), {"value": float("nan")})
+
+
+	def test_invalid_datagram(self):
+		with self.assertRaises(ValueError):
+			list(decode_batch(b"XX"))
+
+		with self.assertRaises(ValueError):
+			list(decode_batch(b"NO\x01\x00\x01"))
+
+		datagram = encode_batch([encode_message("Test!", (1, 2, 3), {})])
+		with self.assertRaises(ValueError):
+			list(decode_batch(datagram[:-3]))
+
+
+	def test_invalid_payload(self):
+		for payload in (b"null", b"1", b"[[1]]", b"[1,{}]", b"[[],[]]", b"[[],{},{}]"):
+			frame = struct.pack("!HI", 5, len(payload)) + b"Test!" + payload
+			with self.assertRaises(ValueError):
+				list(decode_batch(encode_batch([frame])))
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,85 @@
+import asyncio
+import logging
+import unittest
+
+import asab
+import asab.abc
+from asab.pubsub import PubSubInstrumentation
+
+
+class TestPubSubInstrumentation(unittest.TestCase):
+
+	def setUp(self):
+		super().setUp()
+		self.App = asab.Application(args=[], modules=[])
+		self.PubSub = asab.PubSub(self.App)
+		self.PubSub.Instrumentation = PubSubInstrumentation(slow_threshold=60.0)
+
+	def tearDown(self):
+		asab.abc.singleton.Singleton.delete(self.App.__class__)
+		self.App = None
+		root_logger = logging.getLogger()
+		root_logger.handlers = []
+
+
+	def test_disabled_by_default(self):
+		self.assertIsNone(asab.PubSub(self.App).Instrumentation)
+
+
+	def test_sync_delivery(self):
+		received = []
+
+		def on_message(message_type, value):
+			received.append(value)
+
+		self.PubSub.subscribe("Test.message!", on_message)
+		self.PubSub.publish("Test.message!", 1)
+		self.PubSub.publish("Test.message!", 2)
+		self.PubSub.publish("Test.nobody!")
+
+		self.assertEqual(received, [1, 2])
+		self.assertEqual(self.PubSub.Instrumentation.Published, {"Test.message!": 2, "Test.nobody!": 1})
+
+		[(key, stats)] = self.PubSub.Instrumentation.Deliveries.items()
+		self.assertEqual(key[0], "Test.message!")
+		self.assertTrue(key[1].endswith("on_message"))
+		self.assertEqual(key[2], "sync")
+		self.assertEqual(stats[0], 2)
+		self.assertEqual(stats[3], 0)
+
+
+	def test_async_delivery(self):
+
+		async def on_message(message_type):
+			await asyncio.sleep(0.01)
+
+		self.PubSub.subscribe("Test.message!", on_message)
+
+		async def publish():
+			self.PubSub.publish("Test.message!")
+			await asyncio.sleep(0.05)
+
+		self.App.Loop.run_until_complete(publish())
+
+		[(key, stats)] = self.PubSub.Instrumentation.Deliveries.items()
+		self.assertEqual(key[2], "async")
+		self.assertEqual(stats[0], 1)
+		self.assertGreaterEqual(stats[1], 0.01)
+
+
+	def test_slow_subscriber(self):
+		self.PubSub.Instrumentation.SlowThreshold = 0.0
+
+		def on_message(message_type):
+			pass
+
+		self.PubSub.subscribe("Test.message!", on_message)
+		with self.assertLogs("asab.pubsub", level="WARNING"):
+			self.PubSub.publish("Test.message!")
+
+		[stats] = self.PubSub.Instrumentation.Deliveries.values()
+		self.assertEqual(stats[3], 1)
+
+
+if __name__ == '__main__':
+	unittest.main()
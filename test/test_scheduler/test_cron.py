@@ -0,0 +1,60 @@
+import datetime
+import unittest
+
+from asab.scheduler import Cron
+
+
+def utc(*args):
+	return datetime.datetime(*args, tzinfo=datetime.timezone.utc)
+
+
+class TestCron(unittest.TestCase):
+
+	def test_every_minute(self):
+		cron = Cron("* * * * *")
+		self.assertEqual(cron.next(utc(2024, 1, 1, 10, 0, 30)), utc(2024, 1, 1, 10, 1))
+		self.assertEqual(cron.next(utc(2024, 12, 31, 23, 59)), utc(2025, 1, 1, 0, 0))
+
+
+	def test_fields(self):
+		cron = Cron("*/15 8-17 * * mon-fri")
+		# Friday evening -> Monday morning
+		self.assertEqual(cron.next(utc(2024, 1, 5, 17, 50)), utc(2024, 1, 8, 8, 0))
+		self.assertEqual(cron.next(utc(2024, 1, 8, 8, 0)), utc(2024, 1, 8, 8, 15))
+
+		cron = Cron("30 3 1,15 feb *")
+		self.assertEqual(cron.next(utc(2024, 3, 1)), utc(2025, 2, 1, 3, 30))
+
+		# Leap day
+		self.assertEqual(Cron("0 0 29 2 *").next(utc(2025, 3, 1)), utc(2028, 2, 29))
+
+		# Sunday as 7
+		self.assertEqual(Cron("0 12 * * 7").next(utc(2024, 1, 1)), utc(2024, 1, 7, 12, 0))
+
+		# Step from a value
+		self.assertEqual(Cron("5/20 * * * *").Minutes, {5, 25, 45})
+
+
+	def test_day_of_month_or_week(self):
+		# The 13th or any Friday
+		cron = Cron("0 0 13 * fri")
+		self.assertEqual(cron.next(utc(2024, 1, 1)), utc(2024, 1, 5))
+		self.assertEqual(cron.next(utc(2024, 1, 12, 1)), utc(2024, 1, 13))
+
+
+	def test_aliases(self):
+		self.assertEqual(Cron("@daily").next(utc(2024, 1, 1, 10)), utc(2024, 1, 2))
+		self.assertEqual(Cron("@hourly").next(utc(2024, 1, 1, 10, 5)), utc(2024, 1, 1, 11))
+
+
+	def test_invalid(self):
+		for expression in ["* * * *", "60 * * * *", "* * * * 8", "*/0 * * * *", "x * * * *", "5-1 * * * *"]:
+			with self.assertRaises(ValueError):
+				Cron(expression)
+
+		with self.assertRaises(ValueError):
+			Cron("0 0 30 2 *").next(utc(2024, 1, 1))
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,68 @@
+import asyncio
+import logging
+import unittest
+
+import asab
+import asab.abc
+import asab.scheduler
+
+
+class TestScheduler(unittest.TestCase):
+
+	def setUp(self):
+		super().setUp()
+		self.App = asab.Application(args=[], modules=[asab.scheduler.Module])
+		self.Scheduler = self.App.get_service("asab.SchedulerService")
+
+	def tearDown(self):
+		asab.abc.singleton.Singleton.delete(self.App.__class__)
+		self.App = None
+		root_logger = logging.getLogger()
+		root_logger.handlers = []
+
+
+	def test_interval(self):
+		runs = []
+
+		async def job(value):
+			runs.append((self.App.Loop.time(), value))
+			# Slow handler must not shift following runs
+			await asyncio.sleep(0.02)
+
+		async def run():
+			self.App.TaskService.start()
+			started_at = self.App.Loop.time()
+			job_obj = self.Scheduler.interval(job, 0.05, "x")
+			await asyncio.sleep(0.27)
+			job_obj.cancel()
+			return started_at, job_obj
+
+		started_at, job_obj = self.App.Loop.run_until_complete(run())
+
+		self.assertEqual(len(runs), 5)
+		self.assertEqual(job_obj.Runs, 5)
+		self.assertEqual(runs[0][1], "x")
+		for i, (at, _) in enumerate(runs, 1):
+			self.assertAlmostEqual(at - started_at, i * 0.05, delta=0.02)
+		self.assertEqual(len(self.Scheduler.Jobs), 0)
+
+
+	def test_skip_overlapping(self):
+		async def slow():
+			await asyncio.sleep(0.12)
+
+		async def run():
+			self.App.TaskService.start()
+			job = self.Scheduler.interval(slow, 0.05, jitter=0.01)
+			self.assertLess(job.Offset, 0.01)
+			await asyncio.sleep(0.23)
+			job.cancel()
+			return job
+
+		job = self.App.Loop.run_until_complete(run())
+		self.assertEqual(job.Runs, 2)
+		self.assertEqual(job.Skipped, 2)
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,94 @@
+import asyncio
+import logging
+import unittest
+
+import asab
+import asab.abc
+
+
+class TestTaskPool(unittest.TestCase):
+
+	def setUp(self):
+		super().setUp()
+		self.App = asab.Application(args=[], modules=[])
+		self.TaskService = self.App.TaskService
+
+	def tearDown(self):
+		asab.abc.singleton.Singleton.delete(self.App.__class__)
+		self.App = None
+		root_logger = logging.getLogger()
+		root_logger.handlers = []
+
+
+	def test_max_concurrency(self):
+		pool = self.TaskService.create_pool("test", config={"max_concurrency": 2})
+		running = []
+		max_running = []
+
+		async def job():
+			running.append(1)
+			max_running.append(len(running))
+			await asyncio.sleep(0.01)
+			running.pop()
+
+		async def run():
+			self.TaskService.start()
+			pool.schedule(*(job() for _ in range(6)))
+			self.assertEqual(len(pool.Running), 2)
+			self.assertEqual(len(pool.Queue), 4)
+			await pool.join()
+
+		self.App.Loop.run_until_complete(run())
+		self.assertEqual(len(max_running), 6)
+		self.assertEqual(max(max_running), 2)
+		self.assertEqual(len(pool.Queue), 0)
+		self.assertEqual(len(pool.Running), 0)
+
+
+	def test_priority(self):
+		pool = self.TaskService.create_pool("test", config={"max_concurrency": 1, "queue": "priority"})
+		order = []
+
+		async def job(value):
+			order.append(value)
+
+		# Pool is not started until the TaskService starts
+		pool.schedule(job("low"), priority=10)
+		pool.schedule(job("high"), priority=1)
+		pool.schedule(job("default"))
+		self.assertEqual(len(pool.Running), 0)
+
+		async def run():
+			self.TaskService.start()
+			await pool.join()
+
+		self.App.Loop.run_until_complete(run())
+		self.assertEqual(order, ["default", "high", "low"])
+
+
+	def test_rate(self):
+		pool = self.TaskService.create_pool("test", config={"max_concurrency": 10, "rate": 100, "burst": 1})
+		started = []
+
+		async def job():
+			started.append(self.App.Loop.time())
+
+		async def run():
+			self.TaskService.start()
+			pool.schedule(*(job() for _ in range(5)))
+			await pool.join()
+
+		self.App.Loop.run_until_complete(run())
+		self.assertEqual(len(started), 5)
+		self.assertGreaterEqual(started[-1] - started[0], 0.035)
+
+
+	def test_duplicate_pool(self):
+		self.TaskService.create_pool("test")
+		with self.assertRaises(RuntimeError):
+			self.TaskService.create_pool("test")
+		self.assertIsNotNone(self.TaskService.get_pool("test"))
+
+
+if __name__ == '__main__':
+	unittest.main()
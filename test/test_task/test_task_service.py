@@ -0,0 +1,116 @@
+import asyncio
+import logging
+import unittest
+
+import asab
+import asab.abc
+
+
+class TestTaskService(unittest.TestCase):
+
+	def setUp(self):
+		super().setUp()
+		self.App = asab.Application(args=[], modules=[])
+		self.TaskService = self.App.TaskService
+		self.Done = []
+		self.App.PubSub.subscribe("TaskService.task_done!", self._on_task_done)
+
+	def tearDown(self):
+		asab.abc.singleton.Singleton.delete(self.App.__class__)
+		self.App = None
+		root_logger = logging.getLogger()
+		root_logger.handlers = []
+
+	def _on_task_done(self, message_type, task):
+		self.Done.append(task)
+
+
+	def test_schedule_before_start(self):
+		results = []
+
+		async def job(value):
+			results.append(value)
+
+		self.TaskService.schedule(job(1), job(2))
+		self.assertEqual(len(self.TaskService.NewTasks), 2)
+
+		async def run():
+			self.TaskService.start()
+			self.TaskService.schedule(job(3))
+			await asyncio.sleep(0.01)
+
+		self.App.Loop.run_until_complete(run())
+
+		self.assertEqual(sorted(results), [1, 2, 3])
+		self.assertEqual(len(self.Done), 3)
+		self.assertEqual(len(self.TaskService.PendingTasks), 0)
+		self.assertEqual(len(self.TaskService.NewTasks), 0)
+
+
+	def test_task_error(self):
+
+		async def failing_job():
+			raise RuntimeError("Failure")
+
+		async def run():
+			self.TaskService.start()
+			with self.assertLogs("asab.task", level="ERROR"):
+				self.TaskService.schedule(failing_job())
+				await asyncio.sleep(0.01)
+
+		self.App.Loop.run_until_complete(run())
+		self.assertEqual(len(self.Done), 1)
+		self.assertEqual(len(self.TaskService.PendingTasks), 0)
+
+
+	def test_finalize_cancels_pending(self):
+		event = asyncio.Event()
+
+		async def run():
+			self.TaskService.start()
+			self.TaskService.schedule(event.wait(), event.wait())
+			await asyncio.sleep(0)
+			self.assertEqual(len(self.TaskService.PendingTasks), 2)
+			await self.TaskService.finalize(self.App)
+
+		self.App.Loop.run_until_complete(run())
+		self.assertEqual(len(self.TaskService.PendingTasks), 0)
+		self.assertTrue(all(task.cancelled() for task in self.Done))
+
+
+	def test_tasks_info(self):
+		event = asyncio.Event()
+
+		async def inner_wait():
+			await event.wait()
+
+		async def outer_wait():
+			await inner_wait()
+
+		async def run():
+			self.TaskService.start()
+			self.TaskService.schedule(outer_wait(), outer_wait())
+			await asyncio.sleep(0)
+			info = self.TaskService.get_tasks_info(stack_limit=2)
+			filtered = self.TaskService.get_tasks_info(coroutine=outer_wait.__qualname__)
+			event.set()
+			return info, filtered
+
+		info, filtered = self.App.Loop.run_until_complete(run())
+
+		# The filter applies also to the counts
+		self.assertEqual(filtered["count"], 2)
+		self.assertEqual(filtered["coroutines"], {outer_wait.__qualname__: 2})
+		self.assertEqual(len(filtered["tasks"]), 2)
+
+		self.assertEqual(info["coroutines"][outer_wait.__qualname__], 2)
+		[task_info, _] = [t for t in info["tasks"] if t["coroutine"] == outer_wait.__qualname__]
+		self.assertIn("age", task_info)
+		self.assertIn("test_task_service.py", task_info["origin"])
+		self.assertEqual(len(task_info["stack"]), 2)
+		self.assertTrue(task_info["stack"][0].endswith("inner_wait"))
+		self.assertTrue(task_info["stack"][1].endswith("wait"))
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,157 @@
+import random
+import asyncio
+import logging
+import unittest
+
+import asab
+import asab.abc
+from asab.timing_wheel import TimingWheelService
+
+
+class FakeLoop(object):
+
+	def __init__(self):
+		self.Now = 1000.0
+		self.Scheduled = None
+
+	def time(self):
+		return self.Now
+
+	def call_at(self, when, callback):
+		self.Scheduled = (when, callback)
+		return self
+
+	def cancel(self):
+		self.Scheduled = None
+
+
+class FakePubSub(object):
+
+	def subscribe(self, message_type, callback):
+		pass
+
+
+class FakeApp(object):
+
+	def __init__(self):
+		self.Loop = FakeLoop()
+		self.PubSub = FakePubSub()
+
+	def _register_service(self, service):
+		pass
+
+
+class FakeTimer(object):
+
+	def __init__(self, fired):
+		self.Fired = fired
+		self._wheel_slot = None
+		self._wheel_deadline = None
+
+	def _on_timer(self):
+		self.Fired.append((self, self._wheel_deadline))
+
+
+class TestTimingWheel(unittest.TestCase):
+
+	def test_deadlines(self):
+		app = FakeApp()
+		wheel = TimingWheelService(app)
+		resolution = wheel.Resolution
+		fired = []
+
+		rnd = random.Random(42)
+		timers = []
+		horizon = resolution * (64 ** 4) * 2  # Some timers are beyond the range of the wheel
+		for _ in range(2000):
+			timer = FakeTimer(fired)
+			timeout = rnd.choice([rnd.uniform(0, resolution * 100), rnd.uniform(0, horizon)])
+			wheel.add(timer, timeout)
+			timers.append((timer, app.Loop.Now + timeout))
+
+		removed = set(t for t, _ in timers[::10])
+		for timer in removed:
+			wheel.remove(timer)
+
+		wakeups = 0
+		while app.Loop.Scheduled is not None:
+			when, callback = app.Loop.Scheduled
+			app.Loop.Scheduled = None
+			app.Loop.Now = when
+			callback()
+			wakeups += 1
+
+		self.assertEqual(wheel.Count, 0)
+		self.assertEqual(len(fired), len(timers) - len(removed))
+
+		expected = {timer: due for timer, due in timers}
+		for timer, deadline in fired:
+			self.assertNotIn(timer, removed)
+			# Triggered in the first tick after the timeout
+			triggered_at = wheel.BaseTime + deadline * resolution
+			self.assertGreaterEqual(triggered_at, expected[timer] - 1e-6)
+			self.assertLess(triggered_at, expected[timer] + resolution + 1e-6)
+			self.assertIsNone(timer._wheel_slot)
+
+		# The wheel wakes up only to trigger timers or to move them to a finer level, not in every tick
+		self.assertLess(wakeups, 2 * len(timers))
+
+
+class TestTimer(unittest.TestCase):
+
+	def setUp(self):
+		super().setUp()
+		self.App = asab.Application(args=[], modules=[])
+
+	def tearDown(self):
+		asab.abc.singleton.Singleton.delete(self.App.__class__)
+		self.App = None
+		root_logger = logging.getLogger()
+		root_logger.handlers = []
+
+
+	def test_timer(self):
+		ticks = []
+
+		async def on_tick():
+			ticks.append(self.App.Loop.time())
+
+		async def run():
+			self.App.TaskService.start()
+			repeating = asab.Timer(self.App, on_tick, autorestart=True)
+			repeating.start(0.02)
+
+			stopped = asab.Timer(self.App, on_tick)
+			stopped.start(0.01)
+			stopped.stop()
+			self.assertFalse(stopped.is_started())
+
+			restarted = asab.Timer(self.App, on_tick)
+			restarted.start(10)
+			restarted.restart(0.01)
+			self.assertTrue(restarted.is_started())
+			with self.assertRaises(RuntimeError):
+				restarted.start(1)
+
+			await asyncio.sleep(0.11)
+			repeating.stop()
+			self.assertFalse(restarted.is_started())
+
+		started_at = self.App.Loop.time()
+		self.App.Loop.run_until_complete(run())
+
+		# One from the restarted timer, the rest from the repeating one
+		self.assertGreaterEqual(len(ticks), 4)
+		self.assertLessEqual(len(ticks), 6)
+		self.assertGreaterEqual(min(ticks) - started_at, 0.01)
+		self.assertEqual(self.App.TimingWheelService.Count, 0)
+
+
+	def test_task_removed(self):
+		timer = asab.Timer(self.App, None)
+		with self.assertRaisesRegex(AttributeError, "is_started"):
+			timer.Task
+
+
+if __name__ == '__main__':
+	unittest.main()